@@ -1,20 +1,215 @@
+"""
+Registro de auditoría con escritura diferida (write-behind).
+
+Los registros se encolan en memoria durante el request y un hilo en segundo
+plano los inserta por lotes (al llegar a AUDIT_BATCH_SIZE o cada
+AUDIT_FLUSH_INTERVAL_SECONDS), con un solo commit por lote. Al apagar la app
+se vacía la cola antes de salir. Si el escritor no está iniciado (scripts,
+consola) los registros se escriben directamente.
+
+Junto con cada lote se actualizan los conteos diarios (audit_daily_rollups)
+por usuario, módulo y acción, para que las estadísticas no recorran la
+tabla completa de auditoría.
+"""
+import queue
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 from sqlalchemy.orm import Session
+
 from . import models
+from .config import settings
+from .database import SessionLocal
+from . import metrics
+from .logs import get_logger
 
-def create_audit_log(db: Session, user_id: int, action: str, module: str, details: str = None):
-    """Crea un registro de auditoría"""
-    try:
-        db_log = models.AuditLog(
-            user_id=user_id,
-            action=action,
-            module=module,
-            details=details
+logger = get_logger(__name__)
+
+_queue: "queue.Queue[Optional[dict]]" = queue.Queue()
+_flush_thread: Optional[threading.Thread] = None
+_STOP = None  # Centinela para despertar al hilo al apagar
+metrics.pools.queues["audit"] = _queue.qsize
+
+
+def _rollup_upsert(dialect_name: str):
+    """INSERT de rollups que suma ``count`` si la clave ya existe, según el motor de BD"""
+    table = models.AuditDailyRollup.__table__
+    if dialect_name in ("postgresql", "sqlite"):
+        dialect = postgresql if dialect_name == "postgresql" else sqlite
+        stmt = dialect.insert(table)
+        return stmt.on_conflict_do_update(
+            index_elements=["day", "user_id", "module", "action"],
+            set_={"count": table.c.count + stmt.excluded.count},
         )
-        db.add(db_log)
+    if dialect_name in ("mysql", "mariadb"):
+        # Usa la restricción única uq_audit_daily_rollups_key
+        stmt = mysql.insert(table)
+        return stmt.on_duplicate_key_update(count=table.c.count + stmt.inserted.count)
+    raise ValueError(f"Rollups de auditoría no soportados para la base de datos '{dialect_name}'")
+
+
+def _upsert_rollups(db: Session, counts: Counter):
+    """Suma conteos {(día, user_id, módulo, acción): n} a los rollups diarios"""
+    if not counts:
+        return
+    db.execute(_rollup_upsert(db.get_bind().dialect.name), [
+        {"day": day, "user_id": user_id, "module": module, "action": action, "count": n}
+        for (day, user_id, module, action), n in counts.items()
+    ])
+
+
+def _insert_entries(db: Session, entries: List[dict]):
+    """Inserta registros y actualiza los rollups diarios (sin commit)"""
+    db.execute(insert(models.AuditLog), entries)
+    _upsert_rollups(db, Counter(
+        (e["timestamp"].date(), e["user_id"] or 0, e["module"], e["action"]) for e in entries
+    ))
+
+
+def _write_batch(entries: List[dict]):
+    """Inserta un lote de registros con un solo commit"""
+    db = SessionLocal()
+    try:
+        _insert_entries(db, entries)
         db.commit()
-        db.refresh(db_log)
-        return db_log
+    finally:
+        db.close()
+
+
+def rebuild_rollups(db: Session):
+    """Recalcula los rollups diarios desde audit_logs (para datos previos a los rollups)"""
+    log = models.AuditLog
+    day = func.date(log.timestamp)
+    user_id = func.coalesce(log.user_id, 0)
+    rows = db.execute(
+        select(day, user_id, log.module, log.action, func.count())
+        .where(log.timestamp.isnot(None))
+        .group_by(day, user_id, log.module, log.action)
+    )
+    db.query(models.AuditDailyRollup).delete()
+    _upsert_rollups(db, Counter({
+        (datetime.strptime(d, "%Y-%m-%d").date() if isinstance(d, str) else d, u, m, a): n
+        for d, u, m, a, n in rows
+    }))
+    db.commit()
+
+
+def check_database_support(engine):
+    """Lanza ValueError si el motor de BD no soporta el upsert de rollups.
+
+    Se llama al iniciar para no fallar después en cada lote del escritor.
+    """
+    _rollup_upsert(engine.dialect.name)
+
+
+def ensure_rollups(db: Session):
+    """Genera los rollups si la tabla está vacía y ya hay registros de auditoría"""
+    has_rollups = db.query(models.AuditDailyRollup.id).first() is not None
+    if not has_rollups and db.query(models.AuditLog.id).first() is not None:
+        rebuild_rollups(db)
+
+
+def _drain_queue() -> List[dict]:
+    """Saca de la cola todos los registros pendientes sin esperar"""
+    entries = []
+    while True:
+        try:
+            entry = _queue.get_nowait()
+        except queue.Empty:
+            return entries
+        if entry is not _STOP:
+            entries.append(entry)
+
+
+def _flush_loop(interval_seconds: float, batch_size: int):
+    pending: List[dict] = []
+    stopping = False
+    while not stopping:
+        deadline = time.monotonic() + interval_seconds
+        while len(pending) < batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                entry = _queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                stopping = True
+                break
+            pending.append(entry)
+
+        if not pending:
+            continue
+        try:
+            _write_batch(pending)
+            pending = []
+        except Exception as e:
+            # Se conservan y se reintentan en el siguiente ciclo
+            logger.error(f"Error al escribir auditoría ({len(pending)} registros): {e}")
+            if not stopping:
+                time.sleep(interval_seconds)
+
+    # Lo que no se pudo escribir vuelve a la cola para el vaciado final
+    for entry in pending:
+        _queue.put(entry)
+
+
+def start_writer():
+    """Inicia el hilo que escribe los registros de auditoría por lotes"""
+    global _flush_thread
+    if _flush_thread is not None:
+        return
+    _flush_thread = threading.Thread(
+        target=_flush_loop,
+        args=(settings.AUDIT_FLUSH_INTERVAL_SECONDS, settings.AUDIT_BATCH_SIZE),
+        name="audit-writer",
+        daemon=True,
+    )
+    _flush_thread.start()
+
+
+def stop_writer(timeout: float = 10.0):
+    """Detiene el hilo de escritura y vacía la cola (llamar al apagar la app)"""
+    global _flush_thread
+    thread, _flush_thread = _flush_thread, None
+    if thread is not None:
+        _queue.put(_STOP)
+        thread.join(timeout)
+    entries = _drain_queue()
+    if entries:
+        try:
+            _write_batch(entries)
+        except Exception as e:
+            logger.error(f"Error al vaciar la cola de auditoría ({len(entries)} registros perdidos): {e}")
+
+
+def create_audit_log(user_id: int, action: str, module: str, details: str = None):
+    """Registra una acción de auditoría (se encola y se escribe en segundo plano).
+
+    No usa la sesión del request: los routers async no necesitan una sesión
+    síncrona solo para auditar.
+    """
+    entry = {
+        "user_id": user_id,
+        "action": action,
+        "module": module,
+        "details": details,
+        "timestamp": datetime.now(),
+    }
+    if _flush_thread is not None:
+        _queue.put(entry)
+        return None
+
+    # Sin escritor en segundo plano: escritura directa
+    try:
+        _write_batch([entry])
     except Exception as e:
-        print(f"Error creating audit log: {e}")
+        logger.error(f"Error creating audit log: {e}")
         # No propagar error para no interrumpir el flujo principal
-        return None
+    return None
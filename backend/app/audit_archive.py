@@ -0,0 +1,200 @@
+"""
+Retención de la auditoría: archiva los registros antiguos en archivos
+comprimidos y los elimina de audit_logs.
+
+Los registros con más de AUDIT_RETENTION_DAYS días se escriben en
+``AUDIT_ARCHIVE_DIR/audit_AAAA-MM.jsonl.gz`` (un JSON por línea, un archivo
+por mes) y luego se borran de la tabla. Los rollups diarios no se tocan, por
+lo que las estadísticas siguen incluyendo el historial archivado.
+
+Para no duplicar registros si el proceso se corta a mitad de camino:
+- Antes de agregar a un archivo se anota su tamaño en
+  ``archive_state.json.pending``. Si el archivado no llegó a confirmarse,
+  la próxima corrida trunca los archivos a ese tamaño.
+- Al terminar de escribir se confirma en ``archive_state.json`` el último
+  id y la fecha de corte. La próxima corrida borra primero lo ya archivado
+  que haya quedado en la tabla.
+
+Uso:
+    python -m app.audit_archive                 # usa AUDIT_RETENTION_DAYS
+    python -m app.audit_archive --days 180
+"""
+import argparse
+import gzip
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import delete, select
+
+from . import models
+from .audit import ensure_rollups
+from .config import settings
+from .database import SessionLocal
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+ARCHIVE_BATCH_SIZE = 5000
+
+_scheduler_stop = threading.Event()
+_scheduler_thread: Optional[threading.Thread] = None
+
+
+STATE_FILE = "archive_state.json"
+
+
+def archive_path(month: str, directory: Optional[str] = None) -> str:
+    return os.path.join(directory or settings.AUDIT_ARCHIVE_DIR, f"audit_{month}.jsonl.gz")
+
+
+def _read_json(path: str):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_json(path: str, data: dict):
+    """Escritura atómica (archivo temporal + os.replace)"""
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".tmp", path)
+
+
+def _recover(directory: str) -> Optional[dict]:
+    """Deshace un archivado que no llegó a confirmarse y retorna el último confirmado"""
+    state_path = os.path.join(directory, STATE_FILE)
+    state = _read_json(state_path)
+    pending = _read_json(state_path + ".pending")
+    if pending is not None:
+        if state is None or pending["upto"] > state["last_id"]:
+            for path, size in pending["sizes"].items():
+                if size is None:
+                    if os.path.exists(path):
+                        os.remove(path)
+                elif os.path.exists(path):
+                    os.truncate(path, size)
+            logger.warning(f"Archivado interrumpido deshecho (hasta id {pending['upto']})")
+        os.remove(state_path + ".pending")
+    return state
+
+
+def _delete_archived(db, state: Optional[dict]):
+    """Borra de audit_logs lo que ya está confirmado en los archivos"""
+    if state is None:
+        return
+    log = models.AuditLog
+    cutoff = datetime.fromisoformat(state["cutoff"])
+    while True:
+        ids = db.execute(
+            select(log.id).where(log.timestamp < cutoff, log.id <= state["last_id"]).limit(ARCHIVE_BATCH_SIZE)
+        ).scalars().all()
+        if not ids:
+            break
+        db.execute(delete(log).where(log.id.in_(ids)))
+        db.commit()
+
+
+def archive_old_logs(retention_days: int, directory: Optional[str] = None) -> dict:
+    """Archiva y elimina los registros con más de ``retention_days`` días"""
+    directory = directory or settings.AUDIT_ARCHIVE_DIR
+    os.makedirs(directory, exist_ok=True)
+    cutoff = datetime.now() - timedelta(days=retention_days)
+    log = models.AuditLog
+
+    state_path = os.path.join(directory, STATE_FILE)
+    db = SessionLocal()
+    files: Dict[str, gzip.GzipFile] = {}
+    sizes: Dict[str, Optional[int]] = {}
+    archived = 0
+    try:
+        # Los rollups deben existir antes de borrar registros
+        ensure_rollups(db)
+        # Restos de una corrida anterior cortada: archivos a medio escribir o registros sin borrar
+        _delete_archived(db, _recover(directory))
+
+        max_id = db.execute(select(log.id).where(log.timestamp < cutoff).order_by(log.id.desc()).limit(1)).scalar()
+        if max_id is None:
+            return {"archived": 0, "cutoff": cutoff.isoformat(), "months": []}
+
+        try:
+            rows = db.execute(
+                select(log.id, log.user_id, log.action, log.module, log.details, log.timestamp)
+                .where(log.timestamp < cutoff, log.id <= max_id)
+                .order_by(log.id)
+                .execution_options(yield_per=ARCHIVE_BATCH_SIZE)
+            )
+            for row in rows:
+                month = row.timestamp.strftime("%Y-%m")
+                if month not in files:
+                    path = archive_path(month, directory)
+                    sizes[path] = os.path.getsize(path) if os.path.exists(path) else None
+                    _write_json(state_path + ".pending", {"upto": max_id, "sizes": sizes})
+                    # Modo "ab": un archivo gzip con varios miembros sigue siendo válido
+                    files[month] = gzip.open(path, "ab")
+                record = row._asdict()
+                record["timestamp"] = row.timestamp.isoformat()
+                files[month].write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+                archived += 1
+        finally:
+            for f in files.values():
+                f.close()
+
+        # Confirmar y recién entonces borrar de la tabla
+        state = {"last_id": max_id, "cutoff": cutoff.isoformat()}
+        _write_json(state_path, state)
+        if os.path.exists(state_path + ".pending"):
+            os.remove(state_path + ".pending")
+        _delete_archived(db, state)
+    finally:
+        db.close()
+
+    return {"archived": archived, "cutoff": cutoff.isoformat(), "months": sorted(files)}
+
+
+def _scheduler_loop(retention_days: int):
+    while not _scheduler_stop.is_set():
+        try:
+            result = archive_old_logs(retention_days)
+            if result["archived"]:
+                logger.info(f"Auditoría archivada: {result['archived']} registros anteriores a {result['cutoff']}")
+        except Exception as e:
+            logger.exception(f"Error al archivar auditoría: {e}")
+        _scheduler_stop.wait(24 * 3600)
+
+
+def start_scheduler():
+    """Inicia el archivado diario (si AUDIT_RETENTION_DAYS > 0)"""
+    global _scheduler_thread
+    if settings.AUDIT_RETENTION_DAYS <= 0 or _scheduler_thread is not None:
+        return
+    _scheduler_stop.clear()
+    _scheduler_thread = threading.Thread(
+        target=_scheduler_loop,
+        args=(settings.AUDIT_RETENTION_DAYS,),
+        name="audit-archiver",
+        daemon=True,
+    )
+    _scheduler_thread.start()
+
+
+def stop_scheduler():
+    """Detiene el archivado diario"""
+    global _scheduler_thread
+    _scheduler_stop.set()
+    _scheduler_thread = None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archiva registros de auditoría antiguos")
+    parser.add_argument("--days", type=int, default=settings.AUDIT_RETENTION_DAYS, help="Días de retención")
+    parser.add_argument("--dir", default=None, help="Carpeta de archivos (por defecto AUDIT_ARCHIVE_DIR)")
+    args = parser.parse_args()
+    if args.days <= 0:
+        parser.error("Indicar --days mayor a 0 o configurar AUDIT_RETENTION_DAYS")
+    print(json.dumps(archive_old_logs(args.days, args.dir), ensure_ascii=False, indent=2))
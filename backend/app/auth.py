@@ -1,17 +1,48 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from . import models, schemas
-from .database import get_db
+from .database import AsyncSessionLocal
 from .config import settings
+from . import metrics
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__rounds=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+)
+# Pool acotado para argon2: el hashing es CPU intensivo y no debe bloquear el event loop
+_password_executor: Optional[ThreadPoolExecutor] = None
+metrics.pools.executors["password_hash"] = lambda: _password_executor
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
+# Cache de usuarios autenticados: {username: (expira_en, usuario)}
+# Evita consultar la BD en cada request; se invalida al editar/eliminar usuarios
+_user_cache: Dict[str, Tuple[float, schemas.User]] = {}
+_user_cache_lock = threading.Lock()
+# Aumenta en cada invalidación; una lectura de la BD solo se guarda si no cambió
+_user_cache_generation = 0
+
+def _get_password_executor() -> ThreadPoolExecutor:
+    """Retorna el pool de hashing (se crea al primer uso y tras un apagado)"""
+    global _password_executor
+    if _password_executor is None:
+        _password_executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+        )
+    return _password_executor
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifica que la contraseña coincida con el hash"""
     return pwd_context.verify(plain_password, hashed_password)
@@ -20,6 +51,29 @@ def get_password_hash(password: str) -> str:
     """Genera el hash de una contraseña"""
     return pwd_context.hash(password)
 
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verifica la contraseña en el pool de hashing.
+
+    Retorna (válida, nuevo_hash); nuevo_hash no es None si el hash guardado usa
+    parámetros de argon2 distintos a los configurados y debe actualizarse.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_password_executor(), pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+async def get_password_hash_async(password: str) -> str:
+    """Genera el hash de una contraseña en el pool de hashing"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_password_executor(), get_password_hash, password)
+
+def shutdown_password_executor():
+    """Detiene el pool de hashing"""
+    global _password_executor
+    executor, _password_executor = _password_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Crea un token JWT"""
     to_encode = data.copy()
@@ -31,27 +85,72 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def get_user_by_username(db: Session, username: str):
+async def get_user_by_username(db: AsyncSession, username: str):
     """Obtiene un usuario por username"""
-    return db.query(models.User).filter(models.User.username == username).first()
+    result = await db.execute(select(models.User).where(models.User.username == username))
+    return result.scalars().first()
 
-def get_user_by_email(db: Session, email: str):
+async def get_user_by_email(db: AsyncSession, email: str):
     """Obtiene un usuario por email"""
-    return db.query(models.User).filter(models.User.email == email).first()
+    result = await db.execute(select(models.User).where(models.User.email == email))
+    return result.scalars().first()
 
-def authenticate_user(db: Session, username: str, password: str):
+async def authenticate_user(db: AsyncSession, username: str, password: str):
     """Autentica un usuario"""
-    user = get_user_by_username(db, username)
+    user = await get_user_by_username(db, username)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    # Devolver la conexión al pool mientras se verifica el hash (puede tardar);
+    # el usuario queda fuera de la sesión con sus atributos ya cargados
+    db.expunge(user)
+    await db.rollback()
+    valid, new_hash = await verify_and_update_password_async(password, user.hashed_password)
+    if not valid:
         return False
+    if new_hash:
+        # Re-hashear con los parámetros de argon2 actuales
+        await db.execute(
+            update(models.User).where(models.User.id == user.id).values(hashed_password=new_hash)
+        )
+        await db.commit()
+        user.hashed_password = new_hash
+    return user
+
+def invalidate_user_cache(username: Optional[str] = None):
+    """Elimina un usuario del cache (o todo el cache si no se indica username)"""
+    global _user_cache_generation
+    with _user_cache_lock:
+        _user_cache_generation += 1
+        if username is None:
+            _user_cache.clear()
+        else:
+            _user_cache.pop(username, None)
+
+async def _get_cached_user(username: str) -> Optional[schemas.User]:
+    """Obtiene el usuario desde el cache o la BD (solo en caso de fallo de cache)"""
+    now = time.monotonic()
+    with _user_cache_lock:
+        cached = _user_cache.get(username)
+        generation = _user_cache_generation
+    if cached and cached[0] > now:
+        metrics.cache_hit("users")
+        return cached[1]
+    metrics.cache_miss("users")
+
+    async with AsyncSessionLocal() as db:
+        db_user = await get_user_by_username(db, username=username)
+        if db_user is None:
+            return None
+        user = schemas.User.model_validate(db_user)
+
+    with _user_cache_lock:
+        # Si se editó o eliminó un usuario durante la lectura, la fila puede ser
+        # la anterior: se usa para este request pero no se guarda
+        if generation == _user_cache_generation:
+            _user_cache[username] = (now + settings.AUTH_CACHE_TTL_SECONDS, user)
     return user
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> models.User:
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> schemas.User:
     """Obtiene el usuario actual desde el token JWT"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -66,14 +165,14 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = get_user_by_username(db, username=username)
+    user = await _get_cached_user(username)
     if user is None:
         raise credentials_exception
     return user
 
 async def get_current_active_user(
-    current_user: models.User = Depends(get_current_user)
-) -> models.User:
+    current_user: schemas.User = Depends(get_current_user)
+) -> schemas.User:
     """Verifica que el usuario esté activo"""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Usuario inactivo")
@@ -81,7 +180,7 @@ async def get_current_active_user(
 
 def require_role(required_roles: list):
     """Decorator para verificar roles de usuario"""
-    async def role_checker(current_user: models.User = Depends(get_current_active_user)):
+    async def role_checker(current_user: schemas.User = Depends(get_current_active_user)):
         if current_user.role not in required_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -91,9 +190,11 @@ def require_role(required_roles: list):
     return role_checker
 
 # Funciones para crear usuarios
-def create_user(db: Session, user: schemas.UserCreate):
+async def create_user(db: AsyncSession, user: schemas.UserCreate):
     """Crea un nuevo usuario"""
-    hashed_password = get_password_hash(user.password)
+    # Devolver la conexión al pool mientras se calcula el hash
+    await db.rollback()
+    hashed_password = await get_password_hash_async(user.password)
     db_user = models.User(
         username=user.username,
         email=user.email,
@@ -102,42 +203,42 @@ def create_user(db: Session, user: schemas.UserCreate):
         role=user.role
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
-def update_user(db: Session, user_id: int, user_update: schemas.UserUpdate):
+async def update_user(db: AsyncSession, user_id: int, user_update: schemas.UserUpdate):
     """Actualiza un usuario existente"""
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
-    if not db_user:
-        return None
-    
     update_data = user_update.dict(exclude_unset=True)
     
-    # Si se envía password, hashearla y quitarla del dict plano
+    # Si se envía password, hashearla (antes de tomar una conexión) y quitarla del dict plano
     if "password" in update_data:
         password = update_data.pop("password")
         if password: # Solo si no está vacía
-            update_data["hashed_password"] = get_password_hash(password)
+            update_data["hashed_password"] = await get_password_hash_async(password)
+    
+    db_user = await db.get(models.User, user_id)
+    if not db_user:
+        return None
 
     for key, value in update_data.items():
         setattr(db_user, key, value)
     
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    invalidate_user_cache(db_user.username)
     return db_user
 
-def delete_user(db: Session, user_id: int):
+async def delete_user(db: AsyncSession, user_id: int):
     """Elimina un usuario"""
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
+    db_user = await db.get(models.User, user_id)
     if not db_user:
         return False
     
     # Limpiar referencias en la tabla de asociación
-    db_user.permissions = []
-    db.commit() # Confirmar eliminación de referencias
+    await db.execute(delete(models.user_permissions).where(models.user_permissions.c.user_id == user_id))
     
-    db.delete(db_user)
-    db.commit()
+    await db.delete(db_user)
+    await db.commit()
+    invalidate_user_cache(db_user.username)
     return True
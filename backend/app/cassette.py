@@ -0,0 +1,136 @@
+"""
+Grabación y reproducción (cassettes) de las llamadas a HikCentral.
+
+Con HIKCENTRAL_CASSETTE_MODE=record cada llamada firmada se agrega a
+HIKCENTRAL_CASSETTE_FILE (JSONL comprimido con gzip) con su path, el
+Content-MD5 del body, el body (con fotos y credenciales ocultas), la
+respuesta y el tiempo que tardó. Con HIKCENTRAL_CASSETTE_MODE=replay las
+respuestas se sirven desde el archivo, sin red, para el mismo path y body
+(Content-MD5), en el orden grabado y con la latencia original multiplicada
+por HIKCENTRAL_REPLAY_LATENCY_SCALE (0 = sin espera); una llamada sin
+grabación falla con código CASSETTE_MISS. La firma y la serialización se siguen ejecutando, así
+que sirve para perfilar y comparar con tráfico real.
+
+Se reproduce solo la latencia de cada llamada, no el momento en que se
+hizo: el ritmo y la concurrencia los pone quien genera la carga durante el
+replay (ej: los benchmarks). Por eso no se graba el instante de cada
+llamada; además un cassette puede juntar varias sesiones de grabación.
+
+Los cassettes contienen datos personales de las respuestas: no subirlos al
+repositorio.
+
+Uso:
+    python -m app.cassette cassettes/hik.jsonl.gz     # resumen por path
+"""
+import argparse
+import copy
+import gzip
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Deque, Dict, Tuple
+
+from .logs import get_logger, sanitize
+
+logger = get_logger(__name__)
+
+
+class CassetteRecorder:
+    """Agrega llamadas a un cassette (thread-safe)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # "at" agrega un nuevo miembro gzip: los cassettes previos siguen siendo válidos
+        self._file = gzip.open(path, "at", encoding="utf-8")
+        self._seq = 0
+
+    def record(self, path: str, md5: str, body: dict, response, elapsed: float):
+        with self._lock:
+            if self._file is None:
+                return
+            entry = {
+                "seq": self._seq,
+                "path": path,
+                "md5": md5,
+                "request": sanitize(body, limit=256),
+                "response": response,
+                "elapsed": round(elapsed, 6),
+            }
+            self._seq += 1
+            self._file.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class CassettePlayer:
+    """Sirve respuestas grabadas por (path, Content-MD5) en el orden original.
+
+    Solo se responde con grabaciones del mismo body: si no hay ninguna (ej:
+    un alta con otro personCode) la llamada falla con código CASSETTE_MISS y
+    se registra en el log. Usar la grabación de otro body dependería del
+    orden de las llamadas y podría devolver datos de otra persona sin aviso.
+    Cuando se agotan las grabaciones de un body se repite la última.
+    """
+
+    def __init__(self, path: str, latency_scale: float = 1.0):
+        self.path = path
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[str, str], Deque[dict]] = defaultdict(deque)
+        self._last: Dict[Tuple[str, str], dict] = {}
+        self.entries = 0
+        self.misses = 0
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                self._pending[(entry["path"], entry["md5"])].append(entry)
+                self.entries += 1
+        logger.info(f"Cassette cargado: {self.entries} llamadas desde {path}")
+
+    def play(self, path: str, md5: str):
+        """Retorna la respuesta grabada (esperando la latencia escalada)"""
+        key = (path, md5)
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending:
+                self._last[key] = pending.popleft()
+            entry = self._last.get(key)
+            if entry is None:
+                self.misses += 1
+        if entry is None:
+            logger.error(f"Cassette sin grabación para {path} con Content-MD5 {md5}")
+            return {"code": "CASSETTE_MISS", "msg": f"Sin grabación para {path} con este body"}
+        if self.latency_scale > 0:
+            time.sleep(entry["elapsed"] * self.latency_scale)
+        # Copia: los routers modifican la respuesta (ej: agregan personCode)
+        return copy.deepcopy(entry["response"])
+
+
+def summarize(path: str) -> dict:
+    """Llamadas y tiempo total por path de un cassette"""
+    paths: Dict[str, Dict[str, float]] = defaultdict(lambda: {"calls": 0, "seconds": 0.0})
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                paths[entry["path"]]["calls"] += 1
+                paths[entry["path"]]["seconds"] += entry["elapsed"]
+    return {p: {"calls": v["calls"], "seconds": round(v["seconds"], 3)} for p, v in sorted(paths.items())}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resumen de un cassette de HikCentral")
+    parser.add_argument("path")
+    args = parser.parse_args()
+    print(json.dumps(summarize(args.path), ensure_ascii=False, indent=2))
@@ -5,9 +5,23 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    AUTH_CACHE_TTL_SECONDS: int = 30  # Cache de usuarios autenticados
+    
+    # Hashing de contraseñas (argon2)
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_PARALLELISM: int = 4
+    PASSWORD_HASH_WORKERS: int = 4  # Hashes/verificaciones simultáneas
     
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30  # Segundos de espera por una conexión libre
+    DB_POOL_RECYCLE: int = 1800  # Solo BD servidor (PostgreSQL/MySQL)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # Seguro con WAL; FULL fuerza fsync en cada commit
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
     
     # HikCentral API
     HIKCENTRAL_BASE_URL: str
@@ -15,6 +29,14 @@ class Settings(BaseSettings):
     HIKCENTRAL_APP_SECRET: str
     HIKCENTRAL_USER_ID: str
     HIKCENTRAL_VERIFY_SSL: bool = False
+    HIKCENTRAL_POOL_SIZE: int = 20  # Conexiones keep-alive reutilizadas por el cliente
+    HIKCENTRAL_MAX_RPS: float = 0  # Límite de llamadas por segundo (0 = sin límite)
+    HIKCENTRAL_PAGE_WORKERS: int = 16  # Hilos compartidos para descargar páginas de listados
+    HIKCENTRAL_PAGE_PREFETCH: int = 8  # Páginas en vuelo por listado
+    # Cassettes de llamadas a HikCentral: off, record o replay (latencia x escala, 0 = sin espera)
+    HIKCENTRAL_CASSETTE_MODE: str = "off"
+    HIKCENTRAL_CASSETTE_FILE: str = "./cassettes/hikcentral.jsonl.gz"
+    HIKCENTRAL_REPLAY_LATENCY_SCALE: float = 1.0
     
     # CORS
     FRONTEND_URL: str = "http://localhost:5173"
@@ -24,6 +46,37 @@ class Settings(BaseSettings):
     ADMIN_EMAIL: str = "admin@unalm.edu.pe"
     ADMIN_PASSWORD: str = "admin123"
     
+    # Logging (json o text); los campos extra se recortan a LOG_MAX_FIELD_CHARS
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"
+    LOG_MAX_FIELD_CHARS: int = 512
+    
+    # Métricas Prometheus en /metrics
+    METRICS_ENABLED: bool = True
+    
+    # Trazas OpenTelemetry: none, file (TRACING_FILE), otlp (TRACING_OTLP_ENDPOINT) o console
+    TRACING_EXPORTER: str = "none"
+    TRACING_FILE: str = "./traces.jsonl"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_SERVICE_NAME: str = "appunalm-backend"
+    TRACING_SAMPLE_RATIO: float = 1.0
+    
+    # Compresión de respuestas (bytes mínimos, nivel gzip 1-9, calidad brotli 0-11)
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    
+    # Snapshots columnares (Arrow) para análisis offline
+    SNAPSHOT_DIR: str = "./snapshots"
+    SNAPSHOT_INTERVAL_MINUTES: int = 0  # 0 = desactivado
+    
+    # Auditoría: escritura por lotes en segundo plano
+    AUDIT_BATCH_SIZE: int = 200
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    # Retención: los registros más antiguos se archivan comprimidos (0 = desactivado)
+    AUDIT_RETENTION_DAYS: int = 0
+    AUDIT_ARCHIVE_DIR: str = "./audit_archive"
+    
     class Config:
         env_file = ".env"
 
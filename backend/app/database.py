@@ -1,14 +1,95 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
+from . import metrics
 
-engine = create_engine(
-    settings.DATABASE_URL, connect_args={"check_same_thread": False}
-)
+def build_engine(url: str, journal_mode: str = None, synchronous: str = None):
+    """Crea el engine de la app.
+
+    En SQLite activa WAL (los lectores no se bloquean con las escrituras),
+    el nivel de synchronous y un busy_timeout. En bases de datos servidor
+    configura el tamaño del pool de conexiones.
+    """
+    journal_mode = journal_mode or settings.SQLITE_JOURNAL_MODE
+    synchronous = synchronous or settings.SQLITE_SYNCHRONOUS
+    pool_args = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+    if make_url(url).get_backend_name() != "sqlite":
+        return create_engine(url, pool_pre_ping=True, pool_recycle=settings.DB_POOL_RECYCLE, **pool_args)
+
+    if make_url(url).database in (None, "", ":memory:"):
+        # Base en memoria: una sola conexión compartida
+        return create_engine(url, connect_args={"check_same_thread": False})
+
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False, "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000},
+        **pool_args,
+    )
+    _set_sqlite_pragmas(engine, journal_mode, synchronous)
+    return engine
+
+def _set_sqlite_pragmas(engine, journal_mode: str, synchronous: str):
+    """Aplica los PRAGMA de SQLite a cada conexión nueva del engine"""
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={synchronous}")
+        cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+
+# Drivers async para cada backend síncrono
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg", "mysql": "aiomysql"}
+
+def build_async_engine(url: str):
+    """Crea el engine async (mismo DATABASE_URL con el driver async correspondiente)"""
+    sync_url = make_url(url)
+    backend = sync_url.get_backend_name()
+    async_url = sync_url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+    if backend != "sqlite":
+        return create_async_engine(
+            async_url,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_pre_ping=True,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+
+    if sync_url.database in (None, "", ":memory:"):
+        return create_async_engine(async_url)
+
+    engine = create_async_engine(
+        async_url,
+        connect_args={"timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000},
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    _set_sqlite_pragmas(engine.sync_engine, settings.SQLITE_JOURNAL_MODE, settings.SQLITE_SYNCHRONOUS)
+    return engine
+
+engine = build_engine(settings.DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Engine async para los routers de usuarios y auditoría: la E/S de BD no bloquea el event loop
+async_engine = build_async_engine(settings.DATABASE_URL)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+metrics.pools.db_pools["sync"] = lambda: engine.pool
+metrics.pools.db_pools["async"] = lambda: async_engine.pool
+
 Base = declarative_base()
 
 def get_db():
@@ -17,3 +98,7 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
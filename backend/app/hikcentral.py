@@ -5,14 +5,54 @@ import base64
 import uuid
 import time
 import json
+import threading
 import urllib3
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
+from requests.adapters import HTTPAdapter
 from .config import settings
+from . import metrics, tracing
+from .cassette import CassettePlayer, CassetteRecorder
+from .pagination import Paginator
 
 # Desactivar advertencias SSL
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# Rutas de grupos de vehículos según la versión de HikCentral (ver list_vehicle_groups)
+VEHICLE_GROUP_ENDPOINTS = (
+    ("/artemis/api/resource/v1/vehicle/vehicleGroup/page", {"pageNo": 1, "pageSize": 100}),
+    ("/artemis/api/resource/v1/vehicle/vehicleGroup/list", {}),
+    ("/artemis/api/resource/v1/vehicle/group/page", {"pageNo": 1, "pageSize": 100}),
+    ("/artemis/api/resource/v1/vehicle/group/list", {}),
+    ("/artemis/api/resource/v1/vehicle/group/tree", {}),
+)
+
+
+class RateLimiter:
+    """Token bucket thread-safe: como máximo ``rate`` llamadas por segundo (0 = sin límite)"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Espera hasta que haya un turno libre"""
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # El turno se reserva dentro del lock; la espera se hace fuera
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+
 class HikCentralAPI:
     """Cliente para interactuar con HikCentral API"""
     
@@ -24,6 +64,28 @@ class HikCentralAPI:
         self.verify_ssl = settings.HIKCENTRAL_VERIFY_SSL
         self.accept = "application/json"
         self.ctype = "application/json; charset=UTF-8"
+        # Sesión con pool de conexiones keep-alive compartida por todos los hilos
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.HIKCENTRAL_POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.rate_limiter = RateLimiter(settings.HIKCENTRAL_MAX_RPS)
+        # Grabación/reproducción de llamadas (ver app/cassette.py)
+        self.recorder: Optional[CassetteRecorder] = None
+        self.player: Optional[CassettePlayer] = None
+        mode = settings.HIKCENTRAL_CASSETTE_MODE.lower()
+        if mode == "record":
+            self.recorder = CassetteRecorder(settings.HIKCENTRAL_CASSETTE_FILE)
+        elif mode == "replay":
+            self.player = CassettePlayer(settings.HIKCENTRAL_CASSETTE_FILE, settings.HIKCENTRAL_REPLAY_LATENCY_SCALE)
+        elif mode != "off":
+            raise ValueError(f"HIKCENTRAL_CASSETTE_MODE inválido: {mode} (off, record, replay)")
+    
+    def close(self):
+        """Cierra las conexiones y el cassette en grabación"""
+        self.session.close()
+        if self.recorder is not None:
+            self.recorder.close()
     
     def _now_gmt(self) -> str:
         """Retorna fecha actual en formato GMT"""
@@ -58,7 +120,6 @@ class HikCentralAPI:
             "X-Ca-Signature-Headers": "userid,x-ca-key,x-ca-nonce,x-ca-timestamp",
             "X-Ca-Signature-Method": "HmacSHA256",
             "X-Ca-Signature": signature,
-            "Connection": "close",
         }
     
     def post_signed(self, path: str, body: dict, timeout: int = 20) -> dict:
@@ -79,17 +140,36 @@ class HikCentralAPI:
         sig = self._sign_post(self.accept, md5_v, self.ctype, date_v, headers_to_sign, path)
         headers = self._build_headers(md5_v, date_v, nonce, ts, sig)
         
-        try:
-            r = requests.post(
-                self.base_url + path,
-                headers=headers,
-                data=body_json,
-                verify=self.verify_ssl,
-                timeout=timeout,
-            )
-            return r.json()
-        except Exception as e:
-            return {"code": "ERROR", "msg": str(e)}
+        label = metrics.upstream_path_label(path)
+        with tracing.span(f"hikcentral {label}", **{"hik.path": label, "http.request.body.size": len(body_json)}) as span:
+            start = time.perf_counter()
+            if self.player is not None:
+                result = self.player.play(path, md5_v)
+            else:
+                self.rate_limiter.acquire()
+                try:
+                    r = self.session.post(
+                        self.base_url + path,
+                        headers=headers,
+                        data=body_json,
+                        verify=self.verify_ssl,
+                        timeout=timeout,
+                    )
+                    span.set_attribute("http.response.status_code", r.status_code)
+                    result = r.json()
+                except Exception as e:
+                    result = {"code": "ERROR", "msg": str(e)}
+            elapsed = time.perf_counter() - start
+            code = result.get("code") if isinstance(result, dict) else "INVALID"
+            span.set_attribute("hik.code", str(code))
+            metrics.observe_upstream(path, elapsed, code)
+            if self.recorder is not None:
+                self.recorder.record(path, md5_v, body, result, elapsed)
+        return result
+    
+    def paginate(self, list_method: Callable[..., dict], page_size: int, **kwargs) -> Paginator:
+        """Paginator sobre un método de listado, ej: ``paginate(hik_api.list_vehicles, 200, vehicle_group_code="2")``"""
+        return Paginator(lambda page_no, size: list_method(page_no=page_no, page_size=size, **kwargs), page_size)
     
     # === Métodos para Personas ===
     
@@ -113,6 +193,16 @@ class HikCentralAPI:
         }
         return self.post_signed(path, body)
     
+    def get_person_list_advanced(self, page_no: int = 1, page_size: int = 100) -> dict:
+        """Lista personas con organización y foto (personList avanzado)"""
+        path = "/artemis/api/resource/v1/person/advance/personList"
+        return self.post_signed(path, {"pageNo": page_no, "pageSize": page_size})
+    
+    def update_person_face(self, person_code: str, face_b64: str) -> dict:
+        """Actualiza la foto de rostro de una persona (imagen en base64)"""
+        path = "/artemis/api/resource/v1/person/face/update"
+        return self.post_signed(path, {"personCode": person_code, "faceData": face_b64})
+    
     def get_person_by_code(self, person_code: str) -> dict:
         """Obtiene información de una persona por código"""
         path = "/artemis/api/resource/v1/person/personCode/personInfo"
@@ -135,6 +225,11 @@ class HikCentralAPI:
         }
         return self.post_signed(path, body)
     
+    def list_custom_fields(self, page_no: int = 1, page_size: int = 200) -> dict:
+        """Lista los campos personalizados definidos para personas"""
+        path = "/artemis/api/resource/v1/person/customFields"
+        return self.post_signed(path, {"pageNo": page_no, "pageSize": page_size})
+    
     # === Métodos para Access Levels ===
     
     def list_privilege_groups(self, page_no: int = 1, page_size: int = 100) -> dict:
@@ -143,6 +238,16 @@ class HikCentralAPI:
         body = {"pageNo": page_no, "pageSize": page_size, "type": 1}
         return self.post_signed(path, body)
     
+    def add_persons_to_privilege_group(self, privilege_group_id: str, person_ids: list) -> dict:
+        """Agrega varias personas (por personId) a un grupo de privilegios en una llamada"""
+        path = "/artemis/api/acs/v1/privilege/group/single/addPersons"
+        body = {
+            "privilegeGroupId": privilege_group_id,
+            "type": 1,
+            "list": [{"id": str(person_id)} for person_id in person_ids]
+        }
+        return self.post_signed(path, body)
+    
     def assign_access_level(self, person_code: str, privilege_group_id: str) -> dict:
         """Asigna access level a una persona"""
         # Primero obtener personId
@@ -157,14 +262,7 @@ class HikCentralAPI:
             return {"success": False, "message": "No se pudo obtener personId"}
         
         # Asignar al grupo
-        path = "/artemis/api/acs/v1/privilege/group/single/addPersons"
-        body = {
-            "privilegeGroupId": privilege_group_id,
-            "type": 1,
-            "list": [{"id": str(person_id)}]
-        }
-        
-        response = self.post_signed(path, body)
+        response = self.add_persons_to_privilege_group(privilege_group_id, [person_id])
         return {
             "success": str(response.get("code")) == "0",
             "message": response.get("msg", ""),
@@ -191,6 +289,19 @@ class HikCentralAPI:
         }
         return self.post_signed(path, body)
     
+    def list_vehicle_groups(self) -> dict:
+        """Lista grupos de vehículos.
+
+        La ruta cambia según la versión de HikCentral: se prueban las conocidas
+        en orden y se retorna la primera respuesta exitosa (o la última con error).
+        """
+        response = {}
+        for path, body in VEHICLE_GROUP_ENDPOINTS:
+            response = self.post_signed(path, body)
+            if str(response.get("code")) == "0":
+                break
+        return response
+    
     def add_vehicle(self, vehicle_data: dict) -> dict:
         """
         Agrega un vehículo a HikCentral
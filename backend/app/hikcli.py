@@ -0,0 +1,585 @@
+"""
+CLI de administración de HikCentral.
+
+Reemplaza a los scripts sueltos (person_list.py, person_list_full.py,
+add_person.py, consultar_orgIndexCode.py, person_custom_fields.py,
+vehicle_list.py, vehicle_group_list.py, vehicle_add.py, subir_fotos.py,
+asignar_access_level.py, Listar_org.py...) que copiaban la firma con URL
+y credenciales fijas y paginaban de a una página con ``Connection: close``. Aquí se usa el mismo cliente que el
+servidor: sesión keep-alive, límite HIKCENTRAL_MAX_RPS y cassettes.
+
+- Los listados usan el motor de paginación (app/pagination.py) con
+  --workers páginas en paralelo y guardan cada página recibida en
+  ``<salida>.pages.jsonl``; si la corrida se corta, al repetirla solo se
+  piden las páginas que faltan.
+- Las operaciones masivas corren en paralelo y anotan cada elemento
+  terminado en ``<entrada>.done``; al repetirlas se saltan los ya hechos.
+- personCode → personId y DNI → personCode salen del snapshot de personas
+  (o de una descarga si no hay snapshot o se pasa --refresh). Si el
+  snapshot tiene más de --max-age-hours el comando se detiene, salvo que
+  se pase --refresh (descarga) o --stale-ok (usarlo igual).
+- El avance se muestra en stderr.
+
+Uso (desde la carpeta backend):
+    python -m app.hikcli persons export -o person_data.json
+    python -m app.hikcli persons info 6318119921 --field orgIndexCode
+    python -m app.hikcli persons add --code 20231234 --given-name Ana --family-name Ruiz --dni 12345678
+    python -m app.hikcli custom-fields export -o person_custom_fields.json
+    python -m app.hikcli vehicles export -o vehicle_data.json --group 2
+    python -m app.hikcli vehicles add vehiculos.csv
+    python -m app.hikcli vehicle-groups list
+    python -m app.hikcli orgs export -o orgs.json
+    python -m app.hikcli privilege-groups list
+    python -m app.hikcli photos upload "fotos/*.jpg"
+    python -m app.hikcli access-level assign --group 5 20231234 20231235
+    python -m app.hikcli access-level assign --group 5 --file codigos.txt
+"""
+import argparse
+import base64
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from . import pagination, reconcile, snapshots
+from .config import settings
+from .hikcentral import hik_api
+from .pagination import PaginationError, Paginator
+from .records import custom_fields
+
+GENDER_DESC = {1: "Masculino", 2: "Femenino", 0: "Desconocido"}
+
+
+class Progress:
+    """Línea de avance en stderr (se reescribe como mucho 5 veces por segundo)"""
+
+    def __init__(self, label: str, total: int, done: int = 0):
+        self.label = label
+        self.total = total
+        self.done = done
+        self.failed = 0
+        self._start = time.monotonic()
+        self._initial = done
+        self._shown = 0.0
+        self._lock = threading.Lock()
+
+    def advance(self, ok: bool = True):
+        with self._lock:
+            self.done += 1
+            if not ok:
+                self.failed += 1
+            now = time.monotonic()
+            if now - self._shown >= 0.2 or self.done == self.total:
+                self._shown = now
+                self._print(now)
+
+    def _print(self, now: float):
+        rate = (self.done - self._initial) / max(now - self._start, 1e-6)
+        line = f"\r{self.label}: {self.done}/{self.total} ({rate:.1f}/s)"
+        if self.failed:
+            line += f" - {self.failed} con error"
+        sys.stderr.write(line)
+        sys.stderr.flush()
+
+    def close(self):
+        with self._lock:
+            self._print(time.monotonic())
+            sys.stderr.write("\n")
+
+
+def _ok(response) -> bool:
+    return isinstance(response, dict) and str(response.get("code")) == "0"
+
+
+# === Listados paginados ===
+
+def _read_checkpoint(path: str, page_size: int) -> Tuple[Optional[int], Dict[int, list]]:
+    """Total y páginas guardadas por una corrida anterior con el mismo tamaño de página"""
+    if not os.path.exists(path):
+        return None, {}
+    total, pages = None, {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break  # Última línea cortada por una interrupción
+            if "pageSize" in entry:
+                if entry["pageSize"] != page_size:
+                    return None, {}
+                total = entry["total"]
+            else:
+                pages[entry["page"]] = entry["list"]
+    return total, pages
+
+
+def fetch_pages(fetch_page: Callable[[int, int], dict], page_size: int, checkpoint: str, workers: int, label: str) -> List[dict]:
+    """Descarga todas las páginas en paralelo, retomando desde ``checkpoint``.
+
+    Lanza RuntimeError si alguna página falla; las recibidas quedan en el
+    checkpoint para la próxima corrida.
+    """
+    total, pages = _read_checkpoint(checkpoint, page_size)
+    if pages:
+        print(f"Retomando {label}: {len(pages)} páginas ya descargadas", file=sys.stderr)
+    paginator = Paginator(fetch_page, page_size, prefetch=workers, total=total, skip=pages)
+    progress = None
+    with open(checkpoint, "a" if total is not None else "w", encoding="utf-8") as f:
+        for page_no, items in paginator.pages():
+            if progress is None:
+                if total is None:
+                    f.write(json.dumps({"pageSize": page_size, "total": paginator.total}) + "\n")
+                progress = Progress(label, paginator.last_page, len(pages))
+            pages[page_no] = items
+            f.write(json.dumps({"page": page_no, "list": items}, ensure_ascii=False) + "\n")
+            f.flush()
+            progress.advance()
+    if progress is not None:
+        progress.close()
+
+    if paginator.errors:
+        raise RuntimeError(f"{PaginationError(paginator.errors)}. Vuelva a ejecutar el comando para retomar.")
+    return [item for page in sorted(pages) for item in pages[page]]
+
+
+def export_list(fetch_page, page_size: int, output: str, args, label: str, transform=None) -> List[dict]:
+    """Descarga un listado completo y lo escribe en ``output`` (JSON)"""
+    checkpoint = output + ".pages.jsonl"
+    items = fetch_pages(fetch_page, page_size, checkpoint, args.workers, label)
+    rows = [transform(item) for item in items] if transform else items
+    with open(output + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(rows, f, ensure_ascii=False, indent=2)
+    os.replace(output + ".tmp", output)
+    os.remove(checkpoint)
+    print(f"{len(rows)} registros exportados a {output}")
+    return rows
+
+
+def person_summary(p: dict) -> dict:
+    """Fila de persona en el formato de person_data.json"""
+    campos = custom_fields(p)
+    departament_cf = next(
+        (campos[n] for n in ("departamento", "department", "departament", "area", "área") if campos.get(n)),
+        None,
+    )
+    position_cf = next((campos[n] for n in ("position", "puesto", "cargo") if campos.get(n)), None)
+    pic_uri = ((p.get("personPhoto") or {}).get("picUri") or "").strip()
+    gender_code = p.get("gender") or p.get("sex")
+    if isinstance(gender_code, str) and gender_code.isdigit():
+        gender_code = int(gender_code)
+    return {
+        "ID": p.get("personCode"),
+        "personID": p.get("personId"),
+        "Nombre": p.get("personName"),
+        "DNI": campos.get("dni"),
+        "Departament": departament_cf or p.get("orgName") or p.get("orgIndexCode"),
+        "Gender": gender_code,
+        "GenderDesc": GENDER_DESC.get(gender_code, "Desconocido"),
+        "Position": position_cf or next(
+            (p.get(k) for k in ("post", "postId", "postName", "position", "jobTitle", "jobName", "title") if p.get(k)),
+            None,
+        ),
+        "FotoURI": pic_uri or None,
+        "TieneFoto": bool(pic_uri),
+    }
+
+
+def cmd_persons_export(args):
+    rows = export_list(
+        lambda p, s: hik_api.get_person_list_advanced(page_no=p, page_size=s),
+        args.page_size, args.output, args, "Personas",
+        transform=None if args.raw else person_summary,
+    )
+    if not args.raw:
+        con_foto = sum(1 for r in rows if r["TieneFoto"])
+        print(f"Con foto: {con_foto}")
+        print(f"Sin foto: {len(rows) - con_foto}")
+
+
+def cmd_persons_info(args):
+    failed = 0
+    for code in args.codes:
+        response = hik_api.get_person_by_code(code)
+        if not _ok(response):
+            print(f"ERROR {code}: {response.get('msg', response)}", file=sys.stderr)
+            failed += 1
+            continue
+        data = response.get("data") or {}
+        if args.field:
+            print(f"{code}\t{data.get(args.field)}")
+        else:
+            print(json.dumps(data, ensure_ascii=False, indent=2))
+    return failed
+
+
+def cmd_persons_add(args):
+    body = {
+        "personGivenName": args.given_name,
+        "personFamilyName": args.family_name,
+        "personCode": args.code,
+        "gender": args.gender,
+        "orgIndexCode": args.org,
+    }
+    if args.position:
+        body["position"] = args.position
+    response = hik_api.add_person(body)
+    if not _ok(response):
+        raise RuntimeError(f"Error al crear persona {args.code}: {response}")
+    data = response.get("data")
+    person_id = data if isinstance(data, str) else (data or {}).get("personId")
+    print(f"Persona creada: personCode {args.code}, personId {person_id}")
+    if args.dni:
+        # customFieldsUpdate no falla si el campo no existe: se verifica leyendo la persona
+        hik_api.add_custom_field(person_id, args.code, "DNI", args.dni)
+        info = hik_api.get_person_by_code(args.code)
+        campos = custom_fields((info.get("data") or {}) if _ok(info) else {})
+        if campos.get("dni") != args.dni:
+            raise RuntimeError(f"La persona se creó pero el DNI no quedó guardado: {info}")
+        print(f"DNI {args.dni} guardado")
+
+
+def cmd_custom_fields_export(args):
+    export_list(
+        lambda p, s: hik_api.list_custom_fields(page_no=p, page_size=s),
+        args.page_size, args.output, args, "Campos",
+    )
+
+
+def cmd_vehicles_export(args):
+    export_list(
+        lambda p, s: hik_api.list_vehicles(page_no=p, page_size=s, vehicle_group_code=args.group),
+        args.page_size, args.output, args, "Vehículos",
+    )
+
+
+def cmd_orgs_export(args):
+    export_list(
+        lambda p, s: hik_api.list_organizations(page_no=p, page_size=s),
+        args.page_size, args.output, args, "Organizaciones",
+    )
+
+
+def cmd_privilege_groups_list(args):
+    response = hik_api.list_privilege_groups(page_no=1, page_size=args.page_size)
+    if not _ok(response):
+        raise RuntimeError(f"Error al listar grupos: {response}")
+    for group in (response.get("data") or {}).get("list") or []:
+        print(f"{group.get('privilegeGroupId')}\t{group.get('privilegeGroupName')}")
+
+
+def _vehicle_groups(data) -> List[dict]:
+    """indexCode y nombre de cada grupo, venga la respuesta como lista, página o árbol"""
+    if isinstance(data, dict):
+        nodes = data.get("list") if isinstance(data.get("list"), list) else data.get("data")
+        stack = list(nodes) if isinstance(nodes, list) else [data]
+    else:
+        stack = list(data or [])
+    groups = []
+    while stack:
+        node = stack.pop(0)
+        if not isinstance(node, dict):
+            continue
+        index_code = node.get("indexCode") or node.get("groupIndexCode") or node.get("vehicleGroupIndexCode")
+        name = node.get("name") or node.get("groupName") or node.get("vehicleGroupName")
+        if index_code or name:
+            groups.append({"indexCode": index_code, "name": name})
+        for key in ("children", "nodes", "items"):
+            if isinstance(node.get(key), list):
+                stack.extend(node[key])
+    return groups
+
+
+def cmd_vehicle_groups_list(args):
+    response = hik_api.list_vehicle_groups()
+    if not _ok(response):
+        raise RuntimeError(f"Error al listar grupos de vehículos: {response}")
+    for group in _vehicle_groups(response.get("data")):
+        print(f"{group['indexCode']}\t{group['name']}")
+
+
+# === Operaciones masivas ===
+
+class DoneLog:
+    """Claves ya procesadas de una operación masiva (una por línea, para retomar)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.keys = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.keys = {line.strip() for line in f if line.strip()}
+        self._file = open(path, "a", encoding="utf-8")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.keys
+
+    def add(self, keys: List[str]):
+        self.keys.update(keys)
+        self._file.write("".join(f"{key}\n" for key in keys))
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def run_bulk(jobs: List[Tuple[List[str], Callable[[], dict]]], done: DoneLog, workers: int, label: str) -> int:
+    """Ejecuta ``jobs`` (claves, llamada) en paralelo; retorna cuántos fallaron"""
+    progress = Progress(label, len(jobs))
+    failures = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(fn): keys for keys, fn in jobs}
+        for future in as_completed(futures):
+            keys = futures[future]
+            try:
+                response = future.result()
+            except Exception as e:
+                response = {"code": "ERROR", "msg": str(e)}
+            if _ok(response):
+                done.add(keys)
+            else:
+                failures.append((keys, response))
+            progress.advance(_ok(response))
+    progress.close()
+    done.close()
+
+    for keys, response in failures:
+        print(f"ERROR {', '.join(keys)}: {response.get('msg') if isinstance(response, dict) else response}", file=sys.stderr)
+    if failures:
+        print(f"{len(failures)} con error; vuelva a ejecutar el comando para reintentarlos (los exitosos están en {done.path})")
+    return len(failures)
+
+
+def _snapshot_refresh(args) -> bool:
+    """Indica si hay que descargar personas en vez de usar el snapshot.
+
+    Lanza RuntimeError si el snapshot es más antiguo que --max-age-hours y
+    no se pasó --stale-ok: las altas y bajas recientes no estarían en él.
+    """
+    manifest = snapshots.read_manifest()
+    if args.refresh or manifest is None:
+        return True
+    age = datetime.now() - datetime.fromisoformat(manifest["createdAt"])
+    hours = age.total_seconds() / 3600
+    if hours <= args.max_age_hours:
+        return False
+    message = f"El snapshot de personas tiene {hours:.1f} h (máximo {args.max_age_hours:g} h)"
+    if not args.stale_ok:
+        raise RuntimeError(f"{message}. Use --refresh para descargar las personas o --stale-ok para usarlo igual.")
+    print(f"AVISO: {message}; se usa igual por --stale-ok", file=sys.stderr)
+    return False
+
+
+def _person_ids(args) -> Dict[str, str]:
+    """personCode → personId desde el snapshot de personas"""
+    table = snapshots.load_persons(_snapshot_refresh(args)).select(["personCode", "personId"]).to_pydict()
+    return {code: pid for code, pid in zip(table["personCode"], table["personId"]) if code and pid}
+
+
+def _read_rows(path: str) -> List[dict]:
+    """Filas de un JSON (lista de objetos), CSV o Excel"""
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    df = reconcile.read_table(path)
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+
+def _iso(dt: datetime) -> str:
+    return dt.isoformat(timespec="seconds")
+
+
+def cmd_vehicles_add(args):
+    rows = _read_rows(args.input)
+    done = DoneLog(args.input + ".done")
+    person_ids = None
+    now = datetime.now().astimezone()
+    jobs, skipped = [], 0
+    for row in rows:
+        plate = str(row.get("plateNo") or "").strip()
+        if not plate:
+            continue
+        if plate in done:
+            skipped += 1
+            continue
+        body = {
+            "plateNo": plate,
+            "vehicleGroupIndexCode": str(row.get("vehicleGroupIndexCode") or args.group),
+            "effectiveDate": row.get("effectiveDate") or _iso(now),
+            "expiredDate": row.get("expiredDate") or _iso(now + timedelta(days=365)),
+        }
+        for key in ("personId", "personGivenName", "personFamilyName", "phoneNo", "plateCategory", "plateArea", "vehicleColor"):
+            if row.get(key) not in (None, ""):
+                body[key] = row[key]
+        if "personId" not in body and row.get("personCode"):
+            if person_ids is None:
+                person_ids = _person_ids(args)
+            person_id = person_ids.get(str(row["personCode"]).strip())
+            if not person_id:
+                print(f"ERROR {plate}: personCode {row['personCode']} no existe", file=sys.stderr)
+                continue
+            body["personId"] = person_id
+        jobs.append(([plate], lambda body=body: hik_api.add_vehicle(body)))
+    if skipped:
+        print(f"{skipped} vehículos ya agregados en una corrida anterior")
+    return run_bulk(jobs, done, args.workers, "Vehículos")
+
+
+def cmd_photos_upload(args):
+    files = sorted(glob.glob(args.pattern))
+    if not files:
+        print(f"No hay archivos que coincidan con {args.pattern}")
+        return 0
+    done = DoneLog(args.state or "fotos.done")
+    df = pd.DataFrame({"file": files, "dni": [os.path.splitext(os.path.basename(f))[0] for f in files]})
+    result = reconcile.reconcile(df, "dni", reconcile.load_dni_index(refresh=_snapshot_refresh(args)))
+    for row in result[result["matchStatus"] != reconcile.MATCHED].itertuples():
+        print(f"SIN PERSONA {row.file}: DNI {row.dni} ({row.matchStatus})", file=sys.stderr)
+
+    def upload(path: str, person_code: str) -> dict:
+        with open(path, "rb") as f:
+            return hik_api.update_person_face(person_code, base64.b64encode(f.read()).decode())
+
+    matched = result[result["matchStatus"] == reconcile.MATCHED]
+    jobs = [
+        ([row.file], lambda row=row: upload(row.file, row.personCode))
+        for row in matched.itertuples()
+        if row.file not in done
+    ]
+    if len(jobs) < len(matched):
+        print(f"{len(matched) - len(jobs)} fotos ya subidas en una corrida anterior")
+    return run_bulk(jobs, done, args.workers, "Fotos")
+
+
+def cmd_access_level_assign(args):
+    codes = list(args.codes)
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            codes += [line.strip() for line in f if line.strip()]
+    done = DoneLog(args.state or f"access-level-{args.group}.done")
+    pending = [code for code in dict.fromkeys(codes) if code not in done]
+    if len(pending) < len(codes):
+        print(f"{len(codes) - len(pending)} personas ya asignadas en una corrida anterior")
+
+    person_ids = _person_ids(args)
+    missing = [code for code in pending if code not in person_ids]
+    for code in missing:
+        print(f"ERROR {code}: personCode no existe", file=sys.stderr)
+    found = [code for code in pending if code in person_ids]
+
+    # addPersons acepta varias personas por llamada
+    jobs = []
+    for i in range(0, len(found), args.batch_size):
+        batch = found[i:i + args.batch_size]
+        ids = [person_ids[code] for code in batch]
+        jobs.append((batch, lambda ids=ids: hik_api.add_persons_to_privilege_group(args.group, ids)))
+    return run_bulk(jobs, done, args.workers, "Lotes") + len(missing)
+
+
+def _add_snapshot_args(p: argparse.ArgumentParser):
+    p.add_argument("--refresh", action="store_true", help="Descargar personas en vez de usar el snapshot")
+    p.add_argument("--max-age-hours", type=float, default=24, help="Antigüedad máxima del snapshot de personas")
+    p.add_argument("--stale-ok", action="store_true", help="Usar el snapshot aunque supere --max-age-hours")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Administración de HikCentral")
+    parser.add_argument("--workers", type=int, default=8, help="Llamadas en paralelo")
+    sub = parser.add_subparsers(dest="resource", required=True)
+
+    persons = sub.add_parser("persons").add_subparsers(dest="action", required=True)
+    p = persons.add_parser("export", help="Exporta todas las personas")
+    p.add_argument("-o", "--output", default="person_data.json")
+    p.add_argument("--page-size", type=int, default=200)
+    p.add_argument("--raw", action="store_true", help="Respuesta completa de HikCentral en vez del resumen")
+    p.set_defaults(func=cmd_persons_export)
+
+    p = persons.add_parser("info", help="Muestra una o más personas por personCode")
+    p.add_argument("codes", nargs="+", help="personCode")
+    p.add_argument("--field", help="Solo este campo, ej: orgIndexCode")
+    p.set_defaults(func=cmd_persons_info)
+    p = persons.add_parser("add", help="Crea una persona")
+    p.add_argument("--code", required=True, help="personCode")
+    p.add_argument("--given-name", required=True)
+    p.add_argument("--family-name", required=True)
+    p.add_argument("--gender", default="1", choices=["0", "1", "2"], help="1=Masculino, 2=Femenino")
+    p.add_argument("--org", default="1", help="orgIndexCode (1=UNALM)")
+    p.add_argument("--position")
+    p.add_argument("--dni", help="Guarda el DNI como campo personalizado y verifica que quedó")
+    p.set_defaults(func=cmd_persons_add)
+
+    fields = sub.add_parser("custom-fields").add_subparsers(dest="action", required=True)
+    p = fields.add_parser("export", help="Exporta los campos personalizados de personas")
+    p.add_argument("-o", "--output", default="person_custom_fields.json")
+    p.add_argument("--page-size", type=int, default=200)
+    p.set_defaults(func=cmd_custom_fields_export)
+
+    vehicles = sub.add_parser("vehicles").add_subparsers(dest="action", required=True)
+    p = vehicles.add_parser("export", help="Exporta los vehículos de un grupo")
+    p.add_argument("-o", "--output", default="vehicle_data.json")
+    p.add_argument("--group", default="2", help="vehicleGroupIndexCode")
+    p.add_argument("--page-size", type=int, default=200)
+    p.set_defaults(func=cmd_vehicles_export)
+    p = vehicles.add_parser("add", help="Agrega vehículos desde un JSON, CSV o Excel")
+    p.add_argument("input", help="Columnas: plateNo y personId o personCode (opcionales: fechas, grupo...)")
+    p.add_argument("--group", default="2", help="vehicleGroupIndexCode por defecto")
+    _add_snapshot_args(p)
+    p.set_defaults(func=cmd_vehicles_add)
+
+    vehicle_groups = sub.add_parser("vehicle-groups").add_subparsers(dest="action", required=True)
+    p = vehicle_groups.add_parser("list", help="Lista los grupos de vehículos")
+    p.set_defaults(func=cmd_vehicle_groups_list)
+
+    orgs = sub.add_parser("orgs").add_subparsers(dest="action", required=True)
+    p = orgs.add_parser("export", help="Exporta las organizaciones")
+    p.add_argument("-o", "--output", default="orgs.json")
+    p.add_argument("--page-size", type=int, default=500)
+    p.set_defaults(func=cmd_orgs_export)
+
+    groups = sub.add_parser("privilege-groups").add_subparsers(dest="action", required=True)
+    p = groups.add_parser("list", help="Lista los grupos de privilegios (access levels)")
+    p.add_argument("--page-size", type=int, default=100)
+    p.set_defaults(func=cmd_privilege_groups_list)
+
+    photos = sub.add_parser("photos").add_subparsers(dest="action", required=True)
+    p = photos.add_parser("upload", help="Sube fotos de rostro; el nombre del archivo es el DNI")
+    p.add_argument("pattern", help='Patrón de archivos, ej: "fotos/*.jpg"')
+    p.add_argument("--state", help="Archivo de avance (por defecto fotos.done)")
+    _add_snapshot_args(p)
+    p.set_defaults(func=cmd_photos_upload)
+
+    access = sub.add_parser("access-level").add_subparsers(dest="action", required=True)
+    p = access.add_parser("assign", help="Agrega personas (por personCode) a un grupo de privilegios")
+    p.add_argument("--group", required=True, help="privilegeGroupId")
+    p.add_argument("codes", nargs="*", help="personCode")
+    p.add_argument("--file", help="Archivo con un personCode por línea")
+    p.add_argument("--batch-size", type=int, default=100, help="Personas por llamada")
+    p.add_argument("--state", help="Archivo de avance (por defecto access-level-<grupo>.done)")
+    _add_snapshot_args(p)
+    p.set_defaults(func=cmd_access_level_assign)
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    # El pool de paginación compartido usa los hilos pedidos con --workers
+    settings.HIKCENTRAL_PAGE_WORKERS = args.workers
+    try:
+        failed = args.func(args)
+    except RuntimeError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        failed = 1
+    finally:
+        pagination.shutdown_executor()
+        hik_api.close()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Logging estructurado y asíncrono de la API.
+
+- Los registros se encolan (QueueHandler) y un hilo (QueueListener) los
+  formatea y escribe, de modo que el request no paga la escritura a stdout.
+- Formato JSON (o texto con LOG_FORMAT=text), con nivel, logger, mensaje y
+  el id de correlación del request.
+- Los campos extra (``extra={"payload": ...}``) se copian al momento de
+  loguear con las claves sensibles ocultas (password, token, fotos base64...)
+  y los textos largos recortados a LOG_MAX_FIELD_CHARS.
+
+Uso:
+    from .logs import get_logger
+    logger = get_logger(__name__)
+    logger.info("Persona creada", extra={"payload": response})
+"""
+import json
+import logging
+import queue
+import re
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+
+REQUEST_ID_HEADER = "X-Request-ID"
+REDACTED = "[REDACTED]"
+
+# Claves cuyo valor nunca se escribe en los logs
+_SENSITIVE_KEYS = re.compile(
+    r"password|passwd|secret|token|authorization|signature|facedata|photo|picture|image|base64",
+    re.IGNORECASE,
+)
+_MAX_DEPTH = 4
+
+# Atributos estándar de LogRecord (todo lo demás viene de ``extra``)
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+_listener: Optional[QueueListener] = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(name)
+
+
+def _truncate(value: str, limit: int) -> str:
+    if len(value) <= limit:
+        return value
+    return f"{value[:limit]}...(+{len(value) - limit} caracteres)"
+
+
+def sanitize(value, limit: Optional[int] = None, depth: int = 0):
+    """Copia de ``value`` con claves sensibles ocultas y textos recortados"""
+    limit = limit or settings.LOG_MAX_FIELD_CHARS
+    if isinstance(value, str):
+        return _truncate(value, limit)
+    if isinstance(value, (int, float, bool)) or value is None:
+        return value
+    if depth >= _MAX_DEPTH:
+        return _truncate(repr(value), limit)
+    if isinstance(value, dict):
+        return {
+            str(k): REDACTED if _SENSITIVE_KEYS.search(str(k)) else sanitize(v, limit, depth + 1)
+            for k, v in value.items()
+        }
+    if isinstance(value, (list, tuple, set)):
+        items = list(value)
+        result = [sanitize(v, limit, depth + 1) for v in items[:20]]
+        if len(items) > 20:
+            result.append(f"...(+{len(items) - 20} elementos)")
+        return result
+    return _truncate(str(value), limit)
+
+
+class _SanitizingQueueHandler(QueueHandler):
+    """Encola el registro con el mensaje ya armado y los extras saneados"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        has_traceback = record.exc_info is not None
+        record = super().prepare(record)
+        if not has_traceback:
+            record.msg = _truncate(record.msg, settings.LOG_MAX_FIELD_CHARS * 4)
+        if getattr(record, "request_id", None) is None:
+            record.request_id = request_id_var.get()
+        for key in set(vars(record)) - _RECORD_ATTRS - {"request_id"}:
+            value = getattr(record, key)
+            setattr(record, key, REDACTED if _SENSITIVE_KEYS.search(key) else sanitize(value))
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """Un objeto JSON por línea"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            data["request_id"] = record.request_id
+        for key in set(vars(record)) - _RECORD_ATTRS - {"request_id"}:
+            data[key] = getattr(record, key)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        if not hasattr(record, "request_id"):
+            record.request_id = "-"
+        line = super().format(record)
+        extras = {key: getattr(record, key) for key in set(vars(record)) - _RECORD_ATTRS - {"request_id"}}
+        if extras:
+            line += " " + json.dumps(extras, ensure_ascii=False, default=str)
+        return line
+
+
+def setup_logging():
+    """Configura el logger raíz con la cola y el hilo escritor (idempotente)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter() if settings.LOG_FORMAT == "json" else TextFormatter())
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_SanitizingQueueHandler(log_queue))
+    root.setLevel(settings.LOG_LEVEL.upper())
+    # aiosqlite registra cada operación en DEBUG
+    logging.getLogger("aiosqlite").setLevel(max(root.level, logging.INFO))
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging():
+    """Escribe los registros pendientes y detiene el hilo escritor"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class RequestIdMiddleware:
+    """Asigna un id de correlación a cada request (X-Request-ID entrante o uno nuevo)"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = dict(scope["headers"]).get(REQUEST_ID_HEADER.lower().encode())
+        request_id = incoming.decode("latin-1")[:64] if incoming else uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id_var.reset(token)
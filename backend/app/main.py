@@ -1,15 +1,29 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from .database import engine, Base
 from .routers import auth_routes, person_routes, audit_routes
 from .config import settings
-from . import models, auth
-from .database import SessionLocal
+from .middleware import CompressionMiddleware
+from .metrics import MetricsMiddleware
+from .logs import RequestIdMiddleware, get_logger
+from .tracing import TracingMiddleware
+from . import models, auth, audit, audit_archive, logs, metrics, pagination, snapshots, tracing
+from .database import AsyncSessionLocal, SessionLocal, async_engine
+from .hikcentral import hik_api
+
+# Logging estructurado (cola + hilo escritor)
+logs.setup_logging()
+logger = get_logger(__name__)
 
 # Crear tablas
 Base.metadata.create_all(bind=engine)
+# create_all no agrega índices nuevos a tablas existentes
+for index in models.AuditLog.__table__.indexes:
+    index.create(bind=engine, checkfirst=True)
 
-app = FastAPI(title="HikCentral Management API")
+# orjson como serializador por defecto de todos los routers
+app = FastAPI(title="HikCentral Management API", default_response_class=ORJSONResponse)
 
 # Configurar CORS
 app.add_middleware(
@@ -18,8 +32,28 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Content-Disposition", "X-Request-ID"],
 )
 
+# Comprimir respuestas (brotli/gzip) para túneles ngrok y conexiones móviles
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+)
+
+# Latencia por ruta (middleware externo: incluye compresión y CORS)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Span raíz por request (dentro del id de correlación para etiquetarlo)
+if settings.TRACING_EXPORTER.lower() != "none":
+    app.add_middleware(TracingMiddleware)
+
+# Id de correlación por request (el más externo: cubre todo lo demás)
+app.add_middleware(RequestIdMiddleware)
+
 # Incluir routers
 app.include_router(auth_routes.router)
 app.include_router(person_routes.router)
@@ -28,26 +62,57 @@ app.include_router(audit_routes.router)
 @app.on_event("startup")
 async def startup_event():
     """Crea un usuario admin por defecto si no existe"""
+    logs.setup_logging()
+    tracing.setup_tracing()
+    async with AsyncSessionLocal() as db:
+        try:
+            # Verificar si existe un admin
+            admin = await auth.get_user_by_username(db, settings.ADMIN_USERNAME)
+            if not admin:
+                from .schemas import UserCreate
+                admin_user = UserCreate(
+                    username=settings.ADMIN_USERNAME,
+                    email=settings.ADMIN_EMAIL,
+                    full_name="Administrador",
+                    password=settings.ADMIN_PASSWORD,
+                    role="admin"
+                )
+                await auth.create_user(db, admin_user)
+                logger.info(f"✅ Usuario admin creado: username={settings.ADMIN_USERNAME}")
+                logger.warning("⚠️  IMPORTANTE: Cambiar contraseña en producción")
+        except Exception as e:
+            logger.exception(f"❌ Error al crear usuario admin: {e}")
+    
+    # Rollups diarios para auditoría existente (antes de iniciar el escritor)
+    audit.check_database_support(engine)
     db = SessionLocal()
     try:
-        # Verificar si existe un admin
-        admin = db.query(models.User).filter(models.User.username == settings.ADMIN_USERNAME).first()
-        if not admin:
-            from .schemas import UserCreate
-            admin_user = UserCreate(
-                username=settings.ADMIN_USERNAME,
-                email=settings.ADMIN_EMAIL,
-                full_name="Administrador",
-                password=settings.ADMIN_PASSWORD,
-                role="admin"
-            )
-            auth.create_user(db, admin_user)
-            print(f"✅ Usuario admin creado: username={settings.ADMIN_USERNAME}")
-            print("⚠️  IMPORTANTE: Cambiar contraseña en producción")
+        audit.ensure_rollups(db)
     except Exception as e:
-        print(f"❌ Error al crear usuario admin: {e}")
+        logger.exception(f"❌ Error al generar rollups de auditoría: {e}")
     finally:
         db.close()
+    
+    # Escritura de auditoría por lotes y archivado de registros antiguos
+    audit.start_writer()
+    audit_archive.start_scheduler()
+    
+    # Snapshots periódicos de personas/vehículos
+    snapshots.start_scheduler()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Detiene las tareas en segundo plano"""
+    snapshots.stop_scheduler()
+    audit_archive.stop_scheduler()
+    auth.shutdown_password_executor()
+    pagination.shutdown_executor()
+    # Vaciar la cola de auditoría antes de salir
+    audit.stop_writer()
+    hik_api.close()
+    await async_engine.dispose()
+    tracing.shutdown_tracing()
+    logs.shutdown_logging()
 
 @app.get("/")
 async def root():
@@ -59,6 +124,14 @@ async def root():
         "status": "running"
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Métricas en formato Prometheus"""
+    if not settings.METRICS_ENABLED:
+        return Response(status_code=404)
+    content, content_type = metrics.render()
+    return Response(content, media_type=content_type)
+
 @app.get("/health")
 async def health():
     """Health check"""
@@ -0,0 +1,153 @@
+"""
+Métricas Prometheus de la API (expuestas en /metrics).
+
+- Latencia de cada request por ruta (plantilla, ej: /api/persons/{person_id}).
+- Latencia y resultado de cada llamada a HikCentral por path de Artemis y
+  código de respuesta.
+- Aciertos/fallos de los caches en memoria (ratio = hit / (hit + miss)).
+- Ocupación de los pools de hilos y del pool de conexiones de la BD,
+  leída en el momento del scrape.
+
+Con varios workers de uvicorn cada proceso expone sus propias métricas.
+"""
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Buckets hasta 30s: los listados completos de HikCentral tardan varios segundos
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Latencia de los requests HTTP por ruta",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_LATENCY = Histogram(
+    "hikcentral_request_duration_seconds",
+    "Latencia de las llamadas a HikCentral por path de Artemis",
+    ["path"],
+    buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_RESULTS = Counter(
+    "hikcentral_requests_total",
+    "Llamadas a HikCentral por path y código de resultado (code de la API o ERROR)",
+    ["path", "code"],
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Consultas a los caches en memoria",
+    ["cache", "result"],
+)
+
+# Segmentos variables de los paths de Artemis (ids numéricos o hexadecimales)
+_ID_SEGMENT = re.compile(r"/(?:\d+|[0-9a-fA-F-]{16,})(?=/|$)")
+
+
+def upstream_path_label(path: str) -> str:
+    """Path de Artemis con los ids reemplazados por {id} (evita labels de alta cardinalidad)"""
+    return _ID_SEGMENT.sub("/{id}", path)
+
+
+def observe_upstream(path: str, seconds: float, code) -> None:
+    """Registra una llamada a HikCentral"""
+    label = upstream_path_label(path)
+    UPSTREAM_LATENCY.labels(label).observe(seconds)
+    UPSTREAM_RESULTS.labels(label, str(code)).inc()
+
+
+def cache_hit(cache: str) -> None:
+    CACHE_REQUESTS.labels(cache, "hit").inc()
+
+
+def cache_miss(cache: str) -> None:
+    CACHE_REQUESTS.labels(cache, "miss").inc()
+
+
+class PoolCollector:
+    """Ocupación de pools de hilos y del pool de conexiones, calculada en cada scrape"""
+
+    def __init__(self):
+        self.executors: Dict[str, Callable[[], Optional[ThreadPoolExecutor]]] = {}
+        self.db_pools: Dict[str, Callable[[], object]] = {}
+        self.queues: Dict[str, Callable[[], int]] = {}
+
+    def collect(self):
+        threads = GaugeMetricFamily("executor_threads", "Hilos activos del pool", labels=["pool"])
+        max_workers = GaugeMetricFamily("executor_max_workers", "Hilos máximos del pool", labels=["pool"])
+        queued = GaugeMetricFamily("executor_queued_tasks", "Tareas esperando un hilo libre", labels=["pool"])
+        for name, get_executor in self.executors.items():
+            executor = get_executor()
+            if executor is None:
+                continue
+            threads.add_metric([name], len(executor._threads))
+            max_workers.add_metric([name], executor._max_workers)
+            queued.add_metric([name], executor._work_queue.qsize())
+        yield threads
+        yield max_workers
+        yield queued
+
+        checked_out = GaugeMetricFamily("db_pool_checked_out", "Conexiones de BD en uso", labels=["engine"])
+        pool_size = GaugeMetricFamily("db_pool_size", "Tamaño configurado del pool de BD", labels=["engine"])
+        overflow = GaugeMetricFamily("db_pool_overflow", "Conexiones de BD sobre el tamaño del pool", labels=["engine"])
+        for name, get_pool in self.db_pools.items():
+            pool = get_pool()
+            if not hasattr(pool, "checkedout"):
+                continue  # Pools sin contadores (ej: SQLite en memoria)
+            checked_out.add_metric([name], pool.checkedout())
+            pool_size.add_metric([name], pool.size())
+            overflow.add_metric([name], max(pool.overflow(), 0))
+        yield checked_out
+        yield pool_size
+        yield overflow
+
+        depth = GaugeMetricFamily("queue_depth", "Elementos pendientes en colas internas", labels=["queue"])
+        for name, get_depth in self.queues.items():
+            depth.add_metric([name], get_depth())
+        yield depth
+
+
+pools = PoolCollector()
+REGISTRY.register(pools)
+
+
+class MetricsMiddleware:
+    """Mide la latencia de cada request HTTP con la plantilla de la ruta"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # FastAPI deja la ruta que atendió el request en scope["route"]
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status_code),
+            ).observe(time.perf_counter() - start)
+
+
+def render() -> tuple:
+    """Retorna (contenido, content-type) para el endpoint /metrics"""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
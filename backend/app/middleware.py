@@ -0,0 +1,70 @@
+"""
+Middlewares propios de la API.
+
+CompressionMiddleware comprime las respuestas con brotli (si el cliente lo
+acepta y la librería está instalada) o gzip, a partir de un tamaño mínimo
+configurable. Reutiliza los responders de Starlette para soportar tanto
+respuestas normales como en streaming.
+"""
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional: sin él se usa solo gzip
+    brotli = None
+
+
+def _accepted_encodings(header: str) -> set:
+    """Codificaciones aceptadas según Accept-Encoding (ignora las que tienen q=0)"""
+    accepted = set()
+    for item in header.split(","):
+        token, _, params = item.strip().partition(";")
+        params = params.replace(" ", "")
+        if token and params not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(token.lower())
+    return accepted
+
+
+class BrotliResponder(IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int = 4) -> None:
+        super().__init__(app, minimum_size)
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        if more_body:
+            return self.compressor.process(body) + self.compressor.flush()
+        return self.compressor.process(body) + self.compressor.finish()
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accepted = _accepted_encodings(Headers(scope=scope).get("Accept-Encoding", ""))
+        responder: ASGIApp
+        if brotli is not None and "br" in accepted:
+            responder = BrotliResponder(self.app, self.minimum_size, quality=self.brotli_quality)
+        elif "gzip" in accepted:
+            responder = GZipResponder(self.app, self.minimum_size, compresslevel=self.gzip_level)
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size)
+
+        await responder(scope, receive, send)
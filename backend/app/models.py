@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, ForeignKey, Table, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .database import Base
@@ -45,3 +45,24 @@ class AuditLog(Base):
     timestamp = Column(DateTime, default=datetime.now)
     
     user = relationship("User")
+    
+    # Índices para el listado (orden timestamp desc, id desc) con y sin filtro de usuario
+    __table_args__ = (
+        Index("ix_audit_logs_timestamp_id", "timestamp", "id"),
+        Index("ix_audit_logs_user_id_timestamp_id", "user_id", "timestamp", "id"),
+    )
+
+class AuditDailyRollup(Base):
+    """Conteo diario de acciones por usuario, módulo y acción (se actualiza al escribir la auditoría)"""
+    __tablename__ = "audit_daily_rollups"
+    
+    id = Column(Integer, primary_key=True)
+    day = Column(Date, nullable=False)
+    user_id = Column(Integer, nullable=False)  # 0 = sin usuario
+    module = Column(String, nullable=False)
+    action = Column(String, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        UniqueConstraint("day", "user_id", "module", "action", name="uq_audit_daily_rollups_key"),
+    )
@@ -0,0 +1,317 @@
+"""
+Motor de paginación para los listados de HikCentral.
+
+Los listados de Artemis se piden por página (pageNo/pageSize) y la primera
+respuesta trae el total. ``Paginator`` pide la página 1, calcula cuántas
+hay y descarga el resto en un pool de hilos compartido por todos los
+listados (HIKCENTRAL_PAGE_WORKERS), con a lo sumo HIKCENTRAL_PAGE_PREFETCH
+páginas en vuelo por listado:
+
+- Las páginas se entregan siempre en orden de pageNo, en iteración normal
+  (``pages``) o asíncrona (``apages``, sin bloquear el event loop).
+- ``collect(until=...)`` corta en el primer elemento que cumple el
+  predicado y cancela las páginas pendientes.
+- ``find_first`` busca un solo elemento (ej: un personId) sin importar el
+  orden: pide las páginas en oleadas paralelas y cancela el resto apenas
+  una página trae la coincidencia. Las llamadas ya enviadas terminan en
+  segundo plano; solo se cancelan las que seguían en cola.
+- Una página con error no corta el listado: queda en ``PageResult.errors``
+  y el llamador decide si le sirve el resultado parcial (``strict=True``
+  lanza PaginationError).
+"""
+import asyncio
+import math
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import AsyncIterator, Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from . import metrics, tracing
+from .config import settings
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+FetchPage = Callable[[int, int], dict]  # (pageNo, pageSize) -> respuesta de HikCentral
+
+_executor: Optional[ThreadPoolExecutor] = None
+metrics.pools.executors["hik_pages"] = lambda: _executor
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Retorna el pool de paginación (se crea al primer uso y tras un apagado)"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.HIKCENTRAL_PAGE_WORKERS, thread_name_prefix="hik-pages"
+        )
+    return _executor
+
+
+def shutdown_executor():
+    """Cancela las páginas en cola y espera las que están en curso"""
+    global _executor
+    executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+class PageError(NamedTuple):
+    page: int
+    code: str
+    msg: str
+
+
+class PaginationError(RuntimeError):
+    """Una o más páginas de un listado fallaron"""
+
+    def __init__(self, errors: List[PageError]):
+        self.errors = errors
+        first = errors[0]
+        super().__init__(f"{len(errors)} páginas con error (página {first.page}: {first.msg})")
+
+
+class PageResult:
+    """Elementos de un listado y cómo terminó la descarga"""
+
+    def __init__(self, items: List[dict], total: Optional[int], pages: int, errors: List[PageError], match: Optional[dict]):
+        self.items = items
+        self.total = total
+        self.pages = pages  # Páginas pedidas (con y sin error)
+        self.errors = errors
+        self.match = match  # Elemento que cumplió ``until`` o ``find_first`` (la descarga se cortó ahí)
+
+    @property
+    def complete(self) -> bool:
+        """Todas las páginas llegaron y no se cortó antes"""
+        return not self.errors and self.match is None
+
+    def raise_for_errors(self):
+        if self.errors:
+            raise PaginationError(self.errors)
+
+
+def _fetch(fetch_page: FetchPage, page_no: int, page_size: int) -> dict:
+    try:
+        return fetch_page(page_no, page_size)
+    except Exception as e:
+        return {"code": "ERROR", "msg": str(e)}
+
+
+class Paginator:
+    """Recorre un listado paginado con prefetch paralelo acotado y orden garantizado.
+
+    Con ``total`` conocido (ej: al retomar una descarga) no hace falta pedir
+    la página 1 primero; ``skip`` son páginas que no se vuelven a pedir.
+    """
+
+    def __init__(
+        self,
+        fetch_page: FetchPage,
+        page_size: int,
+        prefetch: Optional[int] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+        total: Optional[int] = None,
+        skip: Iterable[int] = (),
+    ):
+        self.fetch_page = fetch_page
+        self.page_size = page_size
+        self.prefetch = max(1, prefetch or settings.HIKCENTRAL_PAGE_PREFETCH)
+        self.executor = executor
+        self.total = total
+        self.skip = frozenset(skip)
+        self.errors: List[PageError] = []
+        self.pages_fetched = 0
+        self._probed = set()  # Páginas ya revisadas por find_first
+
+    @property
+    def last_page(self) -> Optional[int]:
+        if self.total is None:
+            return None
+        return max(1, math.ceil(self.total / self.page_size))
+
+    def _submit(self, page_no: int) -> Future:
+        executor = self.executor or get_executor()
+        return executor.submit(tracing.propagate(_fetch), self.fetch_page, page_no, self.page_size)
+
+    def _accept(self, page_no: int, response: dict) -> Optional[List[dict]]:
+        """Lista de la página, o None si vino con error (queda registrado)"""
+        self.pages_fetched += 1
+        if isinstance(response, dict) and str(response.get("code")) == "0":
+            data = response.get("data") or {}
+            if self.total is None:
+                self.total = data.get("total") or 0
+            return data.get("list") or []
+        code = response.get("code") if isinstance(response, dict) else "INVALID"
+        msg = response.get("msg", "Error desconocido") if isinstance(response, dict) else str(response)
+        self.errors.append(PageError(page_no, str(code), msg))
+        logger.warning(f"Error al obtener página {page_no}: {msg}")
+        return None
+
+    def _pending(self, start: int) -> Iterator[int]:
+        return (page for page in range(start, self.last_page + 1) if page not in self.skip)
+
+    def _fill(self, window: Deque[Tuple[int, Future]], pending: Iterator[int]):
+        while len(window) < self.prefetch:
+            page_no = next(pending, None)
+            if page_no is None:
+                return
+            window.append((page_no, self._submit(page_no)))
+
+    def pages(self) -> Iterator[Tuple[int, List[dict]]]:
+        """(pageNo, lista) en orden; al cerrar el iterador se cancelan las pendientes"""
+        start = 1
+        if self.total is None:
+            items = self._accept(1, _fetch(self.fetch_page, 1, self.page_size))
+            if items is None:
+                return  # Sin página 1 no se conoce el total
+            yield 1, items
+            start = 2
+
+        pending = self._pending(start)
+        window: Deque[Tuple[int, Future]] = deque()
+        try:
+            self._fill(window, pending)
+            while window:
+                page_no, future = window.popleft()
+                items = self._accept(page_no, future.result())
+                self._fill(window, pending)
+                if items is not None:
+                    yield page_no, items
+        finally:
+            for _, future in window:
+                future.cancel()
+
+    async def apages(self) -> AsyncIterator[Tuple[int, List[dict]]]:
+        """Igual que ``pages`` pero esperando las páginas sin bloquear el event loop"""
+        start = 1
+        if self.total is None:
+            items = self._accept(1, await asyncio.wrap_future(self._submit(1)))
+            if items is None:
+                return
+            yield 1, items
+            start = 2
+
+        pending = self._pending(start)
+        window: Deque[Tuple[int, Future]] = deque()
+        try:
+            self._fill(window, pending)
+            while window:
+                page_no, future = window.popleft()
+                items = self._accept(page_no, await asyncio.wrap_future(future))
+                self._fill(window, pending)
+                if items is not None:
+                    yield page_no, items
+        finally:
+            for _, future in window:
+                future.cancel()
+
+    def _result(self, items: List[dict], match: Optional[dict], strict: bool) -> PageResult:
+        result = PageResult(items, self.total, self.pages_fetched, list(self.errors), match)
+        if strict:
+            result.raise_for_errors()
+        return result
+
+    def collect(self, until: Optional[Callable[[dict], bool]] = None, strict: bool = False) -> PageResult:
+        """Todos los elementos en orden; con ``until`` corta en el primero que lo cumple"""
+        items: List[dict] = []
+        pages = self.pages()
+        try:
+            for _, page in pages:
+                for item in page:
+                    if not item:
+                        continue
+                    items.append(item)
+                    if until is not None and until(item):
+                        return self._result(items, item, strict)
+        finally:
+            pages.close()
+        return self._result(items, None, strict)
+
+    async def acollect(self, until: Optional[Callable[[dict], bool]] = None, strict: bool = False) -> PageResult:
+        """Versión asíncrona de ``collect``"""
+        items: List[dict] = []
+        pages = self.apages()
+        try:
+            async for _, page in pages:
+                for item in page:
+                    if not item:
+                        continue
+                    items.append(item)
+                    if until is not None and until(item):
+                        return self._result(items, item, strict)
+        finally:
+            await pages.aclose()
+        return self._result(items, None, strict)
+
+    def _waves(self, wave: Optional[int], from_end: bool) -> Iterator[List[int]]:
+        """Páginas 2..N (o todas si ya se conoce el total) agrupadas en oleadas"""
+        size = max(1, wave or settings.HIKCENTRAL_PAGE_WORKERS)
+        pages = [page for page in range(1, self.last_page + 1) if page not in self.skip and page not in self._probed]
+        if from_end:
+            pages.reverse()
+        for i in range(0, len(pages), size):
+            yield pages[i:i + size]
+
+    def _match(self, page_no: int, response: dict, predicate: Callable[[dict], bool]) -> Optional[dict]:
+        self._probed.add(page_no)
+        items = self._accept(page_no, response) or []
+        return next((item for item in items if item and predicate(item)), None)
+
+    def _found(self, match: Optional[dict]) -> PageResult:
+        return PageResult([match] if match is not None else [], self.total, self.pages_fetched, list(self.errors), match)
+
+    def find_first(
+        self, predicate: Callable[[dict], bool], wave: Optional[int] = None, from_end: bool = False
+    ) -> PageResult:
+        """Primer elemento encontrado que cumple ``predicate`` (en ``PageResult.match``).
+
+        Pide la página 1 (si no se conoce el total) y luego el resto en
+        oleadas de ``wave`` páginas en paralelo (por defecto
+        HIKCENTRAL_PAGE_WORKERS); ``from_end`` empieza por las últimas, donde
+        quedan las altas recientes.
+        """
+        self._probed = set()
+        if self.total is None:
+            match = self._match(1, _fetch(self.fetch_page, 1, self.page_size), predicate)
+            if match is not None or self.total is None:
+                return self._found(match)
+
+        for pages in self._waves(wave, from_end):
+            futures: Dict[Future, int] = {self._submit(page): page for page in pages}
+            try:
+                while futures:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        match = self._match(futures.pop(future), future.result(), predicate)
+                        if match is not None:
+                            return self._found(match)
+            finally:
+                for future in futures:
+                    future.cancel()
+        return self._found(None)
+
+    async def afind_first(
+        self, predicate: Callable[[dict], bool], wave: Optional[int] = None, from_end: bool = False
+    ) -> PageResult:
+        """Versión asíncrona de ``find_first``"""
+        self._probed = set()
+        if self.total is None:
+            match = self._match(1, await asyncio.wrap_future(self._submit(1)), predicate)
+            if match is not None or self.total is None:
+                return self._found(match)
+
+        for pages in self._waves(wave, from_end):
+            futures = {self._submit(page): page for page in pages}
+            waiting = {asyncio.wrap_future(future): future for future in futures}
+            try:
+                while waiting:
+                    done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        future = waiting.pop(task)
+                        match = self._match(futures.pop(future), task.result(), predicate)
+                        if match is not None:
+                            return self._found(match)
+            finally:
+                for future in futures:
+                    future.cancel()
+        return self._found(None)
@@ -0,0 +1,146 @@
+"""
+Cruce vectorizado de documentos (DNI) de una hoja de cálculo contra HikCentral.
+
+Normaliza la columna de documentos de forma vectorizada y hace un único
+hash join contra el índice DNI → personCode (tomado del snapshot Arrow si
+existe, o descargado de HikCentral). Cada fila queda marcada como
+``matched``, ``unmatched`` o ``ambiguous``.
+
+Uso:
+    python -m app.reconcile BD-PLACAS.xlsx -o BD-PLACAS-UPDATED.xlsx
+"""
+import argparse
+import os
+import time
+from typing import Optional
+
+import pandas as pd
+
+from . import snapshots
+
+MATCHED = "matched"
+UNMATCHED = "unmatched"
+AMBIGUOUS = "ambiguous"
+
+
+def normalize_documents(values: pd.Series) -> pd.Series:
+    """Normaliza números de documento a una clave de cruce.
+
+    Reemplaza los intentos "exacto / con un 0 / con dos 0" por una sola clave:
+    "12345678", "012345678" y 12345678.0 producen la misma. Las letras se
+    conservan (en mayúsculas) para que pasaportes y carnés de extranjería no
+    coincidan con un DNI numérico: solo se quitan espacios, separadores
+    (. - / _ ,), el ".0" final de Excel y los ceros a la izquierda.
+    """
+    keys = values.astype("string").str.strip()
+    # Floats convertidos a string por Excel (ej: "12345678.0")
+    keys = keys.str.replace(r"\.0+$", "", regex=True)
+    keys = keys.str.replace(r"[\s.\-/_,]", "", regex=True).str.upper().str.lstrip("0")
+    return keys.mask(keys == "")
+
+
+def load_dni_index(refresh: bool = False) -> pd.DataFrame:
+    """Retorna el índice DNI con columnas ``dni`` y ``personCode``.
+
+    Usa el snapshot en disco salvo que no exista o se pida ``refresh``.
+    """
+    return snapshots.load_persons(refresh).select(["dni", "personCode"]).to_pandas()
+
+
+def build_key_index(dni_index: pd.DataFrame) -> pd.DataFrame:
+    """Agrupa el índice por clave normalizada: un personCode y cuántos candidatos hay"""
+    index = dni_index.assign(_key=normalize_documents(dni_index["dni"]))
+    index = index.dropna(subset=["_key", "personCode"])
+    return index.groupby("_key", sort=False).agg(
+        personCode=("personCode", "first"),
+        _candidates=("personCode", "nunique"),
+    )
+
+
+def reconcile(df: pd.DataFrame, column: str, dni_index: pd.DataFrame) -> pd.DataFrame:
+    """Agrega a ``df`` las columnas ``personCode`` y ``matchStatus``"""
+    if column not in df.columns:
+        raise KeyError(
+            f"El archivo no tiene la columna '{column}'. Columnas disponibles: {df.columns.tolist()}"
+        )
+
+    key_index = build_key_index(dni_index)
+    keys = normalize_documents(df[column])
+    joined = key_index.reindex(keys.to_numpy())
+
+    candidates = joined["_candidates"].fillna(0).to_numpy()
+    status = pd.Series(UNMATCHED, index=df.index)
+    status[candidates == 1] = MATCHED
+    status[candidates > 1] = AMBIGUOUS
+
+    result = df.copy()
+    # Los ambiguos no reciben personCode para no asignar una persona equivocada
+    result["personCode"] = joined["personCode"].where(candidates == 1).to_numpy()
+    result["matchStatus"] = status
+    return result
+
+
+def summarize(result: pd.DataFrame) -> dict:
+    """Cuenta filas por estado de cruce"""
+    counts = result["matchStatus"].value_counts()
+    return {
+        "total": int(len(result)),
+        MATCHED: int(counts.get(MATCHED, 0)),
+        UNMATCHED: int(counts.get(UNMATCHED, 0)),
+        AMBIGUOUS: int(counts.get(AMBIGUOUS, 0)),
+    }
+
+
+def report(result: pd.DataFrame, column: str) -> dict:
+    """Resumen y detalle (serializable a JSON) de un cruce"""
+    def rows(match_status: str, columns: list) -> list:
+        subset = result.loc[result["matchStatus"] == match_status, columns].astype(object)
+        return subset.where(subset.notna(), None).to_dict(orient="records")
+
+    return {
+        "summary": summarize(result),
+        MATCHED: rows(MATCHED, [column, "personCode"]),
+        UNMATCHED: rows(UNMATCHED, [column]),
+        AMBIGUOUS: rows(AMBIGUOUS, [column]),
+    }
+
+
+def read_table(path_or_buffer, filename: Optional[str] = None) -> pd.DataFrame:
+    """Lee un Excel o CSV según la extensión del archivo"""
+    name = (filename or str(path_or_buffer)).lower()
+    if name.endswith(".csv"):
+        return pd.read_csv(path_or_buffer, dtype=str)
+    return pd.read_excel(path_or_buffer, dtype=str)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cruza documentos de un Excel/CSV con los DNI de HikCentral")
+    parser.add_argument("input", help="Archivo Excel o CSV de entrada")
+    parser.add_argument("-o", "--output", help="Archivo de salida (por defecto <input>-UPDATED.xlsx)")
+    parser.add_argument("-c", "--column", default="DOCUMENTO", help="Columna con el número de documento")
+    parser.add_argument("--refresh", action="store_true", help="Descargar personas de HikCentral en vez de usar el snapshot")
+    args = parser.parse_args()
+
+    start = time.time()
+    dni_index = load_dni_index(refresh=args.refresh)
+    print(f"Índice DNI cargado: {len(dni_index)} personas ({time.time() - start:.2f}s)")
+
+    df = read_table(args.input)
+    start = time.time()
+    result = reconcile(df, args.column, dni_index)
+    summary = summarize(result)
+    print(f"Cruce completado en {time.time() - start:.2f}s")
+
+    print("--- RESULTADOS ---")
+    print(f"Total registros: {summary['total']}")
+    print(f"Coincidencias encontradas: {summary[MATCHED]}")
+    print(f"Sin coincidencia: {summary[UNMATCHED]}")
+    print(f"Ambiguos: {summary[AMBIGUOUS]}")
+
+    output = args.output or f"{os.path.splitext(args.input)[0]}-UPDATED.xlsx"
+    result.to_excel(output, index=False)
+    print(f"Archivo guardado en: {output}")
+
+
+if __name__ == "__main__":
+    main()
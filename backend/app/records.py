@@ -0,0 +1,150 @@
+"""
+Registros normalizados de personas y vehículos de HikCentral.
+
+Los campos personalizados (customFieldList) se interpretan una sola vez, al
+descargar las personas, en lugar de recorrerlos en cada listado o búsqueda.
+Los registros usan __slots__ y solo guardan los campos que expone la API,
+de modo que los caches en memoria no retienen los objetos completos de
+HikCentral (customFieldList, fotos, etc.). La conversión a dict se hace
+únicamente al armar la respuesta.
+
+Este módulo no depende de la configuración de la app para que también lo
+puedan usar los scripts de la carpeta backend.
+"""
+import difflib
+from typing import AbstractSet, Dict, Iterable, List, Optional, Tuple
+
+# (atributo, campo de la API)
+PERSON_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("person_id", "personId"),
+    ("person_code", "personCode"),
+    ("person_name", "personName"),
+    ("given_name", "personGivenName"),
+    ("family_name", "personFamilyName"),
+    ("gender", "gender"),
+    ("org_index_code", "orgIndexCode"),
+    ("phone_no", "phoneNo"),
+    ("email", "email"),
+    ("begin_time", "beginTime"),
+    ("end_time", "endTime"),
+)
+
+# Campos que puede pedir el cliente en los listados (fields=)
+PERSON_RESPONSE_FIELDS: Tuple[str, ...] = tuple(field for _, field in PERSON_FIELDS) + (
+    "certificateNumber", "plateNo", "vehicles",
+)
+
+VEHICLE_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("plate_no", "plateNo"),
+    ("effective_date", "effectiveDate"),
+    ("expired_date", "expiredDate"),
+    ("vehicle_id", "vehicleId"),
+)
+
+
+def custom_fields(person: dict) -> Dict[str, object]:
+    """Retorna los campos personalizados como {nombre_normalizado: valor}"""
+    fields = {}
+    for campo in person.get("customFieldList") or []:
+        # Manejar tanto customFieldName como customFiledName (typo en la API)
+        name = campo.get("customFieldName") or campo.get("customFiledName") or ""
+        name = str(name).strip().lower()
+        if name and fields.get(name) in (None, ""):
+            fields[name] = campo.get("customFieldValue")
+    return fields
+
+
+def extract_dni(person: dict) -> str:
+    """Extrae el DNI desde customFieldList ("" si no tiene)"""
+    value = custom_fields(person).get("dni")
+    if value is None:
+        return ""
+    return value.strip() if isinstance(value, str) else str(value)
+
+
+class PersonRecord:
+    """Persona de HikCentral con el DNI y las claves de búsqueda ya calculadas"""
+
+    __slots__ = tuple(attr for attr, _ in PERSON_FIELDS) + ("dni", "name_key", "code_key", "dni_key")
+
+    def __init__(self, data: dict):
+        for attr, field in PERSON_FIELDS:
+            setattr(self, attr, data.get(field))
+        self.dni = extract_dni(data)
+        self.name_key = (self.person_name or "").lower()
+        self.code_key = (self.person_code or "").lower()
+        self.dni_key = self.dni.lower()
+
+    def to_dict(self, fields: Optional[AbstractSet[str]] = None) -> dict:
+        """Proyección al formato de la API (con el DNI como certificateNumber).
+
+        Si se indica ``fields`` solo se incluyen esos campos.
+        """
+        result = {
+            field: getattr(self, attr)
+            for attr, field in PERSON_FIELDS
+            if fields is None or field in fields
+        }
+        if fields is None or "certificateNumber" in fields:
+            result["certificateNumber"] = self.dni
+        return result
+
+
+class VehicleRecord:
+    """Vehículo asociado a una persona en el cache de vehículos"""
+
+    __slots__ = tuple(attr for attr, _ in VEHICLE_FIELDS)
+
+    def __init__(self, data: dict):
+        for attr, field in VEHICLE_FIELDS:
+            setattr(self, attr, data.get(field))
+        self.plate_no = (self.plate_no or "").strip()
+
+    def to_dict(self) -> dict:
+        """Proyección al formato de la API"""
+        return {field: getattr(self, attr) for attr, field in VEHICLE_FIELDS}
+
+
+def normalize_persons(persons: Iterable[dict]) -> List[PersonRecord]:
+    """Convierte personas de la API en registros normalizados"""
+    return [PersonRecord(p) for p in persons if p]
+
+
+def index_by_dni(records: Iterable[PersonRecord]) -> Dict[str, PersonRecord]:
+    """Índice DNI → persona (si un DNI se repite se conserva el primero)"""
+    index = {}
+    for record in records:
+        if record.dni and record.dni not in index:
+            index[record.dni] = record
+    return index
+
+
+def search_records(records: Iterable[PersonRecord], search_lower: str, limit: int = 30) -> List[PersonRecord]:
+    """Registros cuyo nombre, código o DNI contienen ``search_lower``, ordenados por similitud"""
+    scored = []
+    for record in records:
+        # Check simple (contiene)
+        match_name = search_lower in record.name_key
+        match_code = search_lower in record.code_key
+        match_dni = search_lower in record.dni_key
+
+        if match_name or match_code or match_dni:
+            # Calcular score para ordenamiento
+            score = 0
+            if match_name:
+                score = max(score, difflib.SequenceMatcher(None, search_lower, record.name_key).ratio())
+            if match_code:
+                score = max(score, difflib.SequenceMatcher(None, search_lower, record.code_key).ratio())
+            if match_dni:
+                score = max(score, difflib.SequenceMatcher(None, search_lower, record.dni_key).ratio())
+
+            scored.append((score, record))
+
+    # Ordenar por score descendente y limitar
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return [record for _, record in scored[:limit]]
+
+
+def sparse(data: dict) -> dict:
+    """Quita los campos vacíos (None, "" o listas vacías) de una respuesta"""
+    return {key: value for key, value in data.items() if value is not None and value != "" and value != []}
@@ -1,32 +1,65 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import datetime
+import base64
+import csv
+import io
+import os
+import tempfile
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
+from typing import Iterator, List, Optional, Tuple
+from datetime import date, datetime
 from .. import models, schemas, auth
-from ..database import get_db
+from ..database import SessionLocal, get_async_db
 
 router = APIRouter(prefix="/api/audit-logs", tags=["Auditoría"])
 
-@router.get("/", response_model=List[schemas.AuditLogResponse])
-async def list_audit_logs(
-    skip: int = 0, 
-    limit: int = 100,
-    user_id: Optional[int] = None,
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_role(["admin"]))
-):
-    """Lista registros de auditoría con filtros opcionales (solo admin)"""
-    query = db.query(models.AuditLog)
+AUDIT_COLUMNS = (
+    models.AuditLog.id,
+    models.AuditLog.user_id,
+    models.AuditLog.action,
+    models.AuditLog.module,
+    models.AuditLog.details,
+    models.AuditLog.timestamp,
+    models.User.username,
+)
+
+# Columnas del archivo exportado (en orden)
+EXPORT_COLUMNS = ("id", "timestamp", "username", "user_id", "action", "module", "details")
+EXPORT_BATCH_SIZE = 1000
+
+# Orden de listado y exportación: más reciente primero; los registros antiguos
+# sin timestamp van al final, también del más reciente (mayor id) al más antiguo
+NEWEST_FIRST = (models.AuditLog.timestamp.desc(), models.AuditLog.id.desc())
+
+def encode_cursor(timestamp: Optional[datetime], log_id: int) -> str:
+    """Cursor opaco con la posición (timestamp, id) del último registro de la página.
+
+    Un registro sin timestamp se codifica con el timestamp vacío.
+    """
+    raw = f"{timestamp.isoformat() if timestamp else ''}|{log_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """Decodifica un cursor generado por encode_cursor"""
+    try:
+        timestamp, log_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return (datetime.fromisoformat(timestamp) if timestamp else None), int(log_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+
+def filtered_select(user_id: Optional[int], start_date: Optional[str], end_date: Optional[str]):
+    """Registros con su username (un solo JOIN), filtrados y sin orden"""
+    query = select(*AUDIT_COLUMNS).outerjoin(models.User, models.AuditLog.user_id == models.User.id)
     
     if user_id:
-        query = query.filter(models.AuditLog.user_id == user_id)
+        query = query.where(models.AuditLog.user_id == user_id)
         
     if start_date:
         try:
             start = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-            query = query.filter(models.AuditLog.timestamp >= start)
+            query = query.where(models.AuditLog.timestamp >= start)
         except ValueError:
             pass
             
@@ -34,27 +67,164 @@ async def list_audit_logs(
         try:
             end = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
             # Ajustar al final del día si solo viene fecha
-            query = query.filter(models.AuditLog.timestamp <= end)
+            query = query.where(models.AuditLog.timestamp <= end)
         except ValueError:
             pass
 
-    logs = query.order_by(models.AuditLog.timestamp.desc()).offset(skip).limit(limit).all()
+    return query
+
+@router.get("/", response_model=List[schemas.AuditLogResponse])
+async def list_audit_logs(
+    skip: int = 0, 
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    user_id: Optional[int] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(auth.require_role(["admin"]))
+):
+    """Lista registros de auditoría con filtros opcionales (solo admin).
+
+    Paginación por cursor (keyset): enviar en ``cursor`` el valor del header
+    ``X-Next-Cursor`` de la respuesta anterior. ``skip`` se mantiene por
+    compatibilidad pero se vuelve lento en páginas profundas.
+
+    Los registros antiguos sin timestamp van al final, del mayor id al menor
+    (el mismo orden que la exportación).
+    """
+    query = filtered_select(user_id, start_date, end_date)
+    if skip and not cursor:
+        query = query.order_by(models.AuditLog.timestamp.is_(None), *NEWEST_FIRST).offset(skip)
+        rows = [row._asdict() for row in await db.execute(query.limit(limit))]
+    else:
+        last_timestamp, last_id = decode_cursor(cursor) if cursor else (None, None)
+        rows = []
+        if not cursor or last_timestamp is not None:
+            # Continuar después del último registro visto (usa los índices timestamp, id)
+            dated = query.where(models.AuditLog.timestamp.isnot(None))
+            if cursor:
+                dated = dated.where(
+                    tuple_(models.AuditLog.timestamp, models.AuditLog.id) < tuple_(last_timestamp, last_id)
+                )
+            # Filas planas (sin objetos ORM ni from_orm por registro)
+            rows = [row._asdict() for row in await db.execute(dated.order_by(*NEWEST_FIRST).limit(limit))]
+        if len(rows) < limit:
+            # Terminados los registros con timestamp siguen los que no lo tienen
+            undated = query.where(models.AuditLog.timestamp.is_(None))
+            if cursor and last_timestamp is None:
+                undated = undated.where(models.AuditLog.id < last_id)
+            undated = undated.order_by(models.AuditLog.id.desc()).limit(limit - len(rows))
+            rows += [row._asdict() for row in await db.execute(undated)]
+
+    headers = {}
+    if len(rows) == limit:
+        headers["X-Next-Cursor"] = encode_cursor(rows[-1]["timestamp"], rows[-1]["id"])
+    return ORJSONResponse(rows, headers=headers)
+
+def _export_rows(user_id: Optional[int], start_date: Optional[str], end_date: Optional[str]) -> Iterator[tuple]:
+    """Recorre los registros filtrados por lotes, sin cargar todo el resultado en memoria"""
+    # Sesión propia: el generador se consume después de que termina el endpoint
+    db = SessionLocal()
+    try:
+        query = (
+            filtered_select(user_id, start_date, end_date)
+            .order_by(models.AuditLog.timestamp.is_(None), *NEWEST_FIRST)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        for row in db.execute(query):
+            yield tuple(getattr(row, column) for column in EXPORT_COLUMNS)
+    finally:
+        db.close()
+
+def _csv_chunks(rows: Iterator[tuple]) -> Iterator[bytes]:
+    """Genera el CSV en bloques de EXPORT_BATCH_SIZE filas"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM para que Excel detecte UTF-8 (tildes y ñ)
+    buffer.write("\ufeff")
+    writer.writerow(EXPORT_COLUMNS)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+def _write_xlsx(rows: Iterator[tuple]) -> str:
+    """Escribe el XLSX en un archivo temporal (modo write_only: memoria constante)"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Auditoria")
+    sheet.append(EXPORT_COLUMNS)
+    for row in rows:
+        sheet.append(row)
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    workbook.save(path)
+    return path
+
+@router.get("/export")
+def export_audit_logs(
+    format: str = Query("csv", pattern="^(csv|xlsx)$"),
+    user_id: Optional[int] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    current_user: schemas.User = Depends(auth.require_role(["admin"]))
+):
+    """Exporta los registros de auditoría filtrados a CSV o XLSX (solo admin)"""
+    filename = f"auditoria_{datetime.now():%Y%m%d_%H%M%S}.{format}"
+    rows = _export_rows(user_id, start_date, end_date)
+
+    if format == "csv":
+        return StreamingResponse(
+            _csv_chunks(rows),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+
+    path = _write_xlsx(rows)
+    return FileResponse(
+        path,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        filename=filename,
+        background=BackgroundTask(os.remove, path),
+    )
+
+@router.get("/stats", response_model=List[schemas.AuditDailySummary])
+async def audit_stats(
+    user_id: Optional[int] = None,
+    module: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(auth.require_role(["admin"]))
+):
+    """Conteos diarios de acciones por usuario, módulo y acción (desde los rollups, solo admin)"""
+    rollup = models.AuditDailyRollup
+    query = select(
+        rollup.day, rollup.user_id, models.User.username, rollup.module, rollup.action, rollup.count
+    ).outerjoin(models.User, rollup.user_id == models.User.id)
     
-    # Enriquecer con username
-    result = []
-    for log in logs:
-        log_resp = schemas.AuditLogResponse.from_orm(log)
-        if log.user:
-            log_resp.username = log.user.username
-        result.append(log_resp)
-        
-    return result
+    if user_id:
+        query = query.where(rollup.user_id == user_id)
+    if module:
+        query = query.where(rollup.module == module)
+    if start_date:
+        query = query.where(rollup.day >= start_date)
+    if end_date:
+        query = query.where(rollup.day <= end_date)
+
+    result = await db.execute(query.order_by(rollup.day.desc(), rollup.user_id, rollup.module, rollup.action))
+    return ORJSONResponse([row._asdict() for row in result])
 
 @router.get("/users", response_model=List[schemas.User])
 async def list_users_for_filter(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_role(["admin"]))
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(auth.require_role(["admin"]))
 ):
     """Lista usuarios para el filtro de auditoría"""
-    users = db.query(models.User).all()
-    return users
+    result = await db.execute(select(models.User))
+    return result.scalars().all()
@@ -1,20 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 from typing import List
 
 from .. import models, schemas, auth
-from ..database import get_db
+from ..database import get_async_db
 from ..config import settings
 
 router = APIRouter(prefix="/api/auth", tags=["Autenticación"])
 
 @router.post("/register", response_model=schemas.User, status_code=status.HTTP_201_CREATED)
-def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
+async def register(user: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Registra un nuevo usuario"""
     # Verificar si el username ya existe
-    db_user = auth.get_user_by_username(db, username=user.username)
+    db_user = await auth.get_user_by_username(db, username=user.username)
     if db_user:
         raise HTTPException(
             status_code=400,
@@ -22,7 +23,7 @@ def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
         )
     
     # Verificar si el email ya existe
-    db_user = auth.get_user_by_email(db, email=user.email)
+    db_user = await auth.get_user_by_email(db, email=user.email)
     if db_user:
         raise HTTPException(
             status_code=400,
@@ -30,15 +31,15 @@ def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
         )
     
     # Crear usuario
-    return auth.create_user(db=db, user=user)
+    return await auth.create_user(db=db, user=user)
 
 @router.post("/login", response_model=schemas.Token)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Inicia sesión y retorna token JWT"""
-    user = auth.authenticate_user(db, form_data.username, form_data.password)
+    user = await auth.authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -61,44 +62,44 @@ def login(
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=schemas.User)
-async def read_users_me(current_user: models.User = Depends(auth.get_current_active_user)):
+async def read_users_me(current_user: schemas.User = Depends(auth.get_current_active_user)):
     """Obtiene información del usuario actual"""
     return current_user
 
 @router.get("/users", response_model=List[schemas.User])
 async def list_users(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_role(["admin"]))
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(auth.require_role(["admin"]))
 ):
     """Lista todos los usuarios (solo admin)"""
-    users = db.query(models.User).all()
-    return users
+    result = await db.execute(select(models.User))
+    return result.scalars().all()
 
 @router.put("/users/{user_id}", response_model=schemas.User)
-def update_user_endpoint(
+async def update_user_endpoint(
     user_id: int,
     user_update: schemas.UserUpdate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_role(["admin"]))
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(auth.require_role(["admin"]))
 ):
     """Actualiza un usuario (solo admin)"""
-    updated_user = auth.update_user(db, user_id, user_update)
+    updated_user = await auth.update_user(db, user_id, user_update)
     if not updated_user:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
     return updated_user
 
 @router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user_endpoint(
+async def delete_user_endpoint(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_role(["admin"]))
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(auth.require_role(["admin"]))
 ):
     """Elimina un usuario (solo admin)"""
     # Evitar que el admin se elimine a sí mismo
     if current_user.id == user_id:
         raise HTTPException(status_code=400, detail="No puedes eliminar tu propia cuenta")
         
-    success = auth.delete_user(db, user_id)
+    success = await auth.delete_user(db, user_id)
     if not success:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
     return None
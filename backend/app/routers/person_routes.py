@@ -1,30 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional
-from sqlalchemy.orm import Session
-import json
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 import time
 from datetime import datetime, timedelta
-import difflib
 
-from .. import models, schemas, auth
-from ..database import get_db
+from .. import schemas, auth
 from ..hikcentral import hik_api
-from .. import audit
+from .. import audit, metrics, tracing
+from ..logs import get_logger
+from .. import reconcile as reconcile_engine
+from ..records import PersonRecord, VehicleRecord, PERSON_RESPONSE_FIELDS, normalize_persons, search_records, sparse
+
+logger = get_logger(__name__)
 
 router = APIRouter(prefix="/api/persons", tags=["Personas"])
 
 # Cache de vehículos en memoria
 _vehicles_cache = {
-    "data": {},  # {person_name: [plates]}
+    "data": {},  # {person_name: (VehicleRecord, ...)}
+    "expires_at": None
+}
+
+# Cache de personas normalizadas (DNI ya extraído) para la búsqueda
+_persons_cache = {
+    "records": [],  # [PersonRecord]
     "expires_at": None
 }
 
 @router.post("/add", response_model=schemas.MessageResponse)
 async def add_person(
     person: schemas.PersonCreate,
-    current_user: models.User = Depends(auth.require_role(["admin", "gestion_vehicular", "gestion_peatonal", "postulante"]))
+    current_user: schemas.User = Depends(auth.require_role(["admin", "gestion_vehicular", "gestion_peatonal", "postulante"]))
 ):
     """Agrega una persona a HikCentral (requiere rol admin, operador o personal_seguridad)"""
     # Preparar datos básicos de la persona SIN el DNI
@@ -37,9 +44,7 @@ async def add_person(
     }
     
     # Audit Log
-    db = Session.object_session(current_user)
     audit.create_audit_log(
-        db, 
         current_user.id, 
         "CREATE", 
         "PERSONAS", 
@@ -54,15 +59,16 @@ async def add_person(
         person_data["phoneNo"] = person.phoneNo
     
     # PASO 1: Crear la persona primero
-    print(f"DEBUG PASO 1: Creando persona con datos: {person_data}")
+    logger.debug("Creando persona", extra={"payload": person_data})
     
     try:
-        response = hik_api.add_person(person_data)
-        print(f"DEBUG: Respuesta creación persona (tipo: {type(response)}): {response}")
+        with tracing.span("add_person.create"):
+            response = hik_api.add_person(person_data)
+        logger.debug("Respuesta creación persona", extra={"response": response})
         
         # Validar que response sea un diccionario
         if not isinstance(response, dict):
-            print(f"ERROR: La respuesta no es un diccionario, es: {type(response)}")
+            logger.error(f"ERROR: La respuesta no es un diccionario, es: {type(response)}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error en respuesta de HikCentral: formato inválido"
@@ -70,13 +76,14 @@ async def add_person(
         
         if str(response.get("code")) != "0":
             error_msg = response.get('msg', 'Error desconocido')
-            print(f"ERROR: No se pudo crear persona: {error_msg}")
+            logger.error(f"ERROR: No se pudo crear persona: {error_msg}")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Error al agregar persona: {error_msg}"
             )
         
-        print(f"✓ Persona creada exitosamente")
+        logger.info(f"✓ Persona creada exitosamente")
+        _persons_cache["expires_at"] = None
         
         # Extraer personId de la respuesta
         data = response.get("data")
@@ -94,151 +101,136 @@ async def add_person(
         
         # Si no vino en el request, debemos buscarlo en HikCentral usando el personId
         if not person_code_real and person_id:
-             print(f"PersonCode no proporcionado. Buscando en HikCentral para ID: {person_id}")
-             try:
-                # Dar un momento para que HikCentral indexe
-                import time
-                time.sleep(1.0) 
-                
-                # Buscar en todas las páginas hasta encontrarlo
-                page = 1
-                found = False
-                while not found:
-                    print(f"Buscando personCode en página {page}...")
-                    list_response = hik_api.get_person_list(page_no=page, page_size=200) # Usar página grande para ir rápido
-                    
-                    if str(list_response.get("code")) != "0":
-                        print(f"Error al listar personas: {list_response.get('msg')}")
-                        break
-                        
-                    data_list = list_response.get("data", {})
-                    persons_list = data_list.get("list", [])
-                    total = data_list.get("total", 0)
-                    
-                    if not persons_list:
-                        break
-                        
-                    for p in persons_list:
-                        if str(p.get("personId")) == str(person_id):
-                            person_code_real = p.get("personCode")
-                            print(f"✓ PersonCode RECUPERADO de HikCentral: {person_code_real}")
-                            found = True
-                            break
-                    
+             logger.info(f"PersonCode no proporcionado. Buscando en HikCentral para ID: {person_id}")
+             with tracing.span("add_person.find_person_code") as step:
+                 try:
+                    # Oleadas de páginas en paralelo desde el final, donde quedan las altas recientes
+                    def is_new_person(p):
+                        return str(p.get("personId")) == str(person_id)
+                    result = await hik_api.paginate(hik_api.get_person_list, 200).afind_first(is_new_person, from_end=True)
+                    attempts = 1
+                    if result.match is None:
+                        # Dar un momento para que HikCentral indexe y volver a buscar
+                        await asyncio.sleep(1.0)
+                        result = await hik_api.paginate(hik_api.get_person_list, 200).afind_first(is_new_person, from_end=True)
+                        attempts = 2
+                    found = result.match is not None
                     if found:
-                        break
-                        
-                    # Verificar si hay más páginas
-                    if page * 200 >= total:
-                        break
-                    page += 1
+                        person_code_real = result.match.get("personCode")
+                        logger.info(f"✓ PersonCode RECUPERADO de HikCentral: {person_code_real}")
+                    elif result.errors:
+                        logger.error(f"Error al listar personas: {result.errors[0].msg}")
+                    step.set_attributes({"hik.pages_scanned": result.pages, "hik.found": found, "hik.attempts": attempts})
                 
-                if not person_code_real:
-                    print("ADVERTENCIA: No se pudo encontrar el personCode después de buscar en todas las páginas")
+                    if not person_code_real:
+                        logger.warning("ADVERTENCIA: No se pudo encontrar el personCode después de buscar en todas las páginas")
                     
-             except Exception as e:
-                print(f"Advertencia: Excepción al recuperar personCode: {e}")
+                 except Exception as e:
+                    logger.warning(f"Advertencia: Excepción al recuperar personCode: {e}")
 
         # PASO 2: Si hay DNI, agregarlo usando customFieldsUpdate
         if person.certificateNumber and person.certificateNumber.strip() and person_id:
-                print(f"Agregando DNI '{person.certificateNumber.strip()}' a persona")
-                try:
-                    if not person_code_real:
-                        print(f"No se pudo obtener personCode para personId {person_id}, saltando carga de DNI")
-                    else:
-                        # Usar el endpoint correcto - ruta fija, todo en el body
-                        # IMPORTANTE: Solo enviar personCode, NO personId
-                        path = "/artemis/api/resource/v1/person/personId/customFieldsUpdate"
+                logger.info(f"Agregando DNI '{person.certificateNumber.strip()}' a persona")
+                with tracing.span("add_person.update_dni"):
+                    try:
+                        if not person_code_real:
+                            logger.warning(f"No se pudo obtener personCode para personId {person_id}, saltando carga de DNI")
+                        else:
+                            # Usar el endpoint correcto - ruta fija, todo en el body
+                            # IMPORTANTE: Solo enviar personCode, NO personId
+                            path = "/artemis/api/resource/v1/person/personId/customFieldsUpdate"
                         
-                        update_data = {
-                            "personCode": person_code_real,
-                            "list": [
-                                {
-                                    "id": "1",
-                                    "customFiledName": "DNI",
-                                    "customFieldType": 0,
-                                    "customFieldValue": person.certificateNumber.strip()
-                                }
-                            ]
-                        }
+                            update_data = {
+                                "personCode": person_code_real,
+                                "list": [
+                                    {
+                                        "id": "1",
+                                        "customFiledName": "DNI",
+                                        "customFieldType": 0,
+                                        "customFieldValue": person.certificateNumber.strip()
+                                    }
+                                ]
+                            }
                         
-                        print(f"Body UPDATE: {json.dumps(update_data, indent=2)}")
+                            logger.debug("Body UPDATE DNI", extra={"payload": update_data})
                         
-                        update_response = hik_api.post_signed(path, update_data)
-                        print(f"Respuesta update: {update_response}")
+                            update_response = hik_api.post_signed(path, update_data)
+                            logger.debug("Respuesta update DNI", extra={"response": update_response})
                         
-                        if str(update_response.get("code")) != "0":
-                            error_msg = update_response.get('msg', 'Error desconocido')
-                            print(f"Error al agregar DNI: {error_msg}")
-                        else:
-                            print(f"✓ DNI agregado exitosamente")
-                except Exception as e:
-                    print(f"Error al agregar DNI: {str(e)}")
+                            if str(update_response.get("code")) != "0":
+                                error_msg = update_response.get('msg', 'Error desconocido')
+                                logger.error(f"Error al agregar DNI: {error_msg}")
+                            else:
+                                logger.info(f"✓ DNI agregado exitosamente")
+                    except Exception as e:
+                        logger.error(f"Error al agregar DNI: {str(e)}")
 
         # PASO 2.5: Si vino foto en el payload, subirla a HikCentral usando personCode
         try:
             if getattr(person, "photo", None) and person_id:
                 if not person_code_real:
-                     print("No se tiene personCode, no se puede subir foto.")
+                     logger.warning("No se tiene personCode, no se puede subir foto.")
                 else:
-                    photo_val = getattr(person, "photo")
-                    # extraer base64 si viene como data URL
-                    if isinstance(photo_val, str) and photo_val.startswith("data:"):
-                        try:
-                            face_b64 = photo_val.split(",", 1)[1]
-                        except Exception:
+                    with tracing.span("add_person.upload_face"):
+                        photo_val = getattr(person, "photo")
+                        # extraer base64 si viene como data URL
+                        if isinstance(photo_val, str) and photo_val.startswith("data:"):
+                            try:
+                                face_b64 = photo_val.split(",", 1)[1]
+                            except Exception:
+                                face_b64 = photo_val
+                        else:
                             face_b64 = photo_val
-                    else:
-                        face_b64 = photo_val
 
-                    print("Subiendo foto a HikCentral para personCode:", person_code_real)
-                    path_face = "/artemis/api/resource/v1/person/face/update"
-                    body_face = {"personCode": person_code_real, "faceData": face_b64}
-                    face_resp = hik_api.post_signed(path_face, body_face)
-                    print("Respuesta subida foto:", face_resp)
+                        logger.info(f"Subiendo foto a HikCentral para personCode: {person_code_real}")
+                        path_face = "/artemis/api/resource/v1/person/face/update"
+                        body_face = {"personCode": person_code_real, "faceData": face_b64}
+                        face_resp = hik_api.post_signed(path_face, body_face)
+                        logger.debug("Respuesta subida foto", extra={"response": face_resp})
         except Exception as e:
-            print(f"Error al subir foto de persona: {e}")
+            logger.error(f"Error al subir foto de persona: {e}")
         
         # PASO 3: Si hay plateNo, crear el vehículo
         if person.plateNo and person.plateNo.strip() and person_id:
-            print(f"Creando vehículo con placa '{person.plateNo.strip()}' para persona {person_id}")
-            try:
-                from datetime import datetime, timedelta
+            logger.info(f"Creando vehículo con placa '{person.plateNo.strip()}' para persona {person_id}")
+            with tracing.span("add_person.add_vehicle"):
+                try:
+                    from datetime import datetime, timedelta
                 
-                # Fechas de vigencia (usar las proporcionadas o por defecto)
-                if person.effectiveDate:
-                    effective_date = person.effectiveDate
-                else:
-                    effective_date = datetime.now().strftime("%Y-%m-%dT00:00:00-05:00")
+                    # Fechas de vigencia (usar las proporcionadas o por defecto)
+                    if person.effectiveDate:
+                        effective_date = person.effectiveDate
+                    else:
+                        effective_date = datetime.now().strftime("%Y-%m-%dT00:00:00-05:00")
                 
-                if person.expiredDate:
-                    expired_date = person.expiredDate
-                else:
-                    expired_date = (datetime.now() + timedelta(days=730)).strftime("%Y-%m-%dT23:59:59-05:00")
+                    if person.expiredDate:
+                        expired_date = person.expiredDate
+                    else:
+                        expired_date = (datetime.now() + timedelta(days=730)).strftime("%Y-%m-%dT23:59:59-05:00")
                 
-                vehicle_data = {
-                    "plateNo": person.plateNo.strip(),
-                    "personId": str(person_id),
-                    "plateArea": 0,
-                    "vehicleGroupIndexCode": "2",
-                    "effectiveDate": effective_date,
-                    "expiredDate": expired_date
-                }
+                    vehicle_data = {
+                        "plateNo": person.plateNo.strip(),
+                        "personId": str(person_id),
+                        "plateArea": 0,
+                        "vehicleGroupIndexCode": "2",
+                        "effectiveDate": effective_date,
+                        "expiredDate": expired_date
+                    }
                 
-                print(f"Body VEHICLE: {json.dumps(vehicle_data, indent=2)}")
+                    logger.debug("Body VEHICLE", extra={"payload": vehicle_data})
                 
-                vehicle_response = hik_api.add_vehicle(vehicle_data)
-                print(f"Respuesta vehículo: {vehicle_response}")
+                    vehicle_response = hik_api.add_vehicle(vehicle_data)
+                    logger.debug("Respuesta vehículo", extra={"response": vehicle_response})
                 
-                if str(vehicle_response.get("code")) != "0":
-                    error_msg = vehicle_response.get('msg', 'Error desconocido')
-                    print(f"Error al crear vehículo: {error_msg}")
-                else:
-                    print(f"✓ Vehículo creado exitosamente")
-                    # Invalidar cache de vehículos
-                    _vehicles_cache["expires_at"] = None
-            except Exception as e:
-                print(f"Error al crear vehículo: {str(e)}")
+                    if str(vehicle_response.get("code")) != "0":
+                        error_msg = vehicle_response.get('msg', 'Error desconocido')
+                        logger.error(f"Error al crear vehículo: {error_msg}")
+                    else:
+                        logger.info(f"✓ Vehículo creado exitosamente")
+                        # Invalidar cache de vehículos
+                        _vehicles_cache["expires_at"] = None
+                except Exception as e:
+                    logger.error(f"Error al crear vehículo: {str(e)}")
         
         # Inject personCode into response data for frontend usage
         if isinstance(response, dict):
@@ -254,9 +246,7 @@ async def add_person(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"ERROR inesperado: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"ERROR inesperado: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error interno: {str(e)}"
@@ -266,7 +256,7 @@ async def add_person(
 @router.post("/upload-photo")
 async def upload_photo_endpoint(
     payload: dict,
-    current_user: models.User = Depends(auth.require_role(["admin", "gestion_vehicular", "gestion_peatonal", "postulante"]))
+    current_user: schemas.User = Depends(auth.require_role(["admin", "gestion_vehicular", "gestion_peatonal", "postulante"]))
 ):
     """Recibe una foto en base64 y la sube a HikCentral usando el endpoint
     /artemis/api/resource/v1/person/face/update
@@ -281,9 +271,7 @@ async def upload_photo_endpoint(
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="personCode y faceData/photo son requeridos")
 
         # Audit Log
-        db = Session.object_session(current_user)
         audit.create_audit_log(
-            db, 
             current_user.id, 
             "UPDATE", 
             "PERSONAS", 
@@ -308,21 +296,19 @@ async def upload_photo_endpoint(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error upload photo: {e}")
+        logger.error(f"Error upload photo: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 @router.put("/update/{person_id}")
 async def update_person_endpoint(
     person_id: str,
     person: schemas.PersonCreate,
-    current_user: models.User = Depends(auth.require_role(["admin", "gestion_vehicular", "gestion_peatonal", "postulante"]))
+    current_user: schemas.User = Depends(auth.require_role(["admin", "gestion_vehicular", "gestion_peatonal", "postulante"]))
 ):
     """Actualiza una persona existente en HikCentral (requiere rol admin, operador o personal_seguridad)"""
     
     # Audit Log
-    db = Session.object_session(current_user)
     audit.create_audit_log(
-        db, 
         current_user.id, 
         "UPDATE", 
         "PERSONAS", 
@@ -347,10 +333,11 @@ async def update_person_endpoint(
         if person.personCode:
             person_data["personCode"] = person.personCode
         
-        print(f"Actualizando persona {person_id}")
+        logger.info(f"Actualizando persona {person_id}")
         
         # PASO 1: Actualizar datos básicos de la persona
-        response = hik_api.update_person(person_id, person_data)
+        with tracing.span("update_person.update"):
+            response = hik_api.update_person(person_id, person_data)
         
         if str(response.get("code")) != "0":
             error_msg = response.get('msg', 'Error desconocido')
@@ -359,85 +346,87 @@ async def update_person_endpoint(
                 detail=f"Error al actualizar persona: {error_msg}"
             )
         
-        print(f"✓ Persona actualizada exitosamente")
+        logger.info(f"✓ Persona actualizada exitosamente")
+        _persons_cache["expires_at"] = None
         
         # Recuperar personCode para operaciones avanzadas (DNI, Foto)
         person_code_real = person.personCode
         if not person_code_real:
              # Intentar recuperarlo de HikCentral
-             try:
-                import time
-                time.sleep(0.3)
-                list_response = hik_api.get_person_list(page_no=1, page_size=100)
-                if str(list_response.get("code")) == "0":
-                    persons_list = list_response.get("data", {}).get("list", [])
-                    for p in persons_list:
-                        if str(p.get("personId")) == str(person_id):
-                            person_code_real = p.get("personCode")
-                            print(f"PersonCode encontrado: {person_code_real}")
-                            break
-             except Exception as e:
-                 print(f"Error buscando personCode: {e}")
+             with tracing.span("update_person.find_person_code") as step:
+                 try:
+                    # Antes solo se revisaba la primera página; ahora todas, en oleadas paralelas
+                    result = await hik_api.paginate(hik_api.get_person_list, 200).afind_first(
+                        lambda p: str(p.get("personId")) == str(person_id)
+                    )
+                    if result.match is not None:
+                        person_code_real = result.match.get("personCode")
+                        logger.info(f"PersonCode encontrado: {person_code_real}")
+                    step.set_attributes({"hik.pages_scanned": result.pages, "hik.found": result.match is not None})
+                 except Exception as e:
+                     logger.error(f"Error buscando personCode: {e}")
 
         # PASO 2: Si hay DNI, actualizarlo usando customFieldsUpdate
         if person.certificateNumber and person.certificateNumber.strip():
-            print(f"Actualizando DNI a '{person.certificateNumber.strip()}'")
-            try:
-                if not person_code_real:
-                    print(f"No se pudo obtener personCode, saltando update de DNI")
-                else:
-                    path = "/artemis/api/resource/v1/person/personId/customFieldsUpdate"
+            logger.info(f"Actualizando DNI a '{person.certificateNumber.strip()}'")
+            with tracing.span("update_person.update_dni"):
+                try:
+                    if not person_code_real:
+                        logger.warning(f"No se pudo obtener personCode, saltando update de DNI")
+                    else:
+                        path = "/artemis/api/resource/v1/person/personId/customFieldsUpdate"
                     
-                    update_data = {
-                        "personCode": person_code_real,
-                        "list": [
-                            {
-                                "id": "1",
-                                "customFiledName": "DNI",
-                                "customFieldType": 0,
-                                "customFieldValue": person.certificateNumber.strip()
-                            }
-                        ]
-                    }
+                        update_data = {
+                            "personCode": person_code_real,
+                            "list": [
+                                {
+                                    "id": "1",
+                                    "customFiledName": "DNI",
+                                    "customFieldType": 0,
+                                    "customFieldValue": person.certificateNumber.strip()
+                                }
+                            ]
+                        }
                     
-                    update_response = hik_api.post_signed(path, update_data)
+                        update_response = hik_api.post_signed(path, update_data)
                     
-                    if str(update_response.get("code")) != "0":
-                        error_msg = update_response.get('msg', 'Error desconocido')
-                        print(f"Advertencia al actualizar DNI: {error_msg}")
-                    else:
-                        print(f"✓ DNI actualizado exitosamente")
-            except Exception as e:
-                print(f"Error al actualizar DNI: {str(e)}")
+                        if str(update_response.get("code")) != "0":
+                            error_msg = update_response.get('msg', 'Error desconocido')
+                            logger.warning(f"Advertencia al actualizar DNI: {error_msg}")
+                        else:
+                            logger.info(f"✓ DNI actualizado exitosamente")
+                except Exception as e:
+                    logger.error(f"Error al actualizar DNI: {str(e)}")
 
         # PASO 2.5: Si hay Foto, actualizarla
         if getattr(person, "photo", None):
-            print(f"Procesando actualización de foto")
-            try:
-                if not person_code_real:
-                    print("No se pudo obtener personCode, saltando update de Foto")
-                else:
-                    photo_val = getattr(person, "photo")
-                    # extraer base64 si viene como data URL
-                    if isinstance(photo_val, str) and photo_val.startswith("data:"):
-                        try:
-                            face_b64 = photo_val.split(",", 1)[1]
-                        except Exception:
-                            face_b64 = photo_val
+            logger.info(f"Procesando actualización de foto")
+            with tracing.span("update_person.upload_face"):
+                try:
+                    if not person_code_real:
+                        logger.warning("No se pudo obtener personCode, saltando update de Foto")
                     else:
-                        face_b64 = photo_val
+                        photo_val = getattr(person, "photo")
+                        # extraer base64 si viene como data URL
+                        if isinstance(photo_val, str) and photo_val.startswith("data:"):
+                            try:
+                                face_b64 = photo_val.split(",", 1)[1]
+                            except Exception:
+                                face_b64 = photo_val
+                        else:
+                            face_b64 = photo_val
 
-                    print("Subiendo foto a HikCentral para personCode:", person_code_real)
-                    path_face = "/artemis/api/resource/v1/person/face/update"
-                    body_face = {"personCode": person_code_real, "faceData": face_b64}
-                    face_resp = hik_api.post_signed(path_face, body_face)
+                        logger.info(f"Subiendo foto a HikCentral para personCode: {person_code_real}")
+                        path_face = "/artemis/api/resource/v1/person/face/update"
+                        body_face = {"personCode": person_code_real, "faceData": face_b64}
+                        face_resp = hik_api.post_signed(path_face, body_face)
                     
-                    if str(face_resp.get("code")) != "0":
-                         print(f"Error al subir foto: {face_resp.get('msg')}")
-                    else:
-                         print(f"✓ Foto actualizada exitosamente")
-            except Exception as e:
-                print(f"Error al actualizar foto: {e}")
+                        if str(face_resp.get("code")) != "0":
+                             logger.error(f"Error al subir foto: {face_resp.get('msg')}")
+                        else:
+                             logger.info(f"✓ Foto actualizada exitosamente")
+                except Exception as e:
+                    logger.error(f"Error al actualizar foto: {e}")
         
         # PASO 3: Gestión Inteligente de Vehículos (Soporte Multi-Vehículo con Fechas)
         # Parsear la lista de vehículos
@@ -458,108 +447,90 @@ async def update_person_endpoint(
                      expiredDate=person.expiredDate
                  )
             
-        print(f"Procesando actualización de vehículos. Placas solicitadas: {list(incoming_vehicles_map.keys())}")
+        logger.info(f"Procesando actualización de vehículos. Placas solicitadas: {list(incoming_vehicles_map.keys())}")
         
-        try:
-            from datetime import datetime, timedelta
+        with tracing.span("update_person.sync_vehicles", **{"vehicles.requested": len(incoming_vehicles_map)}):
+            try:
+                from datetime import datetime, timedelta
             
-            # Construir personName completo para búsqueda
-            person_name_clean = f"{person.personGivenName} {person.personFamilyName}".strip()
+                # Construir personName completo para búsqueda
+                person_name_clean = f"{person.personGivenName} {person.personFamilyName}".strip()
             
-            # 1. Obtener vehículos existentes de esta persona desde HikCentral
-            print(f"Obteniendo vehículos actuales para '{person_name_clean}'...")
+                # 1. Obtener vehículos existentes de esta persona desde HikCentral
+                logger.info(f"Obteniendo vehículos actuales para '{person_name_clean}'...")
             
-            current_vehicles = {} # {plateNo: vehicleId}
-            page = 1
+                current_vehicles = {} # {plateNo: vehicleId}
+                result = await hik_api.paginate(hik_api.list_vehicles, 200, vehicle_group_code="2").acollect()
+                if result.errors:
+                    logger.error(f"Error al buscar vehículos: {result.errors[0].msg}")
             
-            # Buscar en todas las páginas (limitado por seguridad)
-            while page <= 10: 
-                vehicles_response = hik_api.list_vehicles(page_no=page, page_size=200, vehicle_group_code="2")
-                
-                if str(vehicles_response.get("code")) != "0":
-                    print(f"Error al buscar vehículos: {vehicles_response.get('msg')}")
-                    break
-                
-                vehicles_data = vehicles_response.get("data", {})
-                vehicles_list = vehicles_data.get("list", [])
-                
-                if not vehicles_list:
-                    break
-                
-                for vehicle in vehicles_list:
+                for vehicle in result.items:
                     v_person_name = vehicle.get("personName", "").strip()
                     v_plate = vehicle.get("plateNo", "").strip().upper()
                     v_id = vehicle.get("vehicleId")
-                    
+                
                     # Verificar si pertenece a la persona actual
                     if v_person_name == person_name_clean and v_plate:
                         current_vehicles[v_plate] = v_id
-                
-                total = vehicles_data.get("total", 0)
-                if page * 200 >= total:
-                    break
-                page += 1
             
-            print(f"Vehículos actuales en sistema: {list(current_vehicles.keys())}")
+                logger.info(f"Vehículos actuales en sistema: {list(current_vehicles.keys())}")
             
-            # 2. Calcular diferencias
-            existing_plates = set(current_vehicles.keys())
-            incoming_plates = set(incoming_vehicles_map.keys())
+                # 2. Calcular diferencias
+                existing_plates = set(current_vehicles.keys())
+                incoming_plates = set(incoming_vehicles_map.keys())
             
-            plates_to_add = incoming_plates - existing_plates
-            plates_to_delete = existing_plates - incoming_plates
+                plates_to_add = incoming_plates - existing_plates
+                plates_to_delete = existing_plates - incoming_plates
             
-            print(f"Placas a AGREGAR: {plates_to_add}")
-            print(f"Placas a ELIMINAR: {plates_to_delete}")
+                logger.info(f"Placas a AGREGAR: {plates_to_add}")
+                logger.info(f"Placas a ELIMINAR: {plates_to_delete}")
             
-            # 3. Eliminar vehículos excedentes
-            if plates_to_delete:
-                ids_to_delete = [current_vehicles[p] for p in plates_to_delete]
-                print(f"Eliminando {len(ids_to_delete)} vehículos obsoletos...")
-                delete_response = hik_api.delete_vehicle(ids_to_delete)
+                # 3. Eliminar vehículos excedentes
+                if plates_to_delete:
+                    ids_to_delete = [current_vehicles[p] for p in plates_to_delete]
+                    logger.info(f"Eliminando {len(ids_to_delete)} vehículos obsoletos...")
+                    delete_response = hik_api.delete_vehicle(ids_to_delete)
                 
-                if str(delete_response.get("code")) != "0":
-                    print(f"Error al eliminar vehículos: {delete_response.get('msg')}")
-                else:
-                    print("✓ Vehículos eliminados correctamente")
+                    if str(delete_response.get("code")) != "0":
+                        logger.error(f"Error al eliminar vehículos: {delete_response.get('msg')}")
+                    else:
+                        logger.info("✓ Vehículos eliminados correctamente")
             
-            # 4. Agregar nuevos vehículos con sus fechas específicas
-            if plates_to_add:
-                print(f"Creando {len(plates_to_add)} nuevos vehículos...")
+                # 4. Agregar nuevos vehículos con sus fechas específicas
+                if plates_to_add:
+                    logger.info(f"Creando {len(plates_to_add)} nuevos vehículos...")
                 
-                for plate in plates_to_add:
-                    v_data = incoming_vehicles_map[plate]
+                    for plate in plates_to_add:
+                        v_data = incoming_vehicles_map[plate]
                     
-                    # Usar fecha específica del vehículo, o la global, o default
-                    eff_date = v_data.effectiveDate if v_data.effectiveDate else (person.effectiveDate if person.effectiveDate else datetime.now().strftime("%Y-%m-%dT00:00:00-05:00"))
+                        # Usar fecha específica del vehículo, o la global, o default
+                        eff_date = v_data.effectiveDate if v_data.effectiveDate else (person.effectiveDate if person.effectiveDate else datetime.now().strftime("%Y-%m-%dT00:00:00-05:00"))
                     
-                    exp_date = v_data.expiredDate if v_data.expiredDate else (person.expiredDate if person.expiredDate else (datetime.now() + timedelta(days=730)).strftime("%Y-%m-%dT23:59:59-05:00"))
+                        exp_date = v_data.expiredDate if v_data.expiredDate else (person.expiredDate if person.expiredDate else (datetime.now() + timedelta(days=730)).strftime("%Y-%m-%dT23:59:59-05:00"))
                     
-                    new_vehicle_data = {
-                        "plateNo": plate,
-                        "personId": str(person_id),
-                        "plateArea": 0,
-                        "vehicleGroupIndexCode": "2",
-                        "effectiveDate": eff_date,
-                        "expiredDate": exp_date
-                    }
+                        new_vehicle_data = {
+                            "plateNo": plate,
+                            "personId": str(person_id),
+                            "plateArea": 0,
+                            "vehicleGroupIndexCode": "2",
+                            "effectiveDate": eff_date,
+                            "expiredDate": exp_date
+                        }
                     
-                    print(f"Creando vehículo placa '{plate}' con fechas {eff_date} - {exp_date}...")
-                    create_response = hik_api.add_vehicle(new_vehicle_data)
+                        logger.info(f"Creando vehículo placa '{plate}' con fechas {eff_date} - {exp_date}...")
+                        create_response = hik_api.add_vehicle(new_vehicle_data)
                     
-                    if str(create_response.get("code")) != "0":
-                        print(f"Error al crear vehículo {plate}: {create_response.get('msg')}")
-                    else:
-                        print(f"✓ Vehículo {plate} creado exitosamente")
+                        if str(create_response.get("code")) != "0":
+                            logger.error(f"Error al crear vehículo {plate}: {create_response.get('msg')}")
+                        else:
+                            logger.info(f"✓ Vehículo {plate} creado exitosamente")
             
-            # Invalidar cache
-            if plates_to_add or plates_to_delete:
-                _vehicles_cache["expires_at"] = None
+                # Invalidar cache
+                if plates_to_add or plates_to_delete:
+                    _vehicles_cache["expires_at"] = None
                 
-        except Exception as e:
-            print(f"Error en la gestión de vehículos: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            except Exception as e:
+                logger.exception(f"Error en la gestión de vehículos: {str(e)}")
         
         return {
             "message": "Persona actualizada exitosamente",
@@ -569,7 +540,7 @@ async def update_person_endpoint(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error inesperado: {str(e)}")
+        logger.error(f"Error inesperado: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error interno: {str(e)}"
@@ -580,249 +551,145 @@ async def list_persons(
     page_no: int = 1,
     page_size: int = 100,
     search: Optional[str] = None,
-    current_user: models.User = Depends(auth.get_current_active_user)
+    fields: Optional[str] = None,
+    current_user: schemas.User = Depends(auth.get_current_active_user)
 ):
-    """Lista personas de HikCentral con paginación del servidor y búsqueda global"""
-    
-    def extract_dni(person: dict) -> str:
-        """Extrae el DNI desde customFieldList"""
-        custom_fields = person.get("customFieldList", [])
-        if not custom_fields:
-            return ""
-        
-        for campo in custom_fields:
-            # Manejar tanto customFieldName como customFiledName (typo en la API)
-            name = campo.get("customFieldName") or campo.get("customFiledName") or ""
-            if isinstance(name, str):
-                name = name.strip().lower()
-            
-            # Buscar el campo DNI
-            if name == "dni":
-                value = campo.get("customFieldValue")
-                if value and isinstance(value, str):
-                    return value.strip()
-                elif value:
-                    return str(value)
-        
-        return ""
+    """Lista personas de HikCentral con paginación del servidor y búsqueda global.
+
+    ``fields`` permite pedir solo algunos campos (separados por coma); los
+    campos vacíos se omiten de cada persona.
+    """
+    selected_fields = None
+    if fields:
+        selected_fields = {f.strip() for f in fields.split(",") if f.strip()}
+        unknown = selected_fields - set(PERSON_RESPONSE_FIELDS)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Campos no válidos: {', '.join(sorted(unknown))}. Disponibles: {', '.join(PERSON_RESPONSE_FIELDS)}"
+            )
+    include_vehicles = selected_fields is None or bool(selected_fields & {"plateNo", "vehicles"})
     
-    def get_vehicles_map():
+    async def get_vehicles_map():
         """Obtiene el mapeo de vehículos desde cache o API (en paralelo)"""
         now = datetime.now()
         
         # Si el cache es válido, usarlo
         if _vehicles_cache["expires_at"] and now < _vehicles_cache["expires_at"]:
-            print(f"Usando cache de vehículos (válido por {(_vehicles_cache['expires_at'] - now).seconds}s)")
+            metrics.cache_hit("vehicles")
+            logger.info(f"Usando cache de vehículos (válido por {(_vehicles_cache['expires_at'] - now).seconds}s)")
             return _vehicles_cache["data"]
         
         # Si no, obtener desde API y cachear
-        print("Cache expirado, obteniendo vehículos desde API...")
-        start = time.time()
-        vehicles_map = {} # {personName: [ {plate, start, end} ]}
+        metrics.cache_miss("vehicles")
+        logger.info("Cache expirado, obteniendo vehículos desde API...")
+        with tracing.span("list_persons.load_vehicles"):
+            start = time.time()
+            vehicles_map = {} # {personName: (VehicleRecord, ...)}
         
-        try:
-            # Obtener primera página para saber el total
-            print("Obteniendo página 1 de vehículos...")
-            first_response = hik_api.list_vehicles(page_no=1, page_size=200, vehicle_group_code="2")
-            
-            if str(first_response.get("code")) != "0":
-                print(f"Error al obtener vehículos página 1: {first_response.get('msg')}")
-                return {}
-            
-            vehicles_data = first_response.get("data", {})
-            vehicles_list = vehicles_data.get("list", [])
-            total_vehicles = vehicles_data.get("total", 0)
-            
-            all_vehicles = vehicles_list
-            
-            # Calcular páginas restantes
-            import math
-            total_pages = math.ceil(total_vehicles / 200)
-            
-            if total_pages > 1:
-                print(f"Total vehículos: {total_vehicles}. Obteniendo {total_pages - 1} páginas restantes en paralelo...")
-                
-                # Función helper para el thread pool
-                def fetch_vehicle_page(p_num):
-                    try:
-                        resp = hik_api.list_vehicles(page_no=p_num, page_size=200, vehicle_group_code="2")
-                        if str(resp.get("code")) == "0":
-                            return resp.get("data", {}).get("list", [])
-                        return []
-                    except Exception as e:
-                        print(f"Error fetching vehicle page {p_num}: {e}")
-                        return []
-
-                # Ejecutar peticiones en paralelo
-                with ThreadPoolExecutor(max_workers=10) as executor:
-                    from concurrent.futures import as_completed
-                    futures = [executor.submit(fetch_vehicle_page, p) for p in range(2, total_pages + 1)]
-                    
-                    for future in as_completed(futures):
-                        page_vehicles = future.result()
-                        if page_vehicles:
-                            all_vehicles.extend(page_vehicles)
+            try:
+                result = await hik_api.paginate(hik_api.list_vehicles, 200, vehicle_group_code="2").acollect()
+                all_vehicles = result.items
+                if result.errors:
+                    logger.error(f"Vehículos incompletos: {len(result.errors)} páginas con error de {result.pages}")
             
-            print(f"Total vehículos obtenidos: {len(all_vehicles)}")
+                logger.info(f"Total vehículos obtenidos: {len(all_vehicles)}")
             
-            # Crear mapeo de personName a objetos vehículo
-            for vehicle in all_vehicles:
-                person_name = vehicle.get("personName", "").strip()
-                plate_no = vehicle.get("plateNo", "").strip()
-                if person_name and plate_no:
-                    if person_name not in vehicles_map:
-                        vehicles_map[person_name] = []
-                    
-                    # Guardar objeto completo
-                    vehicles_map[person_name].append({
-                        "plateNo": plate_no,
-                        "effectiveDate": vehicle.get("effectiveDate"),
-                        "expiredDate": vehicle.get("expiredDate"),
-                        "vehicleId": vehicle.get("vehicleId")
-                    })
+                # Crear mapeo de personName a registros de vehículo
+                grouped = {}
+                for vehicle in all_vehicles:
+                    person_name = vehicle.get("personName", "").strip()
+                    record = VehicleRecord(vehicle)
+                    if person_name and record.plate_no:
+                        grouped.setdefault(person_name, []).append(record)
+                vehicles_map = {name: tuple(records) for name, records in grouped.items()}
             
-            print(f"Mapeo creado con {len(vehicles_map)} personas")
+                logger.info(f"Mapeo creado con {len(vehicles_map)} personas")
             
-            # Guardar en cache por 60 segundos
-            _vehicles_cache["data"] = vehicles_map
-            _vehicles_cache["expires_at"] = now + timedelta(seconds=60)
+                # Guardar en cache por 60 segundos (un listado incompleto no se cachea)
+                if result.complete:
+                    _vehicles_cache["data"] = vehicles_map
+                    _vehicles_cache["expires_at"] = now + timedelta(seconds=60)
             
-        except Exception as e:
-            print(f"Error al obtener vehículos: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            except Exception as e:
+                logger.exception(f"Error al obtener vehículos: {str(e)}")
         
-        print(f"Tiempo de carga de vehículos: {time.time() - start:.2f}s")
-        return vehicles_map
+            logger.info(f"Tiempo de carga de vehículos: {time.time() - start:.2f}s")
+            return vehicles_map
     
-    def process_persons(persons_list: list, vehicles_map: dict) -> list:
-        """Procesa la lista de personas agregando el DNI y las placas"""
+    async def process_persons(records: List[PersonRecord]) -> list:
+        """Proyecta los registros a dicts de respuesta agregando las placas"""
+        # Solo se cargan los vehículos si se pidieron placas
+        vehicles_map = await get_vehicles_map() if include_vehicles else {}
         processed = []
-        for person in persons_list:
-            if not person: continue
-            
-            # Crear copia para no modificar el original si fuera necesario
-            p = person.copy()
-            
-            dni = extract_dni(p)
-            p["certificateNumber"] = dni
+        for record in records:
+            p = record.to_dict(selected_fields)
             
-            # Asignar placas y vehículos desde el mapeo
-            person_name = p.get("personName", "").strip()
-            vehicles = vehicles_map.get(person_name, [])
-            
-            # Campo legacy: string de placas separadas por coma
-            p["plateNo"] = ", ".join([v["plateNo"] for v in vehicles]) if vehicles else ""
-            
-            # Nuevo campo: lista de objetos vehículo
-            p["vehicles"] = vehicles
+            if include_vehicles:
+                # Asignar placas y vehículos desde el mapeo
+                vehicles = vehicles_map.get((record.person_name or "").strip(), ())
+                
+                # Campo legacy: string de placas separadas por coma
+                if selected_fields is None or "plateNo" in selected_fields:
+                    p["plateNo"] = ", ".join([v.plate_no for v in vehicles])
+                
+                # Nuevo campo: lista de objetos vehículo
+                if selected_fields is None or "vehicles" in selected_fields:
+                    p["vehicles"] = [v.to_dict() for v in vehicles]
             
-            processed.append(p)
+            processed.append(sparse(p))
         
         return processed
     
+    async def get_person_records() -> List[PersonRecord]:
+        """Obtiene todas las personas normalizadas desde cache o API (en paralelo)"""
+        now = datetime.now()
+        if _persons_cache["expires_at"] and now < _persons_cache["expires_at"]:
+            metrics.cache_hit("persons")
+            return _persons_cache["records"]
+        metrics.cache_miss("persons")
+        
+        with tracing.span("list_persons.load_persons"):
+            search_start = time.time()
+            result = await hik_api.paginate(hik_api.get_person_list, page_size).acollect()
+            if not result.items and result.errors:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Error al obtener lista: {result.errors[0].msg}"
+                )
+            if result.errors:
+                logger.error(f"Personas incompletas: {len(result.errors)} páginas con error de {result.pages}")
+            all_persons = result.items
+        
+            # Normalizar una sola vez (DNI y claves de búsqueda)
+            records = normalize_persons(all_persons)
+            logger.info(f"Total personas recuperadas: {len(records)}. Tiempo descarga: {time.time() - search_start:.2f}s")
+        
+            if result.complete:
+                _persons_cache["records"] = records
+                _persons_cache["expires_at"] = now + timedelta(seconds=60)
+            return records
+    
     # Si hay búsqueda, obtener TODAS las páginas en paralelo y filtrar en memoria
     if search and search.strip():
         search = search.strip()
-        print(f"Iniciando búsqueda optimizada para: '{search}'")
-        search_start = time.time()
-        
-        all_persons = []
+        logger.info(f"Iniciando búsqueda optimizada para: '{search}'")
         search_lower = search.lower()
         
         try:
-            # 1. Obtener primera página para saber el total
-            print("Obteniendo página 1 de personas...")
-            first_response = hik_api.get_person_list(page_no=1, page_size=page_size)
-            
-            if str(first_response.get("code")) != "0":
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Error al obtener lista: {first_response.get('msg', 'Error desconocido')}"
-                )
-            
-            data = first_response.get("data", {})
-            total_persons = data.get("total", 0)
-            persons_p1 = data.get("list", [])
-            
-            all_persons.extend(persons_p1)
+            records = await get_person_records()
             
-            # 2. Calcular páginas
-            import math
-            total_pages = math.ceil(total_persons / page_size)
-            print(f"Total personas: {total_persons}. Páginas totales: {total_pages}")
+            # Filtrar en memoria usando las claves precalculadas
+            with tracing.span("list_persons.filter", **{"persons.total": len(records)}):
+                filtered_persons = search_records(records, search_lower, limit=30)
             
-            # 3. Obtener el resto en paralelo
-            if total_pages > 1:
-                print(f"Obteniendo {total_pages - 1} páginas de personas en paralelo...")
-                
-                def fetch_person_page(p_num):
-                    try:
-                        resp = hik_api.get_person_list(page_no=p_num, page_size=page_size)
-                        if str(resp.get("code")) == "0":
-                            return resp.get("data", {}).get("list", [])
-                        return []
-                    except Exception as e:
-                        print(f"Error fetching person page {p_num}: {e}")
-                        return []
-
-                with ThreadPoolExecutor(max_workers=20) as executor:  # Mayor concurrencia para búsqueda
-                    from concurrent.futures import as_completed
-                    # Lanzar todas las tareas
-                    futures = [executor.submit(fetch_person_page, p) for p in range(2, total_pages + 1)]
-                    
-                    # Recolectar resultados conforme llegan
-                    for future in as_completed(futures):
-                        page_persons = future.result()
-                        if page_persons:
-                            all_persons.extend(page_persons)
-            
-            print(f"Total personas recuperadas: {len(all_persons)}. Tiempo descarga: {time.time() - search_start:.2f}s")
-            
-            # 4. Filtrar en memoria
-            filtered_persons = []
-            for p in all_persons:
-                if not p: continue
-                # Pre-procesar para tener DNI disponible para búsqueda
-                dni = extract_dni(p)
-                p["certificateNumber"] = dni  # Asignar temporalmente para filtro
-                
-                # Calcular similitud
-                person_name = p.get("personName", "").lower()
-                person_code = p.get("personCode", "").lower()
-                dni_val = dni.lower()
-                
-                # Check simple (contiene)
-                match_name = search_lower in person_name
-                match_code = search_lower in person_code
-                match_dni = search_lower in dni_val
-                
-                if match_name or match_code or match_dni:
-                     # Calcular score para ordenamiento
-                     score = 0
-                     if match_name:
-                         score = max(score, difflib.SequenceMatcher(None, search_lower, person_name).ratio())
-                     if match_code:
-                         score = max(score, difflib.SequenceMatcher(None, search_lower, person_code).ratio())
-                     if match_dni:
-                         score = max(score, difflib.SequenceMatcher(None, search_lower, dni_val).ratio())
-                     
-                     p["_search_score"] = score
-                     filtered_persons.append(p)
-            
-            # Ordenar por score descendente
-            filtered_persons.sort(key=lambda x: x.get("_search_score", 0), reverse=True)
-            
-            # Limitar a top 30
-            filtered_persons = filtered_persons[:30]
-            
-            print(f"Personas tras filtrado y límite: {len(filtered_persons)}")
+            logger.info(f"Personas tras filtrado y límite: {len(filtered_persons)}")
             
             # 5. Enriquecer con vehículos (solo a los filtrados para ahorrar tiempo)
-            vehicles_map = get_vehicles_map()
-            final_persons = process_persons(filtered_persons, vehicles_map)
+            final_persons = await process_persons(filtered_persons)
             
-            return {
+            # Respuesta ya serializable: se evita jsonable_encoder
+            return ORJSONResponse({
                 "message": "Búsqueda completada exitosamente",
                 "success": True,
                 "data": {
@@ -832,12 +699,12 @@ async def list_persons(
                     "pageSize": len(final_persons),
                     "isSearch": True
                 }
-            }
+            })
             
+        except HTTPException:
+            raise
         except Exception as e:
-            print(f"Error en búsqueda: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Error en búsqueda: {e}")
             raise HTTPException(status_code=500, detail=str(e))
     
     # Sin búsqueda: comportamiento normal (solo 1 página)
@@ -853,11 +720,10 @@ async def list_persons(
     persons = data.get("list", [])
     total = data.get("total", 0)
     
-    # Obtener mapeo de vehículos y procesar personas
-    vehicles_map = get_vehicles_map()
-    persons = process_persons(persons, vehicles_map)
+    # Procesar personas (con vehículos si se pidieron)
+    persons = await process_persons(normalize_persons(persons))
     
-    return {
+    return ORJSONResponse({
         "message": "Lista obtenida exitosamente",
         "success": True,
         "data": {
@@ -867,12 +733,36 @@ async def list_persons(
             "pageSize": page_size,
             "isSearch": False
         }
+    })
+
+@router.post("/reconcile")
+def reconcile_documents(
+    file: UploadFile = File(...),
+    column: str = "DOCUMENTO",
+    refresh: bool = False,
+    current_user: schemas.User = Depends(auth.require_role(["admin"]))
+):
+    """Cruza los documentos de un Excel/CSV contra los DNI de HikCentral (solo admin)"""
+    try:
+        df = reconcile_engine.read_table(file.file, filename=file.filename)
+        dni_index = reconcile_engine.load_dni_index(refresh=refresh)
+        result = reconcile_engine.reconcile(df, column, dni_index)
+    except KeyError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e.args[0]))
+    except Exception as e:
+        logger.error(f"Error en cruce de documentos: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+    return {
+        "message": "Cruce completado exitosamente",
+        "success": True,
+        "data": reconcile_engine.report(result, column)
     }
 
 @router.get("/{person_code}")
 async def get_person(
     person_code: str,
-    current_user: models.User = Depends(auth.get_current_active_user)
+    current_user: schemas.User = Depends(auth.get_current_active_user)
 ):
     """Obtiene información de una persona por código"""
     response = hik_api.get_person_by_code(person_code)
@@ -892,7 +782,7 @@ async def get_person(
 @router.post("/assign-access-level", response_model=schemas.MessageResponse)
 async def assign_access_level(
     assignment: schemas.AccessLevelAssign,
-    current_user: models.User = Depends(auth.require_role(["admin", "gestion_vehicular", "gestion_peatonal", "postulante"]))
+    current_user: schemas.User = Depends(auth.require_role(["admin", "gestion_vehicular", "gestion_peatonal", "postulante"]))
 ):
     """Asigna un access level a una persona"""
     result = hik_api.assign_access_level(
@@ -914,7 +804,7 @@ async def assign_access_level(
 
 @router.get("/access-levels/list")
 async def list_access_levels(
-    current_user: models.User = Depends(auth.get_current_active_user)
+    current_user: schemas.User = Depends(auth.get_current_active_user)
 ):
     """Lista todos los grupos de acceso (access levels)"""
     response = hik_api.list_privilege_groups()
@@ -936,7 +826,7 @@ async def list_access_levels(
 
 @router.get("/organizations/list")
 async def list_organizations(
-    current_user: models.User = Depends(auth.get_current_active_user)
+    current_user: schemas.User = Depends(auth.get_current_active_user)
 ):
     """Lista todas las organizaciones"""
     response = hik_api.list_organizations()
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime
 
 # User Schemas
 class UserBase(BaseModel):
@@ -99,3 +99,11 @@ class AuditLogResponse(AuditLogBase):
     
     class Config:
         from_attributes = True
+
+class AuditDailySummary(BaseModel):
+    day: date
+    user_id: int
+    username: Optional[str] = None
+    module: str
+    action: str
+    count: int
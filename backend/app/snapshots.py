@@ -0,0 +1,235 @@
+"""
+Snapshots columnares (Apache Arrow) de personas, vehículos y organizaciones.
+
+Se escriben periódicamente a disco en formato Arrow IPC sin compresión para
+que los análisis offline (cruces con Excel, dashboards) puedan abrirlos con
+memory-map y leer decenas de miles de filas sin consultar HikCentral.
+
+Uso:
+    python -m app.snapshots            # genera un snapshot ahora
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import pyarrow as pa
+
+from .config import settings
+from .hikcentral import hik_api
+from .logs import get_logger
+from .pagination import Paginator
+from .records import extract_dni
+
+logger = get_logger(__name__)
+
+PERSONS = "persons"
+VEHICLES = "vehicles"
+ORGANIZATIONS = "organizations"
+
+PERSONS_SCHEMA = pa.schema([
+    ("personId", pa.string()),
+    ("personCode", pa.string()),
+    ("personName", pa.string()),
+    ("personGivenName", pa.string()),
+    ("personFamilyName", pa.string()),
+    ("gender", pa.int8()),
+    ("orgIndexCode", pa.string()),
+    ("phoneNo", pa.string()),
+    ("email", pa.string()),
+    ("dni", pa.string()),
+    ("beginTime", pa.string()),
+    ("endTime", pa.string()),
+    ("hasPhoto", pa.bool_()),
+])
+
+VEHICLES_SCHEMA = pa.schema([
+    ("vehicleId", pa.string()),
+    ("plateNo", pa.string()),
+    ("personName", pa.string()),
+    ("vehicleGroupIndexCode", pa.string()),
+    ("effectiveDate", pa.string()),
+    ("expiredDate", pa.string()),
+])
+
+ORGANIZATIONS_SCHEMA = pa.schema([
+    ("orgIndexCode", pa.string()),
+    ("orgName", pa.string()),
+    ("parentOrgIndexCode", pa.string()),
+])
+
+_scheduler_stop = threading.Event()
+_scheduler_thread: Optional[threading.Thread] = None
+
+
+def _str(value) -> Optional[str]:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _gender(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _fetch_all(fetch_page: Callable[[int, int], dict], page_size: int) -> List[dict]:
+    """Descarga todas las páginas de un listado; falla si alguna página falla"""
+    return Paginator(fetch_page, page_size).collect(strict=True).items
+
+
+def persons_table(persons: List[dict]) -> pa.Table:
+    """Convierte personas de HikCentral a una tabla Arrow"""
+    columns: Dict[str, list] = {name: [] for name in PERSONS_SCHEMA.names}
+    for p in persons:
+        columns["personId"].append(_str(p.get("personId")))
+        columns["personCode"].append(_str(p.get("personCode")))
+        columns["personName"].append(_str(p.get("personName")))
+        columns["personGivenName"].append(_str(p.get("personGivenName")))
+        columns["personFamilyName"].append(_str(p.get("personFamilyName")))
+        columns["gender"].append(_gender(p.get("gender")))
+        columns["orgIndexCode"].append(_str(p.get("orgIndexCode")))
+        columns["phoneNo"].append(_str(p.get("phoneNo")))
+        columns["email"].append(_str(p.get("email")))
+        columns["dni"].append(_str(extract_dni(p)))
+        columns["beginTime"].append(_str(p.get("beginTime")))
+        columns["endTime"].append(_str(p.get("endTime")))
+        columns["hasPhoto"].append(bool(((p.get("personPhoto") or {}).get("picUri") or "").strip()))
+    return pa.table(columns, schema=PERSONS_SCHEMA)
+
+
+def vehicles_table(vehicles: List[dict]) -> pa.Table:
+    """Convierte vehículos de HikCentral a una tabla Arrow"""
+    columns: Dict[str, list] = {name: [] for name in VEHICLES_SCHEMA.names}
+    for v in vehicles:
+        for name in VEHICLES_SCHEMA.names:
+            columns[name].append(_str(v.get(name)))
+    return pa.table(columns, schema=VEHICLES_SCHEMA)
+
+
+def organizations_table(orgs: List[dict]) -> pa.Table:
+    """Convierte organizaciones de HikCentral a una tabla Arrow"""
+    columns: Dict[str, list] = {name: [] for name in ORGANIZATIONS_SCHEMA.names}
+    for o in orgs:
+        for name in ORGANIZATIONS_SCHEMA.names:
+            columns[name].append(_str(o.get(name)))
+    return pa.table(columns, schema=ORGANIZATIONS_SCHEMA)
+
+
+def _snapshot_path(name: str, directory: Optional[str] = None) -> str:
+    return os.path.join(directory or settings.SNAPSHOT_DIR, f"{name}.arrow")
+
+
+def write_table(name: str, table: pa.Table, directory: Optional[str] = None) -> str:
+    """Escribe una tabla en formato Arrow IPC de forma atómica"""
+    directory = directory or settings.SNAPSHOT_DIR
+    os.makedirs(directory, exist_ok=True)
+    path = _snapshot_path(name, directory)
+    tmp_path = path + ".tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    # Reemplazo atómico: los lectores nunca ven un archivo a medio escribir
+    os.replace(tmp_path, path)
+    return path
+
+
+def fetch_all_persons() -> List[dict]:
+    """Descarga todas las personas de HikCentral"""
+    return _fetch_all(lambda p, s: hik_api.get_person_list(page_no=p, page_size=s), 200)
+
+
+def load_persons(refresh: bool = False) -> pa.Table:
+    """Tabla de personas del snapshot en disco; se descarga si no existe o se pide ``refresh``"""
+    if not refresh and read_manifest() is not None:
+        return load_snapshot(PERSONS)
+    return persons_table(fetch_all_persons())
+
+
+def write_snapshot(directory: Optional[str] = None) -> dict:
+    """Descarga personas, vehículos y organizaciones y escribe el snapshot"""
+    start = time.time()
+    persons = fetch_all_persons()
+    vehicles = _fetch_all(
+        lambda p, s: hik_api.list_vehicles(page_no=p, page_size=s, vehicle_group_code="2"), 200
+    )
+    orgs = _fetch_all(lambda p, s: hik_api.list_organizations(page_no=p, page_size=s), 500)
+
+    write_table(PERSONS, persons_table(persons), directory)
+    write_table(VEHICLES, vehicles_table(vehicles), directory)
+    write_table(ORGANIZATIONS, organizations_table(orgs), directory)
+
+    manifest = {
+        "createdAt": datetime.now().isoformat(),
+        "persons": len(persons),
+        "vehicles": len(vehicles),
+        "organizations": len(orgs),
+        "seconds": round(time.time() - start, 2),
+    }
+    manifest_path = os.path.join(directory or settings.SNAPSHOT_DIR, "manifest.json")
+    with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(manifest_path + ".tmp", manifest_path)
+    return manifest
+
+
+def load_snapshot(name: str, directory: Optional[str] = None) -> pa.Table:
+    """Abre un snapshot con memory-map (sin copiar los datos a memoria)"""
+    source = pa.memory_map(_snapshot_path(name, directory), "r")
+    return pa.ipc.open_file(source).read_all()
+
+
+def load_snapshot_df(name: str, directory: Optional[str] = None):
+    """Carga un snapshot como DataFrame de pandas"""
+    return load_snapshot(name, directory).to_pandas()
+
+
+def read_manifest(directory: Optional[str] = None) -> Optional[dict]:
+    """Retorna el manifiesto del último snapshot o None si no existe"""
+    path = os.path.join(directory or settings.SNAPSHOT_DIR, "manifest.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _scheduler_loop(interval_seconds: float):
+    while not _scheduler_stop.is_set():
+        try:
+            manifest = write_snapshot()
+            logger.info(f"Snapshot escrito: {manifest['persons']} personas, "
+                        f"{manifest['vehicles']} vehículos en {manifest['seconds']}s")
+        except Exception as e:
+            logger.exception(f"Error al escribir snapshot: {e}")
+        _scheduler_stop.wait(interval_seconds)
+
+
+def start_scheduler():
+    """Inicia la escritura periódica de snapshots (si SNAPSHOT_INTERVAL_MINUTES > 0)"""
+    global _scheduler_thread
+    if settings.SNAPSHOT_INTERVAL_MINUTES <= 0 or _scheduler_thread is not None:
+        return
+    _scheduler_stop.clear()
+    _scheduler_thread = threading.Thread(
+        target=_scheduler_loop,
+        args=(settings.SNAPSHOT_INTERVAL_MINUTES * 60,),
+        name="snapshot-scheduler",
+        daemon=True,
+    )
+    _scheduler_thread.start()
+
+
+def stop_scheduler():
+    """Detiene la escritura periódica de snapshots"""
+    global _scheduler_thread
+    _scheduler_stop.set()
+    _scheduler_thread = None
+
+
+if __name__ == "__main__":
+    print(json.dumps(write_snapshot(), ensure_ascii=False, indent=2))
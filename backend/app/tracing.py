@@ -0,0 +1,175 @@
+"""
+Trazas OpenTelemetry de la API.
+
+Con TRACING_EXPORTER distinto de "none" se genera un span por request (con la
+plantilla de la ruta), uno por cada paso de los flujos de personas
+(creación, búsqueda de personCode, DNI, foto, vehículos) y uno por cada
+llamada firmada a HikCentral con su path y código de resultado. Así se puede
+ver en qué paso se fue el tiempo de un request lento.
+
+Exportadores:
+- file:    una línea JSON por span en TRACING_FILE
+- otlp:    colector OTLP/HTTP en TRACING_OTLP_ENDPOINT (Jaeger, Tempo...)
+- console: stdout (depuración)
+
+Si el request trae un header ``traceparent`` (W3C) el span de la ruta
+continúa esa traza. Sin opentelemetry-sdk instalado, o con
+TRACING_EXPORTER=none, los spans no hacen nada.
+"""
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+from .logs import get_logger, request_id_var
+
+try:
+    from opentelemetry import context as otel_context
+    from opentelemetry import trace
+    from opentelemetry.propagate import extract
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:  # opentelemetry es opcional: sin él no hay trazas
+    trace = None
+
+logger = get_logger(__name__)
+
+_tracer = None
+_provider = None
+_output = None  # Archivo del exportador "file"
+
+
+class _NoopSpan:
+    """Span vacío cuando las trazas están desactivadas"""
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_attributes(self, attributes):
+        pass
+
+    def update_name(self, name):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def _build_exporter(kind: str):
+    global _output
+    if kind == "file":
+        _output = open(settings.TRACING_FILE, "a", encoding="utf-8")
+        return ConsoleSpanExporter(out=_output, formatter=lambda span: span.to_json(indent=None) + "\n")
+    if kind == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+    if kind == "console":
+        return ConsoleSpanExporter()
+    raise ValueError(f"TRACING_EXPORTER inválido: {kind} (none, file, otlp, console)")
+
+
+def setup_tracing():
+    """Configura el proveedor de trazas según TRACING_EXPORTER (idempotente)"""
+    global _tracer, _provider
+    kind = settings.TRACING_EXPORTER.lower()
+    if _tracer is not None or kind == "none":
+        return
+    if trace is None:
+        logger.warning("TRACING_EXPORTER configurado pero opentelemetry-sdk no está instalado")
+        return
+
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.TRACING_SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO)),
+    )
+    # Exportación por lotes en un hilo aparte: el request no espera al colector
+    _provider.add_span_processor(BatchSpanProcessor(_build_exporter(kind)))
+    _tracer = _provider.get_tracer("appunalm")
+    logger.info(f"Trazas activas (exportador: {kind})")
+
+
+def shutdown_tracing():
+    """Exporta los spans pendientes y cierra el exportador"""
+    global _tracer, _provider, _output
+    provider, _provider, _tracer = _provider, None, None
+    if provider is not None:
+        provider.shutdown()
+    if _output is not None:
+        _output.close()
+        _output = None
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Span hijo del actual; las excepciones se registran en el span"""
+    if _tracer is None:
+        yield _NOOP_SPAN
+        return
+    with _tracer.start_as_current_span(name, attributes=attributes) as current:
+        yield current
+
+
+def propagate(fn: Callable) -> Callable:
+    """Envuelve ``fn`` para que sus spans cuelguen del span actual al correr en otro hilo"""
+    if _tracer is None:
+        return fn
+    parent = otel_context.get_current()
+
+    def run(*args, **kwargs):
+        token = otel_context.attach(parent)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            otel_context.detach(token)
+
+    return run
+
+
+class TracingMiddleware:
+    """Span raíz por request HTTP con la plantilla de la ruta y el status"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or _tracer is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope["headers"]}
+        status_code: Optional[int] = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        with _tracer.start_as_current_span(
+            f"{scope['method']} {scope['path']}",
+            context=extract(headers),
+            kind=SpanKind.SERVER,
+            attributes={"http.request.method": scope["method"], "url.path": scope["path"]},
+        ) as current:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                # FastAPI deja la ruta que atendió el request en scope["route"]
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    current.update_name(f"{scope['method']} {route}")
+                    current.set_attribute("http.route", route)
+                if request_id_var.get():
+                    current.set_attribute("request.id", request_id_var.get())
+                if status_code is not None:
+                    current.set_attribute("http.response.status_code", status_code)
+                    if status_code >= 500:
+                        current.set_status(Status(StatusCode.ERROR))
@@ -0,0 +1,108 @@
+"""
+Benchmark de concurrencia de la BD: escrituras de auditoría mezcladas con
+lecturas de usuarios, comparando modos de journal/synchronous de SQLite.
+
+Uso (desde la carpeta backend):
+    python -m benchmarks.bench_db                      # DELETE/FULL vs WAL/NORMAL
+    python -m benchmarks.bench_db --writers 4 --readers 16 --seconds 10
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List
+
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import Base, build_engine
+
+from .common import latency_summary
+
+MODES = (("DELETE", "FULL"), ("WAL", "NORMAL"))
+
+
+def run_mixed(url: str, journal_mode: str, synchronous: str, writers: int, readers: int, seconds: float) -> Dict:
+    """Ejecuta escritores (un commit por registro) y lectores en paralelo durante ``seconds``"""
+    engine = build_engine(url, journal_mode=journal_mode, synchronous=synchronous)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+
+    with Session() as db:
+        db.add_all(
+            models.User(username=f"user{i}", email=f"user{i}@bench.local", hashed_password="x")
+            for i in range(100)
+        )
+        db.commit()
+
+    stop = threading.Event()
+    latencies: Dict[str, List[float]] = {"write": [], "read": []}
+    errors = {"write": 0, "read": 0}
+    lock = threading.Lock()
+
+    def worker(kind: str, index: int):
+        local: List[float] = []
+        failed = 0
+        with Session() as db:
+            i = 0
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    if kind == "write":
+                        db.add(models.AuditLog(
+                            user_id=index + 1, action="UPDATE", module="PERSONAS",
+                            details=f"bench {i}", timestamp=datetime.now(),
+                        ))
+                        db.commit()
+                    else:
+                        db.query(models.User).filter(models.User.username == f"user{i % 100}").first()
+                        db.rollback()
+                    local.append(time.perf_counter() - start)
+                except Exception:
+                    db.rollback()
+                    failed += 1
+                i += 1
+        with lock:
+            latencies[kind].extend(local)
+            errors[kind] += failed
+
+    threads = [threading.Thread(target=worker, args=("write", i)) for i in range(writers)]
+    threads += [threading.Thread(target=worker, args=("read", i)) for i in range(readers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+
+    result = {"mode": f"{journal_mode}/{synchronous}"}
+    for kind in ("write", "read"):
+        result[kind] = latency_summary(latencies[kind], elapsed)
+        result[kind]["errors"] = errors[kind]
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de escrituras de auditoría y lecturas concurrentes")
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    results = []
+    for journal_mode, synchronous in MODES:
+        with tempfile.TemporaryDirectory() as tmp:
+            url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+            results.append(run_mixed(url, journal_mode, synchronous, args.writers, args.readers, args.seconds))
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark de login: latencia p50/p99 con N logins concurrentes.
+
+Uso (desde la carpeta backend):
+    python -m benchmarks.bench_login                      # levanta la app en una BD temporal
+    python -m benchmarks.bench_login --url http://host:8000 --username admin --password ...
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .common import latency_summary, run_app
+
+
+def run_logins(url: str, username: str, password: str, concurrency: int, total: int) -> dict:
+    """Lanza ``total`` logins con ``concurrency`` clientes simultáneos"""
+    def login(_):
+        start = time.perf_counter()
+        r = requests.post(
+            f"{url}/api/auth/login",
+            data={"username": username, "password": password},
+            timeout=60,
+        )
+        return time.perf_counter() - start, r.status_code
+
+    # Calentamiento (conexión, carga de módulos, primer hash)
+    login(None)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(login, range(total)))
+    elapsed = time.perf_counter() - start
+
+    errors = sum(1 for _, code in results if code != 200)
+    summary = latency_summary([latency for latency, _ in results], elapsed)
+    summary.update({"concurrency": concurrency, "errors": errors})
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de logins concurrentes")
+    parser.add_argument("--url", help="URL de una instancia ya levantada (si no, se levanta una temporal)")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("-c", "--concurrency", type=int, default=50)
+    parser.add_argument("-n", "--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    if args.url:
+        summary = run_logins(args.url, args.username, args.password, args.concurrency, args.requests)
+    else:
+        env = {"ADMIN_USERNAME": args.username, "ADMIN_PASSWORD": args.password}
+        with run_app(env) as url:
+            summary = run_logins(url, args.username, args.password, args.concurrency, args.requests)
+
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Microbenchmarks del trabajo de CPU por request: firma de Artemis (MD5 y
+HMAC), serialización de bodies, parseo de respuestas, extracción de DNI,
+normalización de personas y filtro de búsqueda con difflib.
+
+Los fixtures salen de person_data.json convertido al formato de personList
+(el mismo que sirve benchmarks.hik_stub). Cada caso se mide con timeit
+(mejor de --repeat corridas) y se reporta en µs por operación.
+
+Uso (desde la carpeta backend):
+    python -m benchmarks.bench_micro
+    python -m benchmarks.bench_micro --filter search --repeat 7
+    python -m benchmarks.bench_micro --save-baseline     # benchmarks/baselines/micro.json
+"""
+import argparse
+import base64
+import json
+import os
+import platform
+import time
+import timeit
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+import requests
+
+from app.hikcentral import HikCentralAPI
+from app.records import extract_dni, normalize_persons, search_records
+
+from .common import BACKEND_DIR
+from .hik_stub import DEFAULT_PERSONS_FILE, _person_from_export
+
+BASELINE_FILE = os.path.join(BACKEND_DIR, "benchmarks", "baselines", "micro.json")
+
+
+def _fixtures() -> dict:
+    with open(DEFAULT_PERSONS_FILE, encoding="utf-8") as f:
+        persons = [_person_from_export(row) for row in json.load(f)]
+    page = persons[:200]
+    page_bytes = json.dumps(
+        {"code": "0", "msg": "Success", "data": {"total": len(persons), "pageNo": 1, "pageSize": 200, "list": page}},
+        ensure_ascii=False,
+    ).encode("utf-8")
+    response = requests.Response()
+    response._content = page_bytes
+    response.encoding = "utf-8"
+    with_dni = next(p for p in persons if p["customFieldList"][0]["customFieldValue"])
+    return {
+        "persons": persons,
+        "page": page,
+        "page_bytes": page_bytes,
+        "response": response,
+        "with_dni": with_dni,
+        "records": normalize_persons(persons),
+        # Foto típica: ~100 KB en base64
+        "face_b64": base64.b64encode(os.urandom(75_000)).decode(),
+        "add_body": {
+            "personGivenName": "JUAN CARLOS", "personFamilyName": "PEREZ QUISPE", "personCode": "20231234",
+            "gender": "1", "orgIndexCode": "1", "phoneNo": "999888777", "email": "jperez@lamolina.edu.pe",
+        },
+    }
+
+
+def _signed_headers(api: HikCentralAPI, path: str, body: dict) -> dict:
+    """Mismos pasos que HikCentralAPI.post_signed antes de enviar el request"""
+    body_json = json.dumps(body, separators=(",", ":"), ensure_ascii=False)
+    ts = str(int(time.time() * 1000))
+    nonce = str(uuid.uuid4())
+    date_v = api._now_gmt()
+    md5_v = api._md5_b64(body_json)
+    headers_to_sign = "\n".join([
+        f"userid:{api.user_id}",
+        f"x-ca-key:{api.app_key}",
+        f"x-ca-nonce:{nonce}",
+        f"x-ca-timestamp:{ts}",
+    ])
+    sig = api._sign_post(api.accept, md5_v, api.ctype, date_v, headers_to_sign, path)
+    return api._build_headers(md5_v, date_v, nonce, ts, sig)
+
+
+def cases(fx: dict) -> List[Tuple[str, Callable[[], object]]]:
+    api = HikCentralAPI()
+    list_path = "/artemis/api/resource/v1/person/personList"
+    list_body = {"pageNo": 1, "pageSize": 200}
+    list_json = json.dumps(list_body, separators=(",", ":"))
+    face_body = {"personCode": "20231234", "faceData": fx["face_b64"]}
+    face_json = json.dumps(face_body, separators=(",", ":"))
+    headers_to_sign = "userid:admin\nx-ca-key:123\nx-ca-nonce:abc\nx-ca-timestamp:1700000000000"
+    date_v = api._now_gmt()
+    md5_v = api._md5_b64(list_json)
+    records = fx["records"]
+
+    return [
+        ("md5_b64.list_body", lambda: api._md5_b64(list_json)),
+        ("md5_b64.face_body", lambda: api._md5_b64(face_json)),
+        ("sign_post", lambda: api._sign_post(api.accept, md5_v, api.ctype, date_v, headers_to_sign, list_path)),
+        ("signed_headers.list", lambda: _signed_headers(api, list_path, list_body)),
+        ("json_dumps.list_body", lambda: json.dumps(list_body, separators=(",", ":"), ensure_ascii=False)),
+        ("json_dumps.add_body", lambda: json.dumps(fx["add_body"], separators=(",", ":"), ensure_ascii=False)),
+        ("json_dumps.face_body", lambda: json.dumps(face_body, separators=(",", ":"), ensure_ascii=False)),
+        ("json_loads.person_page_200", lambda: json.loads(fx["page_bytes"])),
+        ("response_json.person_page_200", lambda: fx["response"].json()),
+        ("extract_dni", lambda: extract_dni(fx["with_dni"])),
+        ("normalize_persons.page_200", lambda: normalize_persons(fx["page"])),
+        ("normalize_persons.all", lambda: normalize_persons(fx["persons"])),
+        ("search_records.name", lambda: search_records(records, "garcia")),
+        ("search_records.dni_prefix", lambda: search_records(records, "4126")),
+        ("search_records.no_match", lambda: search_records(records, "zzzzqx")),
+    ]
+
+
+def measure(fn: Callable[[], object], repeat: int) -> float:
+    """Segundos por operación (mejor de ``repeat`` corridas de ~0.2 s)"""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks de firma, parseo y búsqueda")
+    parser.add_argument("--filter", help="Solo los casos cuyo nombre contiene este texto")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    fx = _fixtures()
+    results: Dict[str, float] = {}
+    for name, fn in cases(fx):
+        if args.filter and args.filter not in name:
+            continue
+        results[name] = round(measure(fn, args.repeat) * 1e6, 3)
+
+    baseline = {}
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f).get("us_per_op", {})
+
+    print(f"{'caso':36} {'µs/op':>12} {'base':>12} {'cambio':>8}")
+    for name, value in results.items():
+        line = f"{name:36} {value:12.3f}"
+        if name in baseline:
+            line += f" {baseline[name]:12.3f} {(value / baseline[name] - 1) * 100:+7.1f}%"
+        print(line)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "date": datetime.now().isoformat(timespec="seconds"),
+                "machine": {"python": platform.python_version(), "cpus": os.cpu_count(), "platform": platform.platform()},
+                "us_per_op": results,
+            }, f, indent=2)
+            f.write("\n")
+        print(f"Línea base guardada en {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Utilidades compartidas por los benchmarks.
+
+Los benchmarks se ejecutan desde la carpeta backend:
+    python -m benchmarks.bench_login
+"""
+import contextlib
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, Iterator, List, Optional
+
+import requests
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    """Retorna un puerto TCP libre en localhost"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentil por el método nearest-rank"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def latency_summary(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    """Resumen de latencias (en ms) y throughput"""
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p90_ms": round(percentile(latencies, 90) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "max_ms": round(max(latencies) * 1000, 1) if latencies else 0.0,
+    }
+
+
+def wait_until_up(url: str, timeout: float = 30) -> None:
+    """Espera a que el servidor responda en /health"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(f"{url}/health", timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"El servidor en {url} no respondió a tiempo")
+
+
+@contextlib.contextmanager
+def run_app(env: Optional[Dict[str, str]] = None, workers: int = 1) -> Iterator[str]:
+    """Levanta la app con uvicorn sobre una BD SQLite temporal y retorna su URL"""
+    port = free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        server_env = dict(os.environ)
+        server_env.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        server_env["SNAPSHOT_INTERVAL_MINUTES"] = "0"
+        server_env.update(env or {})
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app",
+             "--host", "127.0.0.1", "--port", str(port),
+             "--workers", str(workers), "--log-level", "warning"],
+            cwd=BACKEND_DIR,
+            env=server_env,
+        )
+        url = f"http://127.0.0.1:{port}"
+        try:
+            wait_until_up(url)
+            yield url
+        finally:
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+
+
+@contextlib.contextmanager
+def run_stub(args: Optional[List[str]] = None) -> Iterator[str]:
+    """Levanta el controlador HikCentral simulado (benchmarks.hik_stub) y retorna su URL"""
+    port = free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.hik_stub", "--port", str(port)] + list(args or []),
+        cwd=BACKEND_DIR,
+        stdout=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        wait_until_up(url)
+        yield url
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
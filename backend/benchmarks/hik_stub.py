@@ -0,0 +1,464 @@
+"""
+Controlador HikCentral simulado (Artemis) para benchmarks y pruebas sin red.
+
+Verifica la firma X-Ca-Signature igual que el controlador real (Content-MD5,
+clave, timestamp y HMAC-SHA256 del string-to-sign) y responde los endpoints
+de personas, vehículos, organizaciones y grupos de privilegios que usa la
+app, con los datos de person_data.json y vehicle_data.json en memoria.
+
+Latencia, jitter, tasa de errores y tamaño máximo de página son
+configurables para reproducir las condiciones del controlador real.
+
+Uso (desde la carpeta backend):
+    python -m benchmarks.hik_stub --port 9000 --latency-ms 80 --jitter-ms 40
+    HIKCENTRAL_BASE_URL=http://127.0.0.1:9000 uvicorn app.main:app
+
+    GET  /stub/stats        llamadas por path (para medir amplificación)
+    POST /stub/stats/reset  reinicia los contadores
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import os
+import random
+import re
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+from app.config import settings
+
+from .common import BACKEND_DIR
+
+REPO_DIR = os.path.dirname(BACKEND_DIR)
+DEFAULT_PERSONS_FILE = os.path.join(BACKEND_DIR, "person_data.json")
+DEFAULT_VEHICLES_FILE = os.path.join(REPO_DIR, "vehicle_data.json")
+
+# Diferencia máxima aceptada entre X-Ca-Timestamp y el reloj del servidor
+MAX_CLOCK_SKEW_MS = 15 * 60 * 1000
+
+PRIVILEGE_GROUPS = [
+    {"privilegeGroupId": "1", "privilegeGroupName": "Acceso General", "description": ""},
+    {"privilegeGroupId": "2", "privilegeGroupName": "Acceso Vehicular", "description": ""},
+    {"privilegeGroupId": "3", "privilegeGroupName": "Postulantes", "description": ""},
+]
+
+CUSTOM_FIELDS = [
+    {"id": "1", "customFieldName": "DNI", "customFieldType": 0},
+    {"id": "2", "customFieldName": "Departamento", "customFieldType": 0},
+    {"id": "3", "customFieldName": "Puesto", "customFieldType": 0},
+]
+
+# Respuesta en árbol, como /vehicle/group/list en las versiones que no tienen /vehicleGroup/page
+VEHICLE_GROUPS = {
+    "indexCode": "1", "name": "Vehículos",
+    "children": [{"indexCode": "2", "name": "Personal UNALM"}, {"indexCode": "3", "name": "Visitantes"}],
+}
+
+
+def ok(data=None) -> dict:
+    return {"code": "0", "msg": "Success", "data": data}
+
+
+def fail(code: str, msg: str) -> dict:
+    return {"code": code, "msg": msg}
+
+
+def _person_from_export(row: dict) -> dict:
+    """Convierte una fila de person_data.json al formato de personList"""
+    person = {
+        "personId": str(row.get("personID") or ""),
+        "personCode": row.get("ID") or "",
+        "personName": row.get("Nombre") or "",
+        "personGivenName": row.get("Nombre") or "",
+        "personFamilyName": "",
+        "gender": row.get("Gender") if row.get("Gender") is not None else 0,
+        "orgIndexCode": str(row.get("Departament") or "1"),
+        "phoneNo": "",
+        "email": "",
+        "customFieldList": [
+            {"customFieldName": "DNI", "customFieldType": 0, "customFieldValue": row.get("DNI") or ""},
+        ],
+    }
+    if row.get("FotoURI"):
+        person["personPhoto"] = {"picUri": row["FotoURI"]}
+    return person
+
+
+def _synthetic_person(person_id: int) -> dict:
+    """Persona generada para directorios más grandes que los datos de ejemplo"""
+    return _person_from_export({
+        "personID": str(person_id),
+        "ID": f"S{person_id:08d}",
+        "Nombre": f"Persona Sintetica {person_id}",
+        "DNI": f"{70000000 + person_id % 30000000:08d}",
+        "Departament": str(1 + person_id % 20),
+        "Gender": 1 + person_id % 2,
+    })
+
+
+class Directory:
+    """Personas, vehículos y organizaciones del controlador simulado"""
+
+    def __init__(self, persons: List[dict], vehicles: List[dict]):
+        self.persons: Dict[str, dict] = {}  # {personId: persona}
+        self.by_code: Dict[str, str] = {}   # {personCode: personId}
+        for person in persons:
+            self._store(person)
+        self.vehicles: Dict[str, dict] = {str(v["vehicleId"]): dict(v) for v in vehicles}
+        self.next_person_id = max((int(pid) for pid in self.persons if pid.isdigit()), default=0) + 1
+        self.next_vehicle_id = max((int(vid) for vid in self.vehicles if vid.isdigit()), default=0) + 1
+        self._person_list: Optional[List[dict]] = None
+
+    @classmethod
+    def load(cls, persons_file: str, vehicles_file: str, min_persons: int = 0) -> "Directory":
+        persons = []
+        if persons_file and os.path.exists(persons_file):
+            with open(persons_file, encoding="utf-8") as f:
+                persons = [_person_from_export(row) for row in json.load(f)]
+        vehicles = []
+        if vehicles_file and os.path.exists(vehicles_file):
+            with open(vehicles_file, encoding="utf-8") as f:
+                vehicles = json.load(f)
+        directory = cls(persons, vehicles)
+        while len(directory.persons) < min_persons:
+            directory._store(_synthetic_person(directory.next_person_id))
+            directory.next_person_id += 1
+        return directory
+
+    def _store(self, person: dict):
+        self.persons[person["personId"]] = person
+        if person.get("personCode"):
+            self.by_code[person["personCode"]] = person["personId"]
+        self._person_list = None
+
+    def person_list(self) -> List[dict]:
+        """Personas ordenadas por personId descendente (como el controlador)"""
+        if self._person_list is None:
+            self._person_list = sorted(
+                self.persons.values(),
+                key=lambda p: int(p["personId"]) if p["personId"].isdigit() else 0,
+                reverse=True,
+            )
+        return self._person_list
+
+    def organizations(self) -> List[dict]:
+        codes = sorted({p["orgIndexCode"] for p in self.persons.values()}, key=lambda c: (len(c), c))
+        return [
+            {"orgIndexCode": code, "orgName": f"Organización {code}", "parentOrgIndexCode": "0" if code != "1" else ""}
+            for code in codes
+        ]
+
+
+def _page(items: List[dict], body: dict, max_page_size: int) -> dict:
+    page_no = int(body.get("pageNo") or 1)
+    page_size = int(body.get("pageSize") or 0)
+    if page_no < 1 or not 1 <= page_size <= max_page_size:
+        return fail("0x00052102", f"pageNo/pageSize fuera de rango (pageSize 1-{max_page_size})")
+    start = (page_no - 1) * page_size
+    return ok({
+        "total": len(items),
+        "pageNo": page_no,
+        "pageSize": page_size,
+        "list": items[start:start + page_size],
+    })
+
+
+class Handlers:
+    """Endpoints de Artemis sobre un Directory"""
+
+    def __init__(self, directory: Directory, max_page_size: int):
+        self.dir = directory
+        self.max_page_size = max_page_size
+        self.routes: Dict[str, Callable[[dict], dict]] = {
+            "/artemis/api/resource/v1/person/personList": self.person_list,
+            "/artemis/api/resource/v1/person/advance/personList": self.person_list,
+            "/artemis/api/resource/v1/person/single/add": self.person_add,
+            "/artemis/api/resource/v1/person/single/update": self.person_update,
+            "/artemis/api/resource/v1/person/personCode/personInfo": self.person_info,
+            "/artemis/api/resource/v1/person/face/update": self.face_update,
+            "/artemis/api/resource/v1/person/customFields": self.custom_fields,
+            "/artemis/api/resource/v1/org/advance/orgList": self.org_list,
+            "/artemis/api/acs/v1/privilege/group": self.privilege_groups,
+            "/artemis/api/acs/v1/privilege/group/single/addPersons": self.privilege_add_persons,
+            "/artemis/api/resource/v1/vehicle/vehicleList": self.vehicle_list,
+            "/artemis/api/resource/v1/vehicle/group/list": self.vehicle_groups,
+            "/artemis/api/resource/v1/vehicle/single/add": self.vehicle_add,
+            "/artemis/api/resource/v1/vehicle/single/update": self.vehicle_update,
+            "/artemis/api/resource/v1/vehicle/single/delete": self.vehicle_delete,
+        }
+
+    def resolve(self, path: str) -> Optional[Callable[[dict], dict]]:
+        handler = self.routes.get(path)
+        if handler is None and re.fullmatch(r"/artemis/api/resource/v1/person/[^/]+/customFieldsUpdate", path):
+            handler = self.custom_fields_update
+        return handler
+
+    # === Personas ===
+
+    def person_list(self, body: dict) -> dict:
+        return _page(self.dir.person_list(), body, self.max_page_size)
+
+    def person_add(self, body: dict) -> dict:
+        code = (body.get("personCode") or "").strip()
+        if code and code in self.dir.by_code:
+            return fail("0x00052104", "personCode ya existe")
+        person_id = str(self.dir.next_person_id)
+        self.dir.next_person_id += 1
+        given, family = body.get("personGivenName") or "", body.get("personFamilyName") or ""
+        self.dir._store({
+            "personId": person_id,
+            "personCode": code or f"{int(time.time() * 1000) % 10**10:010d}",
+            "personName": f"{given} {family}".strip(),
+            "personGivenName": given,
+            "personFamilyName": family,
+            "gender": body.get("gender", 0),
+            "orgIndexCode": str(body.get("orgIndexCode") or "1"),
+            "phoneNo": body.get("phoneNo") or "",
+            "email": body.get("email") or "",
+            "customFieldList": [],
+        })
+        # El controlador real devuelve el personId como string en data
+        return ok(person_id)
+
+    def person_update(self, body: dict) -> dict:
+        person = self.dir.persons.get(str(body.get("personId")))
+        if person is None:
+            return fail("0x00052101", "La persona no existe")
+        for field in ("personGivenName", "personFamilyName", "gender", "orgIndexCode", "phoneNo", "email"):
+            if field in body:
+                person[field] = body[field]
+        person["personName"] = f"{person['personGivenName']} {person['personFamilyName']}".strip()
+        return ok()
+
+    def person_info(self, body: dict) -> dict:
+        person_id = self.dir.by_code.get(body.get("personCode") or "")
+        if person_id is None:
+            return fail("0x00052101", "La persona no existe")
+        return ok(self.dir.persons[person_id])
+
+    def custom_fields_update(self, body: dict) -> dict:
+        person_id = self.dir.by_code.get(body.get("personCode") or "") or str(body.get("personId") or "")
+        person = self.dir.persons.get(person_id)
+        if person is None:
+            return fail("0x00052101", "La persona no existe")
+        fields = {f.get("customFiledName") or f.get("customFieldName"): f for f in person["customFieldList"]}
+        for field in body.get("list") or []:
+            name = field.get("customFiledName") or field.get("customFieldName")
+            fields[name] = {"customFieldName": name, "customFieldType": 0, "customFieldValue": field.get("customFieldValue")}
+        person["customFieldList"] = list(fields.values())
+        return ok()
+
+    def custom_fields(self, body: dict) -> dict:
+        return _page(CUSTOM_FIELDS, body, self.max_page_size)
+
+    def face_update(self, body: dict) -> dict:
+        person_id = self.dir.by_code.get(body.get("personCode") or "")
+        if person_id is None:
+            return fail("0x00052101", "La persona no existe")
+        if not body.get("faceData"):
+            return fail("0x00052301", "faceData vacío")
+        digest = hashlib.sha256(str(body["faceData"]).encode()).hexdigest()
+        self.dir.persons[person_id]["personPhoto"] = {"picUri": digest}
+        return ok()
+
+    # === Organizaciones y access levels ===
+
+    def org_list(self, body: dict) -> dict:
+        return _page(self.dir.organizations(), body, self.max_page_size)
+
+    def privilege_groups(self, body: dict) -> dict:
+        return _page(PRIVILEGE_GROUPS, body, self.max_page_size)
+
+    def privilege_add_persons(self, body: dict) -> dict:
+        if not any(g["privilegeGroupId"] == str(body.get("privilegeGroupId")) for g in PRIVILEGE_GROUPS):
+            return fail("0x00052201", "El grupo de privilegios no existe")
+        return ok()
+
+    # === Vehículos ===
+
+    def vehicle_groups(self, body: dict) -> dict:
+        return ok(VEHICLE_GROUPS)
+
+    def vehicle_list(self, body: dict) -> dict:
+        group = str(body.get("vehicleGroupIndexCode") or "")
+        vehicles = [v for v in self.dir.vehicles.values() if not group or v.get("vehicleGroupIndexCode") == group]
+        return _page(vehicles, body, self.max_page_size)
+
+    def vehicle_add(self, body: dict) -> dict:
+        plate = (body.get("plateNo") or "").strip().upper()
+        if not plate:
+            return fail("0x00052401", "plateNo requerido")
+        if any(v["plateNo"] == plate for v in self.dir.vehicles.values()):
+            return fail("0x00052402", "La placa ya existe")
+        person = self.dir.persons.get(str(body.get("personId") or ""), {})
+        vehicle_id = str(self.dir.next_vehicle_id)
+        self.dir.next_vehicle_id += 1
+        now = datetime.now()
+        self.dir.vehicles[vehicle_id] = {
+            "vehicleId": vehicle_id,
+            "plateNo": plate,
+            "plateCategory": "",
+            "plateArea": body.get("plateArea", 0),
+            "plateAreaName": "",
+            # El controlador arma personName como "nombres apellidos"
+            "personName": f"{person.get('personGivenName', '')} {person.get('personFamilyName', '')}",
+            "personFamilyName": person.get("personFamilyName", ""),
+            "personGivenName": person.get("personGivenName", ""),
+            "phoneNo": "",
+            "vehicleColor": 0,
+            "vehicleGroupIndexCode": str(body.get("vehicleGroupIndexCode") or "2"),
+            "effectiveDate": body.get("effectiveDate") or now.strftime("%Y-%m-%dT00:00:00-05:00"),
+            "expiredDate": body.get("expiredDate") or (now + timedelta(days=730)).strftime("%Y-%m-%dT23:59:59-05:00"),
+        }
+        return ok(vehicle_id)
+
+    def vehicle_update(self, body: dict) -> dict:
+        plate = (body.get("plateNo") or "").strip().upper()
+        vehicle = next((v for v in self.dir.vehicles.values() if v["plateNo"] == plate), None)
+        if vehicle is None:
+            return fail("0x00052403", "El vehículo no existe")
+        for field in ("effectiveDate", "expiredDate", "personName"):
+            if body.get(field):
+                vehicle[field] = body[field]
+        return ok()
+
+    def vehicle_delete(self, body: dict) -> dict:
+        if self.dir.vehicles.pop(str(body.get("vehicleId") or ""), None) is None:
+            return fail("0x00052403", "El vehículo no existe")
+        return ok()
+
+
+def signature_error(headers, body: bytes, path: str, app_key: str, app_secret: str) -> Optional[str]:
+    """Verifica la firma de Artemis; retorna el motivo del rechazo o None"""
+    if headers.get("x-ca-key") != app_key:
+        return "X-Ca-Key inválida"
+    md5_v = base64.b64encode(hashlib.md5(body).digest()).decode()
+    if headers.get("content-md5") != md5_v:
+        return "Content-MD5 no coincide con el body"
+    try:
+        ts = int(headers.get("x-ca-timestamp", ""))
+    except ValueError:
+        return "X-Ca-Timestamp inválido"
+    if abs(time.time() * 1000 - ts) > MAX_CLOCK_SKEW_MS:
+        return "X-Ca-Timestamp fuera de rango"
+
+    names = sorted(n.strip().lower() for n in headers.get("x-ca-signature-headers", "").split(",") if n.strip())
+    if "x-ca-timestamp" not in names or "x-ca-nonce" not in names:
+        return "X-Ca-Signature-Headers incompleto"
+    string_to_sign = "\n".join([
+        "POST",
+        headers.get("accept", ""),
+        md5_v,
+        headers.get("content-type", ""),
+        headers.get("date", ""),
+        "\n".join(f"{name}:{headers.get(name, '')}" for name in names),
+        path,
+    ])
+    expected = base64.b64encode(
+        hmac.new(app_secret.encode(), string_to_sign.encode(), hashlib.sha256).digest()
+    ).decode()
+    if not hmac.compare_digest(headers.get("x-ca-signature", ""), expected):
+        return "X-Ca-Signature inválida"
+    return None
+
+
+def create_app(
+    directory: Directory,
+    app_key: str,
+    app_secret: str,
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    error_rate: float = 0.0,
+    max_page_size: int = 500,
+    seed: Optional[int] = None,
+) -> Starlette:
+    """App ASGI del controlador simulado"""
+    handlers = Handlers(directory, max_page_size)
+    rng = random.Random(seed)
+    calls: Counter = Counter()
+
+    async def artemis(request: Request):
+        path = request.url.path
+        body = await request.body()
+        calls[path] += 1
+
+        delay = latency_ms + rng.uniform(-jitter_ms, jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        error = signature_error(request.headers, body, path, app_key, app_secret)
+        if error:
+            calls["rejected"] += 1
+            return JSONResponse(fail("0x02401007", error), status_code=401)
+        if error_rate and rng.random() < error_rate:
+            calls["injected_errors"] += 1
+            return PlainTextResponse("Service Unavailable", status_code=503)
+
+        handler = handlers.resolve(path)
+        if handler is None:
+            return JSONResponse(fail("0x00000404", f"API no encontrada: {path}"), status_code=404)
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return JSONResponse(fail("0x00052100", "JSON inválido"))
+        return JSONResponse(handler(payload))
+
+    async def health(request: Request):
+        return JSONResponse({"status": "healthy", "persons": len(directory.persons), "vehicles": len(directory.vehicles)})
+
+    async def stats(request: Request):
+        return JSONResponse(dict(calls))
+
+    async def reset_stats(request: Request):
+        calls.clear()
+        return JSONResponse({})
+
+    return Starlette(routes=[
+        Route("/health", health),
+        Route("/stub/stats", stats),
+        Route("/stub/stats/reset", reset_stats, methods=["POST"]),
+        Route("/artemis/{rest:path}", artemis, methods=["POST"]),
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Controlador HikCentral simulado")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--persons-file", default=DEFAULT_PERSONS_FILE)
+    parser.add_argument("--vehicles-file", default=DEFAULT_VEHICLES_FILE)
+    parser.add_argument("--min-persons", type=int, default=0, help="Completa con personas sintéticas hasta N")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fracción de respuestas 503 (0-1)")
+    parser.add_argument("--max-page-size", type=int, default=500)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--app-key", default=settings.HIKCENTRAL_APP_KEY)
+    parser.add_argument("--app-secret", default=settings.HIKCENTRAL_APP_SECRET)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    directory = Directory.load(args.persons_file, args.vehicles_file, args.min_persons)
+    app = create_app(
+        directory, args.app_key, args.app_secret,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        max_page_size=args.max_page_size, seed=args.seed,
+    )
+    print(f"Controlador simulado: {len(directory.persons)} personas, {len(directory.vehicles)} vehículos "
+          f"en http://{args.host}:{args.port}")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+Prueba de carga de extremo a extremo: operadores concurrentes mezclando
+login, listado, búsqueda, alta, actualización y consulta de auditoría contra
+la app conectada al controlador simulado (benchmarks.hik_stub).
+
+Por cada nivel de concurrencia reporta throughput y latencias (p50/p90/p99)
+por acción, y en una calibración previa (un operador, secuencial) cuántas
+llamadas a HikCentral genera cada acción (amplificación). Los resultados se
+comparan con la línea base guardada en benchmarks/baselines/load_test.json.
+
+Uso (desde la carpeta backend):
+    python -m benchmarks.load_test                          # 1, 5, 10 y 25 operadores
+    python -m benchmarks.load_test --users 10,50 --seconds 30 --stub-latency-ms 80
+    python -m benchmarks.load_test --save-baseline          # actualiza la línea base
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from .common import BACKEND_DIR, latency_summary, run_app, run_stub
+
+BASELINE_FILE = os.path.join(BACKEND_DIR, "benchmarks", "baselines", "load_test.json")
+
+# Peso relativo de cada acción en la mezcla de carga
+DEFAULT_WEIGHTS = {"login": 5, "list": 25, "search": 30, "add": 5, "update": 10, "audit": 25}
+
+# Llamadas al controlador simulado que no son de la app
+_STUB_COUNTERS = {"rejected", "injected_errors"}
+
+
+def _load_fixtures() -> Tuple[List[str], List[Tuple[str, str]]]:
+    """Términos de búsqueda y (personId, personCode) existentes desde person_data.json"""
+    with open(os.path.join(BACKEND_DIR, "person_data.json"), encoding="utf-8") as f:
+        rows = json.load(f)
+    terms = sorted({word for row in rows for word in (row.get("Nombre") or "").split() if len(word) >= 4})
+    persons = [(str(row["personID"]), row["ID"]) for row in rows if row.get("personID") and row.get("ID")]
+    return terms, persons
+
+
+class Operator:
+    """Un operador del sistema con su propia sesión HTTP"""
+
+    def __init__(self, url: str, username: str, password: str, fixtures, seed: int):
+        self.url = url
+        self.username = username
+        self.password = password
+        self.terms, self.persons = fixtures
+        self.rng = random.Random(seed)
+        self.http = requests.Session()
+        self.token: Optional[str] = None
+
+    def _headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.token}"}
+
+    def login(self) -> int:
+        r = self.http.post(f"{self.url}/api/auth/login",
+                           data={"username": self.username, "password": self.password}, timeout=120)
+        if r.status_code == 200:
+            self.token = r.json()["access_token"]
+        return r.status_code
+
+    def list(self) -> int:
+        page = self.rng.randint(1, 20)
+        return self.http.get(f"{self.url}/api/persons/list", params={"page_no": page, "page_size": 100},
+                             headers=self._headers(), timeout=120).status_code
+
+    def search(self) -> int:
+        return self.http.get(f"{self.url}/api/persons/list", params={"search": self.rng.choice(self.terms)},
+                             headers=self._headers(), timeout=120).status_code
+
+    def add(self) -> int:
+        suffix = f"{time.time_ns() % 10**9:09d}{self.rng.randint(0, 999):03d}"
+        body = {
+            "personGivenName": "Carga",
+            "personFamilyName": f"Prueba {suffix}",
+            "personCode": f"LT{suffix}",
+            "gender": "1",
+            "orgIndexCode": "1",
+            "certificateNumber": f"{self.rng.randint(10000000, 99999999)}",
+        }
+        if self.rng.random() < 0.3:
+            body["plateNo"] = f"L{suffix[-5:]}"
+        return self.http.post(f"{self.url}/api/persons/add", json=body,
+                              headers=self._headers(), timeout=120).status_code
+
+    def update(self) -> int:
+        person_id, person_code = self.rng.choice(self.persons)
+        body = {
+            "personGivenName": "Actualizado",
+            "personFamilyName": f"Carga {person_id}",
+            "personCode": person_code,
+            "gender": "1",
+            "orgIndexCode": "1",
+            "certificateNumber": f"{self.rng.randint(10000000, 99999999)}",
+        }
+        return self.http.put(f"{self.url}/api/persons/update/{person_id}", json=body,
+                             headers=self._headers(), timeout=120).status_code
+
+    def audit(self) -> int:
+        """Primera página de auditoría y hasta dos más siguiendo el cursor"""
+        params = {"limit": 50}
+        for _ in range(self.rng.randint(1, 3)):
+            r = self.http.get(f"{self.url}/api/audit-logs/", params=params, headers=self._headers(), timeout=120)
+            cursor = r.headers.get("X-Next-Cursor")
+            if r.status_code != 200 or not cursor:
+                break
+            params["cursor"] = cursor
+        return r.status_code
+
+    def action(self, name: str) -> Callable[[], int]:
+        return getattr(self, name)
+
+
+def _upstream_calls(stub_url: str) -> int:
+    stats = requests.get(f"{stub_url}/stub/stats", timeout=10).json()
+    return sum(n for path, n in stats.items() if path not in _STUB_COUNTERS)
+
+
+def calibrate(url: str, stub_url: str, username: str, password: str, fixtures, repeats: int) -> Dict[str, float]:
+    """Llamadas a HikCentral por acción con un solo operador (incluye caches fríos y calientes)"""
+    operator = Operator(url, username, password, fixtures, seed=0)
+    operator.login()
+    amplification = {}
+    for name in DEFAULT_WEIGHTS:
+        before = _upstream_calls(stub_url)
+        for _ in range(repeats):
+            operator.action(name)()
+        amplification[name] = round((_upstream_calls(stub_url) - before) / repeats, 2)
+    return amplification
+
+
+def run_level(url: str, username: str, password: str, fixtures, users: int, seconds: float,
+              weights: Dict[str, int], stub_url: Optional[str]) -> dict:
+    """Ejecuta ``users`` operadores concurrentes durante ``seconds`` con la mezcla ``weights``"""
+    names = [name for name, weight in weights.items() if weight > 0]
+    action_weights = [weights[name] for name in names]
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    errors: Dict[str, int] = {name: 0 for name in names}
+    lock = threading.Lock()
+    stop = threading.Event()
+    ready = threading.Barrier(users + 1)
+
+    def worker(index: int):
+        operator = Operator(url, username, password, fixtures, seed=index + 1)
+        operator.login()
+        local = {name: [] for name in names}
+        failed = {name: 0 for name in names}
+        ready.wait()
+        while not stop.is_set():
+            name = operator.rng.choices(names, weights=action_weights)[0]
+            start = time.perf_counter()
+            try:
+                ok = operator.action(name)() < 400
+            except requests.RequestException:
+                ok = False
+            local[name].append(time.perf_counter() - start)
+            if not ok:
+                failed[name] += 1
+        with lock:
+            for name in names:
+                latencies[name].extend(local[name])
+                errors[name] += failed[name]
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(users)]
+    for t in threads:
+        t.start()
+    ready.wait()
+    calls_before = _upstream_calls(stub_url) if stub_url else 0
+    start = time.perf_counter()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    all_latencies = [latency for values in latencies.values() for latency in values]
+    result = {"users": users, "total": latency_summary(all_latencies, elapsed), "actions": {}}
+    result["total"]["errors"] = sum(errors.values())
+    if stub_url and all_latencies:
+        result["total"]["upstream_calls_per_action"] = round(
+            (_upstream_calls(stub_url) - calls_before) / len(all_latencies), 2
+        )
+    for name in names:
+        result["actions"][name] = latency_summary(latencies[name], elapsed)
+        result["actions"][name]["errors"] = errors[name]
+    return result
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Regresiones respecto a la línea base (p99 más alto o throughput más bajo que la tolerancia)"""
+    regressions = []
+    base_levels = {level["users"]: level for level in baseline.get("levels", [])}
+    for level in results["levels"]:
+        base = base_levels.get(level["users"])
+        if base is None:
+            continue
+        for name, current in [("total", level["total"])] + list(level["actions"].items()):
+            previous = base["total"] if name == "total" else base["actions"].get(name)
+            if not previous or not previous["requests"]:
+                continue
+            if current["p99_ms"] > previous["p99_ms"] * (1 + tolerance):
+                regressions.append(f"{level['users']} usuarios / {name}: p99 {previous['p99_ms']} -> {current['p99_ms']} ms")
+            if current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+                regressions.append(
+                    f"{level['users']} usuarios / {name}: throughput "
+                    f"{previous['throughput_rps']} -> {current['throughput_rps']} rps"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga con operadores concurrentes")
+    parser.add_argument("--url", help="URL de una instancia ya levantada (si no, se levanta una con el stub)")
+    parser.add_argument("--stub-url", help="URL del stub que usa --url (para medir amplificación)")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--users", default="1,5,10,25", help="Niveles de concurrencia separados por coma")
+    parser.add_argument("--seconds", type=float, default=15)
+    parser.add_argument("--calibration-repeats", type=int, default=5)
+    parser.add_argument("--weights", help="Mezcla, ej: search=50,list=30,audit=20")
+    parser.add_argument("--stub-latency-ms", type=float, default=30)
+    parser.add_argument("--stub-jitter-ms", type=float, default=15)
+    parser.add_argument("--stub-error-rate", type=float, default=0.0)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Variación aceptada frente a la línea base")
+    args = parser.parse_args()
+
+    weights = dict(DEFAULT_WEIGHTS)
+    if args.weights:
+        weights = {name: 0 for name in DEFAULT_WEIGHTS}
+        for item in args.weights.split(","):
+            name, weight = item.split("=")
+            if name not in weights:
+                parser.error(f"Acción desconocida: {name}")
+            weights[name] = int(weight)
+    levels = [int(n) for n in args.users.split(",")]
+    fixtures = _load_fixtures()
+
+    def run_all(url: str, stub_url: Optional[str]) -> dict:
+        results = {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "machine": {"python": platform.python_version(), "cpus": os.cpu_count(), "platform": platform.platform()},
+            "config": {"seconds": args.seconds, "weights": weights, "stub_latency_ms": args.stub_latency_ms,
+                       "stub_jitter_ms": args.stub_jitter_ms, "stub_error_rate": args.stub_error_rate},
+        }
+        if stub_url:
+            results["upstream_calls_per_action"] = calibrate(
+                url, stub_url, args.username, args.password, fixtures, args.calibration_repeats
+            )
+        results["levels"] = [
+            run_level(url, args.username, args.password, fixtures, users, args.seconds, weights, stub_url)
+            for users in levels
+        ]
+        return results
+
+    if args.url:
+        results = run_all(args.url, args.stub_url)
+    else:
+        stub_args = ["--latency-ms", str(args.stub_latency_ms), "--jitter-ms", str(args.stub_jitter_ms),
+                     "--error-rate", str(args.stub_error_rate), "--seed", "1"]
+        with run_stub(stub_args) as stub_url:
+            env = {
+                "HIKCENTRAL_BASE_URL": stub_url,
+                "ADMIN_USERNAME": args.username,
+                "ADMIN_PASSWORD": args.password,
+                "LOG_LEVEL": "WARNING",
+            }
+            with run_app(env) as url:
+                results = run_all(url, stub_url)
+
+    print(json.dumps(results, indent=2))
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"Línea base guardada en {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("Regresiones frente a la línea base:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print("Sin regresiones frente a la línea base")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Fixtures comunes: controlador HikCentral simulado (benchmarks.hik_stub) en
+un hilo y la configuración apuntando a él y a una BD SQLite temporal.
+
+La configuración se fija antes de importar ``app``: ``settings`` se crea
+al importar app.config.
+"""
+import os
+import socket
+import tempfile
+import threading
+import time
+
+import pytest
+
+_tmp = tempfile.mkdtemp(prefix="appunalm-tests-")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+STUB_PORT = _free_port()
+
+os.environ.update({
+    "SECRET_KEY": "tests",
+    "DATABASE_URL": f"sqlite:///{os.path.join(_tmp, 'app.db')}",
+    "HIKCENTRAL_BASE_URL": f"http://127.0.0.1:{STUB_PORT}",
+    "HIKCENTRAL_APP_KEY": "tests-key",
+    "HIKCENTRAL_APP_SECRET": "tests-secret",
+    "HIKCENTRAL_USER_ID": "admin",
+    "HIKCENTRAL_CASSETTE_MODE": "off",
+    "SNAPSHOT_DIR": os.path.join(_tmp, "snapshots"),
+    "SNAPSHOT_INTERVAL_MINUTES": "0",
+    "AUDIT_ARCHIVE_DIR": os.path.join(_tmp, "audit"),
+    "ADMIN_USERNAME": "admin",
+    "ADMIN_PASSWORD": "admin123",
+    "LOG_LEVEL": "WARNING",
+})
+
+# Personas del controlador simulado: personCode → DNI
+PERSONS = {"20230001": "12345678", "20230002": "87654321", "20230003": "AB123"}
+
+
+@pytest.fixture(scope="session")
+def hik_stub():
+    import uvicorn
+
+    from benchmarks.hik_stub import Directory, _person_from_export, create_app
+
+    directory = Directory(
+        [_person_from_export({"personID": str(i), "ID": code, "Nombre": f"Persona {i}", "DNI": dni})
+         for i, (code, dni) in enumerate(PERSONS.items(), start=1)],
+        [],
+    )
+    server = uvicorn.Server(uvicorn.Config(
+        create_app(directory, os.environ["HIKCENTRAL_APP_KEY"], os.environ["HIKCENTRAL_APP_SECRET"]),
+        host="127.0.0.1", port=STUB_PORT, log_level="warning",
+    ))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.time() + 10
+    while not server.started:
+        if time.time() > deadline:
+            raise RuntimeError("El controlador simulado no arrancó")
+        time.sleep(0.05)
+    yield directory
+    server.should_exit = True
+    thread.join(timeout=5)
+
+
+@pytest.fixture(scope="session")
+def client(hik_stub):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client):
+    response = client.post("/api/auth/login", data={"username": "admin", "password": "admin123"})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
@@ -0,0 +1,60 @@
+import csv
+import io
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from app import models
+from app.database import SessionLocal
+
+USER_ID = 9001  # Registros propios del test, separados de los que genera la app
+
+
+def _seed():
+    db = SessionLocal()
+    try:
+        base = datetime(2026, 1, 1)
+        db.add_all([
+            models.AuditLog(
+                user_id=USER_ID, action="TEST", module="test", details=str(i),
+                timestamp=base + timedelta(minutes=i % 4),
+            )
+            for i in range(11)
+        ])
+        db.flush()
+        # Registros antiguos sin timestamp (el default del modelo lo completaría al insertar)
+        db.execute(
+            update(models.AuditLog)
+            .where(models.AuditLog.user_id == USER_ID, models.AuditLog.details.in_(["0", "3", "6", "9"]))
+            .values(timestamp=None)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_cursor_pages_match_export(client, admin_headers):
+    _seed()
+    listed, cursor = [], None
+    while True:
+        params = {"user_id": USER_ID, "limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/audit-logs/", params=params, headers=admin_headers)
+        assert response.status_code == 200, response.text
+        listed += response.json()
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    export = client.get("/api/audit-logs/export", params={"user_id": USER_ID}, headers=admin_headers)
+    assert export.status_code == 200
+    exported = [int(row["id"]) for row in csv.DictReader(io.StringIO(export.text.lstrip("\ufeff")))]
+
+    assert [row["id"] for row in listed] == exported
+    assert len(exported) == 11
+    # Los registros sin timestamp van al final, del mayor id al menor
+    undated = [row["id"] for row in listed if row["timestamp"] is None]
+    assert len(undated) == 4
+    assert [row["id"] for row in listed[-4:]] == sorted(undated, reverse=True)
+
+    skipped = client.get("/api/audit-logs/", params={"user_id": USER_ID, "skip": 6, "limit": 100}, headers=admin_headers)
+    assert [row["id"] for row in skipped.json()] == exported[6:]
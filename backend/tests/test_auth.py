@@ -0,0 +1,22 @@
+import asyncio
+
+from app import auth
+
+
+def test_cached_user_not_stored_after_concurrent_invalidation(client, monkeypatch):
+    auth.invalidate_user_cache()
+    get_user = auth.get_user_by_username
+
+    async def get_user_then_invalidate(db, username):
+        # Simula un update_user/delete_user que termina mientras se lee la fila
+        user = await get_user(db, username=username)
+        auth.invalidate_user_cache(username)
+        return user
+
+    monkeypatch.setattr(auth, "get_user_by_username", get_user_then_invalidate)
+    assert asyncio.run(auth._get_cached_user("admin")) is not None
+    assert "admin" not in auth._user_cache
+
+    monkeypatch.setattr(auth, "get_user_by_username", get_user)
+    assert asyncio.run(auth._get_cached_user("admin")) is not None
+    assert "admin" in auth._user_cache
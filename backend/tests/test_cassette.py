@@ -0,0 +1,22 @@
+from app.cassette import CassettePlayer, CassetteRecorder
+
+PATH = "/artemis/api/resource/v1/person/personCode/personInfo"
+
+
+def test_replay_matches_only_same_body(tmp_path):
+    cassette = str(tmp_path / "hik.jsonl.gz")
+    recorder = CassetteRecorder(cassette)
+    recorder.record(PATH, "md5-a", {"personCode": "A"}, {"code": "0", "data": "A1"}, 0.0)
+    recorder.record(PATH, "md5-b", {"personCode": "B"}, {"code": "0", "data": "B"}, 0.0)
+    recorder.record(PATH, "md5-a", {"personCode": "A"}, {"code": "0", "data": "A2"}, 0.0)
+    recorder.close()
+
+    player = CassettePlayer(cassette, latency_scale=0)
+    # Un body sin grabación no consume la de otro body
+    assert player.play(PATH, "md5-c")["code"] == "CASSETTE_MISS"
+    assert player.play(PATH, "md5-b")["data"] == "B"
+    assert player.play(PATH, "md5-a")["data"] == "A1"
+    assert player.play(PATH, "md5-a")["data"] == "A2"
+    # Agotadas las grabaciones de un body se repite la última
+    assert player.play(PATH, "md5-a")["data"] == "A2"
+    assert player.misses == 1
@@ -0,0 +1,22 @@
+from app import hikcli
+
+
+def run(*argv):
+    args = hikcli.build_parser().parse_args(argv)
+    return args.func(args)
+
+
+def test_photos_upload(hik_stub, tmp_path, capsys):
+    for name in ("12345678.jpg", "0AB-123.jpg", "99999999.jpg"):
+        (tmp_path / name).write_bytes(b"foto " + name.encode())
+    state = str(tmp_path / "fotos.done")
+
+    assert run("photos", "upload", str(tmp_path / "*.jpg"), "--state", state, "--refresh") == 0
+    person = hik_stub.persons[hik_stub.by_code["20230001"]]
+    assert person.get("personPhoto", {}).get("picUri")
+    assert hik_stub.persons[hik_stub.by_code["20230003"]].get("personPhoto", {}).get("picUri")
+    assert "SIN PERSONA" in capsys.readouterr().err
+
+    # Al repetir, las fotos ya subidas se saltan
+    assert run("photos", "upload", str(tmp_path / "*.jpg"), "--state", state, "--refresh") == 0
+    assert "2 fotos ya subidas" in capsys.readouterr().out
@@ -0,0 +1,27 @@
+import io
+
+
+def test_reconcile_route(client, admin_headers):
+    csv = "DOCUMENTO\n12345678\n012345678.0\n87654321\nab-123\n123\n99999999\n"
+    response = client.post(
+        "/api/persons/reconcile",
+        params={"refresh": True},
+        files={"file": ("placas.csv", io.BytesIO(csv.encode()), "text/csv")},
+        headers=admin_headers,
+    )
+    assert response.status_code == 200, response.text
+    data = response.json()["data"]
+    assert data["summary"] == {"total": 6, "matched": 4, "unmatched": 2, "ambiguous": 0}
+    assert [row["personCode"] for row in data["matched"]] == ["20230001", "20230001", "20230002", "20230003"]
+    # "123" no debe cruzar con el documento alfanumérico "AB123"
+    assert {row["DOCUMENTO"] for row in data["unmatched"]} == {"123", "99999999"}
+
+
+def test_reconcile_route_missing_column(client, admin_headers):
+    response = client.post(
+        "/api/persons/reconcile",
+        params={"column": "DNI"},
+        files={"file": ("placas.csv", io.BytesIO(b"DOCUMENTO\n12345678\n"), "text/csv")},
+        headers=admin_headers,
+    )
+    assert response.status_code == 400
@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import Navbar from '../components/Navbar';
 import { auditService } from '../services/api';
 
@@ -8,6 +8,9 @@ export default function AuditLogs() {
     const [error, setError] = useState('');
     const [page, setPage] = useState(0);
     const [hasMore, setHasMore] = useState(true);
+    const [exporting, setExporting] = useState(false);
+    // Cursor de la siguiente página (lo envía el backend en X-Next-Cursor)
+    const nextCursor = useRef(null);
 
     // Filters state
     const [users, setUsers] = useState([]);
@@ -47,13 +50,11 @@ export default function AuditLogs() {
                 // pero si cambian filtros deberíamos
             }
 
-            const newLogs = await auditService.listLogs(page, limit, filters);
+            const cursor = page === 0 ? null : nextCursor.current;
+            const { logs: newLogs, nextCursor: next } = await auditService.listLogs(limit, filters, cursor);
 
-            if (newLogs.length < limit) {
-                setHasMore(false);
-            } else {
-                setHasMore(true);
-            }
+            nextCursor.current = next;
+            setHasMore(Boolean(next));
 
             if (page === 0) {
                 setLogs(newLogs);
@@ -77,6 +78,18 @@ export default function AuditLogs() {
         setPage(0); // Reset to first page on filter change
     };
 
+    const handleExport = async (format) => {
+        try {
+            setExporting(true);
+            await auditService.exportLogs(format, filters);
+        } catch (error) {
+            console.error('Error al exportar registros:', error);
+            setError('Error al exportar el historial de registros');
+        } finally {
+            setExporting(false);
+        }
+    };
+
     const loadMore = () => {
         setPage(prev => prev + 1);
     };
@@ -96,6 +109,14 @@ export default function AuditLogs() {
             <div className="container mt-4">
                 <div className="d-flex justify-content-between align-items-center mb-4">
                     <h2>Registro de Auditoría</h2>
+                    <div className="btn-group">
+                        <button className="btn btn-outline-success btn-sm" disabled={exporting} onClick={() => handleExport('csv')}>
+                            Exportar CSV
+                        </button>
+                        <button className="btn btn-outline-success btn-sm" disabled={exporting} onClick={() => handleExport('xlsx')}>
+                            Exportar Excel
+                        </button>
+                    </div>
                 </div>
 
                 {/* Filters Card */}
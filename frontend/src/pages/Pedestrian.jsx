@@ -1,6 +1,6 @@
 import { useState, useEffect, useRef, useCallback } from 'react';
 import { useAuth } from '../context/AuthContext';
-import { personService, externalService } from '../services/api';
+import { personService, externalService, PEDESTRIAN_FIELDS } from '../services/api';
 import Navbar from '../components/Navbar';
 import CameraCapture from '../components/CameraCapture';
 
@@ -53,7 +53,7 @@ export default function Pedestrian() {
   const loadPersons = useCallback(async () => {
     try {
       setLoading(true);
-      const response = await personService.listPersons(searchTerm ? 1 : currentPage, itemsPerPage, searchTerm || null);
+      const response = await personService.listPersons(searchTerm ? 1 : currentPage, itemsPerPage, searchTerm || null, PEDESTRIAN_FIELDS);
       if (response.success) {
         setPersons(response.data.persons);
         setTotalPersons(response.data.total);
@@ -83,6 +83,12 @@ export const authService = {
   },
 };
 
+// Campos de persona que usan las vistas sin vehículos (peatonal / postulante)
+export const PEDESTRIAN_FIELDS = [
+  'personId', 'personCode', 'personName', 'personGivenName', 'personFamilyName',
+  'gender', 'orgIndexCode', 'phoneNo', 'email', 'certificateNumber', 'beginTime', 'endTime',
+];
+
 // Person services
 export const personService = {
   addPersonToPrivilegeGroups: async (personCode, privilegeGroupId) => {
@@ -111,12 +117,16 @@ export const personService = {
     return response.data;
   },
 
-  listPersons: async (pageNo = 1, pageSize = 100, search = null) => {
+  listPersons: async (pageNo = 1, pageSize = 100, search = null, fields = null) => {
     const endpoint = '/persons/list';
     const params = { page_no: pageNo, page_size: pageSize };
     if (search) {
       params.search = search;
     }
+    // Proyección de campos: evita descargar (y calcular) lo que la vista no usa
+    if (fields) {
+      params.fields = fields.join(',');
+    }
     console.log('GET', endpoint, params);
     const response = await api.get(endpoint, { params });
     return response.data;
@@ -158,16 +168,38 @@ export const personService = {
 
 // Audit services
 export const auditService = {
-  listLogs: async (page = 0, limit = 20, filters = {}) => {
-    const skip = page * limit;
-    let url = `/audit-logs/?skip=${skip}&limit=${limit}`;
+  // Paginación por cursor: pasar el nextCursor de la respuesta anterior
+  listLogs: async (limit = 20, filters = {}, cursor = null) => {
+    let url = `/audit-logs/?limit=${limit}`;
 
+    if (cursor) url += `&cursor=${encodeURIComponent(cursor)}`;
     if (filters.userId) url += `&user_id=${filters.userId}`;
     if (filters.startDate) url += `&start_date=${filters.startDate}`;
     if (filters.endDate) url += `&end_date=${filters.endDate}`;
 
     const response = await api.get(url);
-    return response.data;
+    return {
+      logs: response.data,
+      nextCursor: response.headers['x-next-cursor'] || null,
+    };
+  },
+
+  // Descarga el archivo (csv o xlsx) con los mismos filtros del listado
+  exportLogs: async (format = 'csv', filters = {}) => {
+    let url = `/audit-logs/export?format=${format}`;
+
+    if (filters.userId) url += `&user_id=${filters.userId}`;
+    if (filters.startDate) url += `&start_date=${filters.startDate}`;
+    if (filters.endDate) url += `&end_date=${filters.endDate}`;
+
+    const response = await api.get(url, { responseType: 'blob' });
+    const disposition = response.headers['content-disposition'] || '';
+    const match = disposition.match(/filename="?([^"]+)"?/);
+    const link = document.createElement('a');
+    link.href = URL.createObjectURL(response.data);
+    link.download = match ? match[1] : `auditoria.${format}`;
+    link.click();
+    URL.revokeObjectURL(link.href);
   },
 
   listUsers: async () => {